@@ -1,4 +1,8 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
 
 import lta.api.backoffice.endpoints
@@ -8,6 +12,7 @@ import lta.api.userapp.endpoints
 from lta.api.configuration import (
     get_allowed_origins,
     get_application_service,
+    get_configuration,
     get_use_google_cloud_logging,
 )
 from lta.log import setup_google_cloud_logging
@@ -15,7 +20,19 @@ from lta.log import setup_google_cloud_logging
 if get_use_google_cloud_logging():
     setup_google_cloud_logging()
 
-app = FastAPI(openapi_url=None)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    await run_in_threadpool(get_configuration().start_collection_replicas)
+    get_configuration().start_timer_engine()
+    get_configuration().start_task_dispatcher()
+    yield
+    await run_in_threadpool(get_configuration().stop_task_dispatcher)
+    await run_in_threadpool(get_configuration().stop_timer_engine)
+    get_configuration().stop_collection_replicas()
+
+
+app = FastAPI(openapi_url=None, lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
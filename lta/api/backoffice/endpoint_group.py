@@ -9,7 +9,7 @@ from pydantic import BaseModel
 from lta.api.configuration import AppConfiguration, get_configuration
 from lta.authentication import get_admin_user
 from lta.domain.group import Group
-from lta.domain.user_repository import UserRepository
+from lta.domain.user import User
 
 router = APIRouter()
 
@@ -25,12 +25,15 @@ class GroupItemResponse(BaseModel):
     users: list[GroupUser]
 
     @staticmethod
-    def from_domain(user_repository: UserRepository, group: Group) -> GroupItemResponse:
-        users = []
-        for user_id in group.user_ids:
-            user = user_repository.get_user(user_id)
-            users.append(GroupUser(id=user.id, email=user.email_address))
-        return GroupItemResponse(id=group.id, name=group.name, users=users)
+    def from_domain(group: Group, users: dict[str, User]) -> GroupItemResponse:
+        return GroupItemResponse(
+            id=group.id,
+            name=group.name,
+            users=[
+                GroupUser(id=user_id, email=users[user_id].email_address)
+                for user_id in group.user_ids
+            ],
+        )
 
 
 class GroupListResponse(BaseModel):
@@ -42,12 +45,14 @@ async def get_groups(
     configuration: AppConfiguration = Depends(get_configuration),
     admin_id: str = Depends(get_admin_user),
 ) -> GroupListResponse:
-    groups = configuration.group_repository.list_groups()
+    groups = await configuration.async_group_repository.list_groups()
+    # All the members are read at once, rather than group by group.
+    users = await configuration.async_user_repository.get_users(
+        [user_id for group in groups for user_id in group.user_ids]
+    )
+    users_by_id = {user.id: user for user in users}
     return GroupListResponse(
-        groups=[
-            GroupItemResponse.from_domain(configuration.user_repository, group)
-            for group in groups
-        ]
+        groups=[GroupItemResponse.from_domain(group, users_by_id) for group in groups]
     )
 
 
@@ -27,7 +27,7 @@ class ScheduleListResponse(BaseModel):
 
 
 @router.get("/")
-async def get_schedules(
+def get_schedules(
     configuration: AppConfiguration = Depends(get_configuration),
     admin_id: str = Depends(get_admin_user),
 ) -> ScheduleListResponse:
@@ -31,7 +31,7 @@ class SurveyListResponse(BaseModel):
 
 
 @router.get("/")
-async def get_surveys(
+def get_surveys(
     configuration: AppConfiguration = Depends(get_configuration),
     admin_id: str = Depends(get_admin_user),
 ) -> SurveyListResponse:
@@ -67,7 +67,7 @@ class SurveyDetailsResponse(BaseModel):
 
 
 @router.get("/{survey_id:str}/")
-async def get_survey(
+def get_survey(
     survey_id: str,
     configuration: AppConfiguration = Depends(get_configuration),
     admin_id: str = Depends(get_admin_user),
@@ -2,17 +2,20 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, EmailStr
 
 from lta.api.configuration import AppConfiguration, get_configuration
 from lta.authentication import get_admin_user
-from lta.domain.assignment import Assignment
+from lta.domain.assignment import AssignmentSummary
+from lta.domain.pagination import InvalidCursor, Page
 from lta.domain.user import DeviceOS, User
 from lta.domain.user_repository import UserNotFound
 
 router = APIRouter()
 
+MAX_PAGE_SIZE = 500
+
 
 class UserItemResponse(BaseModel):
     id: str
@@ -30,16 +33,29 @@ class UserItemResponse(BaseModel):
 
 class UserListResponse(BaseModel):
     users: list[UserItemResponse]
+    next_cursor: str | None = None
 
 
 @router.get("/")
 async def get_users(
+    page_size: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     configuration: AppConfiguration = Depends(get_configuration),
     admin_id: str = Depends(get_admin_user),
 ) -> UserListResponse:
-    users = configuration.user_repository.list_users()
+    """Without `page_size`, all the users are returned."""
+    if page_size is None:
+        page = Page(items=await configuration.async_user_repository.list_users())
+    else:
+        try:
+            page = await configuration.async_user_repository.list_users_page(
+                page_size, cursor
+            )
+        except InvalidCursor:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
     return UserListResponse(
-        users=[UserItemResponse.from_domain(user) for user in users]
+        users=[UserItemResponse.from_domain(user) for user in page.items],
+        next_cursor=page.next_cursor,
     )
 
 
@@ -81,7 +97,7 @@ async def get_user(
     admin_id: str = Depends(get_admin_user),
 ) -> UserResponse:
     try:
-        user = configuration.user_repository.get_user(id)
+        user = await configuration.async_user_repository.get_user(id)
     except UserNotFound:
         raise HTTPException(status_code=404)
     return UserResponse.from_domain(user)
@@ -95,34 +111,46 @@ class UserAssignmentItemResponse(BaseModel):
     submitted_at: datetime | None
 
     @staticmethod
-    def from_domain(assignment: Assignment) -> UserAssignmentItemResponse:
-        print("BAR:", assignment.submitted_at)
+    def from_domain(assignment: AssignmentSummary) -> UserAssignmentItemResponse:
         return UserAssignmentItemResponse(
             id=assignment.id,
             title=assignment.title,
             created_at=assignment.created_at,
-            opened_at=max(assignment.opened_at) if assignment.opened_at else None,
+            opened_at=assignment.last_opened_at,
             submitted_at=assignment.submitted_at,
         )
 
 
 class UserAssignmentListResponse(BaseModel):
     assignments: list[UserAssignmentItemResponse]
+    next_cursor: str | None = None
 
 
 @router.get("/{id:str}/assignments/")
 async def get_user_assignments(
     id: str,
+    page_size: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
     configuration: AppConfiguration = Depends(get_configuration),
     admin_id: str = Depends(get_admin_user),
 ) -> UserAssignmentListResponse:
+    """Without `page_size`, all the assignments of the user are returned."""
+    assignment_repository = configuration.async_assignment_repository
     try:
-        assignments = configuration.assignment_repository.list_assignments(id)
+        if page_size is None:
+            page = Page(items=await assignment_repository.list_assignment_summaries(id))
+        else:
+            page = await assignment_repository.list_assignment_summaries_page(
+                id, page_size, cursor
+            )
     except UserNotFound:
         raise HTTPException(status_code=404)
+    except InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
     return UserAssignmentListResponse(
         assignments=[
             UserAssignmentItemResponse.from_domain(assignment)
-            for assignment in assignments
-        ]
+            for assignment in page.items
+        ],
+        next_cursor=page.next_cursor,
     )
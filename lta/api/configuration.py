@@ -1,61 +1,129 @@
+import logging
 import os
+import time
 from dataclasses import dataclass
 from datetime import timedelta
 from enum import Enum
 from functools import cache, cached_property
-from typing import Literal, Optional
+from pathlib import Path
+from typing import Any, Literal, Optional
 from urllib.parse import urljoin
 
 import firebase_admin
 import firebase_admin.firestore
+import firebase_admin.firestore_async
 import google.cloud.firestore
+import requests
 import vonage
 from google.cloud import tasks_v2
-from pydantic import EmailStr, Field, HttpUrl
+from pydantic import EmailStr, Field, HttpUrl, model_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
-from lta.domain.assignment_repository import AssignmentRepository
-from lta.domain.group_repository import GroupRepository
+from lta.domain.assignment_repository import (
+    AssignmentRepository,
+    AsyncAssignmentRepository,
+)
+from lta.domain.group import Group
+from lta.domain.group_repository import AsyncGroupRepository, GroupRepository
+from lta.domain.push_ticket_repository import PushTicketRepository
+from lta.domain.schedule import Schedule
 from lta.domain.schedule_repository import ScheduleRepository
 from lta.domain.scheduler.assignment_scheduler import AssignmentScheduler
 from lta.domain.scheduler.assignment_service import AssignmentService
+from lta.domain.scheduler.notification_pulisher import NotificationPublisher
 from lta.domain.scheduler.notification_scheduler import NotificationScheduler
 from lta.domain.scheduler.notification_service import NotificationService
 from lta.domain.scheduler.scheduler_service import SchedulerService
-from lta.domain.survey import NotificationMessage
+from lta.domain.survey import NotificationMessage, Survey
 from lta.domain.survey_repository import SurveyRepository
-from lta.domain.user_repository import UserRepository
+from lta.domain.user_repository import AsyncUserRepository, UserRepository
+from lta.infra.http import (
+    Timeout,
+    get_max_request_seconds,
+    make_http_retry,
+    make_http_session,
+)
+from lta.infra.repositories.cache.survey_repository import CachingSurveyRepository
 from lta.infra.repositories.firestore.assignment_repository import (
+    AsyncFirestoreAssignmentRepository,
     FirestoreAssignmentRepository,
 )
-from lta.infra.repositories.firestore.group_repository import FirestoreGroupRepository
+from lta.infra.repositories.firestore.group_repository import (
+    AsyncFirestoreGroupRepository,
+    FirestoreGroupRepository,
+    parse_stored_group,
+)
+from lta.infra.repositories.firestore.push_ticket_repository import (
+    FirestorePushTicketRepository,
+)
 from lta.infra.repositories.firestore.schedule_repository import (
     FirestoreScheduleRepository,
+    parse_stored_schedule,
+)
+from lta.infra.repositories.firestore.survey_repository import (
+    FirestoreSurveyRepository,
+    parse_stored_survey,
+)
+from lta.infra.repositories.firestore.user_repository import (
+    AsyncFirestoreUserRepository,
+    FirestoreUserRepository,
+)
+from lta.infra.repositories.replica.collection import CollectionReplica
+from lta.infra.repositories.replica.group_repository import ReplicatedGroupRepository
+from lta.infra.repositories.replica.schedule_repository import (
+    ReplicatedScheduleRepository,
+)
+from lta.infra.repositories.replica.survey_repository import ReplicatedSurveyRepository
+from lta.infra.repositories.sqlite.assignment_repository import (
+    SqliteAssignmentRepository,
+)
+from lta.infra.repositories.sqlite.group_repository import SqliteGroupRepository
+from lta.infra.repositories.sqlite.push_ticket_repository import (
+    SqlitePushTicketRepository,
+)
+from lta.infra.repositories.sqlite.schedule_repository import SqliteScheduleRepository
+from lta.infra.repositories.sqlite.survey_repository import SqliteSurveyRepository
+from lta.infra.repositories.sqlite.user_repository import SqliteUserRepository
+from lta.infra.repositories.threaded.assignment_repository import (
+    ThreadedAssignmentRepository,
+)
+from lta.infra.repositories.threaded.group_repository import ThreadedGroupRepository
+from lta.infra.repositories.threaded.user_repository import ThreadedUserRepository
+from lta.infra.scheduler.circuit_breaker.notification_publisher import (
+    CircuitBreakerNotificationPublisher,
 )
-from lta.infra.repositories.firestore.survey_repository import FirestoreSurveyRepository
-from lta.infra.repositories.firestore.user_repository import FirestoreUserRepository
 from lta.infra.scheduler.direct.assignment_scheduler import DirectAssignmentScheduler
 from lta.infra.scheduler.direct.notification_scheduler import (
     DirectNotificationScheduler,
 )
+from lta.infra.scheduler.direct.timer_engine import TimerEngine, TimerStore
 from lta.infra.scheduler.expo.notification_publisher import (
     ExpoAPI,
     ExpoNotificationPublisher,
 )
+from lta.infra.scheduler.expo.receipt_checker import ExpoReceiptChecker
 from lta.infra.scheduler.google_tasks.assignment_scheduler import (
     CloudTasksAssignmentScheduler,
 )
 from lta.infra.scheduler.google_tasks.notification_scheduler import (
+    ChainedCloudTasksNotificationScheduler,
     CloudTasksNotificationScheduler,
 )
 from lta.infra.scheduler.mailgun.notification_publisher import (
     MailgunAPI,
     MailgunNotificationPublisher,
 )
+from lta.infra.scheduler.sqlite.assignment_scheduler import SqliteAssignmentScheduler
+from lta.infra.scheduler.sqlite.notification_scheduler import (
+    SqliteNotificationScheduler,
+)
+from lta.infra.scheduler.sqlite.task_handlers import make_task_handlers
+from lta.infra.scheduler.sqlite.task_queue import SqliteTaskDispatcher, SqliteTaskQueue
 from lta.infra.scheduler.vonage.notification_publisher import (
     VonageNotificationPublisher,
 )
-from lta.infra.tasks_api import CloudTasksAPI
+from lta.infra.sqlite import SqliteConnections
+from lta.infra.tasks_api import CloudTasksAPI, TokenBucket
 
 
 class Settings(BaseSettings):
@@ -70,13 +138,46 @@ class Settings(BaseSettings):
     )
     NOTIFICATION_TASKS_QUEUE_NAME: str = "send-notifications"
     SCHEDULE_ASSIGNMENTS_TASKS_QUEUE_NAME: str = "schedule-assignments"
+    BUNDLE_SAME_TIME_ASSIGNMENTS: bool = False
+    # A bundle is created in a single Firestore transaction, of at most 500 writes.
+    ASSIGNMENT_BUNDLE_SIZE: int = Field(default=250, gt=0, le=250)
+    CLOUD_TASKS_MAX_WORKERS: int = 16
+    CLOUD_TASKS_MAX_CREATE_RATE: float = 100.0
+    CLOUD_TASKS_MAX_ATTEMPTS: int = 5
     SCHEDULER_SERVICE_BASE_URL: HttpUrl = HttpUrl(
         "https://dummy-project-123.europe-west1.run.app/"
     )
     APPLICATION_SERVICE: Literal["back", "scheduler", "all"] = "back"
+    REPOSITORY_BACKEND: Literal["firestore", "sqlite"] = "firestore"
+    SQLITE_DATABASE_PATH: str = "lta.sqlite3"
     USE_FIRESTORE_EMULATOR: bool = False
     USE_FIREBASE_AUTH_EMULATOR: bool = False
     USE_DIRECT_SCHEDULERS: bool = False
+    CHAIN_REMINDER_NOTIFICATIONS: bool = False
+    TIMER_ENGINE_MAX_WORKERS: int = 4
+    TIMER_ENGINE_MAX_PENDING: int = 100_000
+    TIMER_ENGINE_STORE_PATH: str = "lta-timers.json"
+    USE_SQLITE_SCHEDULERS: bool = False
+    SQLITE_TASK_QUEUE_PATH: str = "lta-tasks.sqlite3"
+    SQLITE_TASK_QUEUE_WORKERS: int = 8
+    SQLITE_TASK_QUEUE_BATCH_SIZE: int = 100
+    SURVEY_CACHE_MAX_SIZE: int = 256
+    SURVEY_CACHE_TTL_SECONDS: float = 300.0
+    USE_COLLECTION_REPLICAS: bool = False
+    COLLECTION_REPLICA_READY_TIMEOUT_SECONDS: float = 10.0
+
+    # At least the longest a retried HTTP request can take (see `check_http_timeouts`).
+    NOTIFICATION_PUBLISHER_TIMEOUT_SECONDS: float = 45.0
+    CIRCUIT_BREAKER_WINDOW_SIZE: int = 20
+    CIRCUIT_BREAKER_MIN_CALLS: int = 5
+    CIRCUIT_BREAKER_FAILURE_RATE: float = 0.5
+    CIRCUIT_BREAKER_COOL_DOWN_SECONDS: float = 30.0
+    HTTP_POOL_SIZE: int = 10
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 3.0
+    HTTP_READ_TIMEOUT_SECONDS: float = 10.0
+    HTTP_MAX_RETRIES: int = 2
+    HTTP_RETRY_BACKOFF_FACTOR: float = 0.5
+    HTTP_RETRY_BACKOFF_MAX_SECONDS: float = 2.0
 
     TEST_NOTIFICATION_TITLE: str = "Test Notification from Language Track App"
     TEST_NOTIFICATION_MESSAGE: str = "This is a test notification."
@@ -93,42 +194,177 @@ class Settings(BaseSettings):
 
     model_config = SettingsConfigDict(env_file="settings/env.local-dev")
 
+    @model_validator(mode="after")
+    def check_http_timeouts(self) -> "Settings":
+        """
+        The notification service must not give up on a publisher while its request
+        may still be retried, or a message could be sent after being reported failed.
+        """
+        max_request_seconds = get_max_request_seconds(
+            (self.HTTP_CONNECT_TIMEOUT_SECONDS, self.HTTP_READ_TIMEOUT_SECONDS),
+            max_retries=self.HTTP_MAX_RETRIES,
+            backoff_factor=self.HTTP_RETRY_BACKOFF_FACTOR,
+            backoff_max=self.HTTP_RETRY_BACKOFF_MAX_SECONDS,
+        )
+        if max_request_seconds > self.NOTIFICATION_PUBLISHER_TIMEOUT_SECONDS:
+            raise ValueError(
+                f"NOTIFICATION_PUBLISHER_TIMEOUT_SECONDS must be at least "
+                f"{max_request_seconds}s, the longest a retried HTTP request can take"
+            )
+        return self
+
 
 @dataclass
 class AppConfiguration:
 
+    @cached_property
+    def sqlite_connections(self) -> SqliteConnections:
+        return SqliteConnections(get_settings().SQLITE_DATABASE_PATH)
+
+    @property
+    def use_sqlite_repositories(self) -> bool:
+        return get_settings().REPOSITORY_BACKEND == "sqlite"
+
     @cached_property
     def user_repository(self) -> UserRepository:
+        if self.use_sqlite_repositories:
+            return SqliteUserRepository(self.sqlite_connections)
         return FirestoreUserRepository(
             client=get_firestore_client(),
         )
 
     @cached_property
     def assignment_repository(self) -> AssignmentRepository:
+        expiration_delay = timedelta(
+            hours=get_settings().ASSIGNMENT_EXPIRATION_DELAY_HOURS
+        )
+        if self.use_sqlite_repositories:
+            return SqliteAssignmentRepository(
+                self.sqlite_connections, expiration_delay=expiration_delay
+            )
         return FirestoreAssignmentRepository(
             client=get_firestore_client(),
-            expiration_delay=timedelta(
-                hours=get_settings().ASSIGNMENT_EXPIRATION_DELAY_HOURS
-            ),
+            expiration_delay=expiration_delay,
         )
 
     @cached_property
     def schedule_repository(self) -> ScheduleRepository:
-        return FirestoreScheduleRepository(
+        if self.use_sqlite_repositories:
+            return SqliteScheduleRepository(self.sqlite_connections)
+        repository = FirestoreScheduleRepository(
             client=get_firestore_client(),
         )
+        if get_settings().USE_COLLECTION_REPLICAS:
+            return ReplicatedScheduleRepository(
+                repository=repository, replica=self.schedule_replica
+            )
+        return repository
 
     @cached_property
     def survey_repository(self) -> SurveyRepository:
-        return FirestoreSurveyRepository(
+        if self.use_sqlite_repositories:
+            return SqliteSurveyRepository(self.sqlite_connections)
+        repository = FirestoreSurveyRepository(
             client=get_firestore_client(),
         )
+        if get_settings().USE_COLLECTION_REPLICAS:
+            return ReplicatedSurveyRepository(
+                repository=repository, replica=self.survey_replica
+            )
+        return CachingSurveyRepository(
+            repository=repository,
+            max_size=get_settings().SURVEY_CACHE_MAX_SIZE,
+            ttl_seconds=get_settings().SURVEY_CACHE_TTL_SECONDS,
+        )
 
     @cached_property
     def group_repository(self) -> GroupRepository:
-        return FirestoreGroupRepository(
+        if self.use_sqlite_repositories:
+            return SqliteGroupRepository(self.sqlite_connections)
+        repository = FirestoreGroupRepository(
             client=get_firestore_client(),
         )
+        if get_settings().USE_COLLECTION_REPLICAS:
+            return ReplicatedGroupRepository(
+                repository=repository, replica=self.group_replica
+            )
+        return repository
+
+    @cached_property
+    def survey_replica(self) -> CollectionReplica[Survey]:
+        return CollectionReplica(
+            collection=get_firestore_client().collection("surveys"),
+            parse=parse_stored_survey,
+        )
+
+    @cached_property
+    def schedule_replica(self) -> CollectionReplica[Schedule]:
+        return CollectionReplica(
+            collection=get_firestore_client().collection("schedules"),
+            parse=parse_stored_schedule,
+        )
+
+    @cached_property
+    def group_replica(self) -> CollectionReplica[Group]:
+        return CollectionReplica(
+            collection=get_firestore_client().collection("groups"),
+            parse=parse_stored_group,
+        )
+
+    def start_collection_replicas(self) -> None:
+        """
+        Start the listeners of the replicated collections, and wait for their first
+        snapshot.  Until a replica is live, its repository reads directly from
+        Firestore.
+        """
+        if not get_settings().USE_COLLECTION_REPLICAS or self.use_sqlite_repositories:
+            return
+        replicas: dict[str, CollectionReplica[Any]] = dict(
+            surveys=self.survey_replica,
+            schedules=self.schedule_replica,
+            groups=self.group_replica,
+        )
+        for replica in replicas.values():
+            replica.start()
+        timeout = get_settings().COLLECTION_REPLICA_READY_TIMEOUT_SECONDS
+        deadline = time.monotonic() + timeout
+        for name, replica in replicas.items():
+            if not replica.wait_ready(max(deadline - time.monotonic(), 0)):
+                logging.warning(
+                    "Collection replica not ready, reading directly from Firestore",
+                    extra=dict(json_fields=dict(collection=name, timeout=timeout)),
+                )
+
+    def stop_collection_replicas(self) -> None:
+        if not get_settings().USE_COLLECTION_REPLICAS or self.use_sqlite_repositories:
+            return
+        self.survey_replica.stop()
+        self.schedule_replica.stop()
+        self.group_replica.stop()
+
+    @cached_property
+    def async_user_repository(self) -> AsyncUserRepository:
+        if self.use_sqlite_repositories:
+            return ThreadedUserRepository(self.user_repository)
+        return AsyncFirestoreUserRepository(
+            client=get_async_firestore_client(),
+        )
+
+    @cached_property
+    def async_assignment_repository(self) -> AsyncAssignmentRepository:
+        if self.use_sqlite_repositories:
+            return ThreadedAssignmentRepository(self.assignment_repository)
+        return AsyncFirestoreAssignmentRepository(
+            client=get_async_firestore_client(),
+        )
+
+    @cached_property
+    def async_group_repository(self) -> AsyncGroupRepository:
+        if get_settings().USE_COLLECTION_REPLICAS or self.use_sqlite_repositories:
+            return ThreadedGroupRepository(self.group_repository)
+        return AsyncFirestoreGroupRepository(
+            client=get_async_firestore_client(),
+        )
 
     @cached_property
     def assignment_limit_on_app_home_page(self) -> int:
@@ -138,13 +374,14 @@ class AppConfiguration:
     def notification_service(self) -> NotificationService:
         return NotificationService(
             publishers=[
-                self.mailgun_notification_publisher,
-                self.vonage_notification_publisher,
-                self.expo_notification_publisher,
+                make_circuit_breaker(self.mailgun_notification_publisher),
+                make_circuit_breaker(self.vonage_notification_publisher),
+                make_circuit_breaker(self.expo_notification_publisher),
             ],
             user_repository=self.user_repository,
             assignment_repository=self.assignment_repository,
             survey_repository=self.survey_repository,
+            publisher_timeout_seconds=get_settings().NOTIFICATION_PUBLISHER_TIMEOUT_SECONDS,
         )
 
     @cached_property
@@ -159,6 +396,8 @@ class AppConfiguration:
         api = MailgunAPI(
             api_key=api_key,
             api_url=api_url,
+            session=make_notification_http_session(),
+            timeout=get_http_timeout(),
         )
         return MailgunNotificationPublisher(
             api=api,
@@ -174,9 +413,18 @@ class AppConfiguration:
             api_key and api_secret and sender
         ), "Missing Vonage API key, API secret, or sender"
 
+        settings = get_settings()
         client = vonage.Client(
             key=api_key,
             secret=api_secret,
+            timeout=get_http_timeout(),
+            pool_connections=settings.HTTP_POOL_SIZE,
+            pool_maxsize=settings.HTTP_POOL_SIZE,
+            max_retries=make_http_retry(
+                max_retries=settings.HTTP_MAX_RETRIES,
+                backoff_factor=settings.HTTP_RETRY_BACKOFF_FACTOR,
+                backoff_max=settings.HTTP_RETRY_BACKOFF_MAX_SECONDS,
+            ),
         )
         return VonageNotificationPublisher(
             client=client,
@@ -185,22 +433,50 @@ class AppConfiguration:
 
     @cached_property
     def expo_notification_publisher(self) -> ExpoNotificationPublisher:
-        return ExpoNotificationPublisher(expo_api=ExpoAPI())
+        return ExpoNotificationPublisher(
+            expo_api=self.expo_api,
+            ticket_repository=self.push_ticket_repository,
+            user_repository=self.user_repository,
+        )
+
+    @cached_property
+    def expo_api(self) -> ExpoAPI:
+        return ExpoAPI(
+            session=make_notification_http_session(),
+            timeout=get_http_timeout(),
+        )
+
+    @cached_property
+    def push_ticket_repository(self) -> PushTicketRepository:
+        if self.use_sqlite_repositories:
+            return SqlitePushTicketRepository(self.sqlite_connections)
+        return FirestorePushTicketRepository(
+            client=get_firestore_client(),
+        )
+
+    @cached_property
+    def expo_receipt_checker(self) -> ExpoReceiptChecker:
+        return ExpoReceiptChecker(
+            expo_api=self.expo_api,
+            ticket_repository=self.push_ticket_repository,
+            user_repository=self.user_repository,
+        )
 
     @cached_property
     def cloud_tasks_notification_scheduler(self) -> NotificationScheduler:
         return CloudTasksNotificationScheduler(
-            tasks_api=CloudTasksAPI(
-                client=tasks_v2.CloudTasksClient(),
-                url=HttpUrl(
-                    urljoin(
-                        str(get_settings().SCHEDULER_SERVICE_BASE_URL), "notify-user/"
-                    )
-                ),
-                project_id=get_settings().PROJECT_NAME,
-                location=get_settings().PROJECT_LOCATION,
+            tasks_api=make_cloud_tasks_api(
+                path="notify-user/",
+                queue_name=get_settings().NOTIFICATION_TASKS_QUEUE_NAME,
+            ),
+        )
+
+    @cached_property
+    def chained_cloud_tasks_notification_scheduler(self) -> NotificationScheduler:
+        return ChainedCloudTasksNotificationScheduler(
+            tasks_api=make_cloud_tasks_api(
+                path="notify-user/",
                 queue_name=get_settings().NOTIFICATION_TASKS_QUEUE_NAME,
-                service_account_email=get_settings().CLOUD_TASKS_SERVICE_ACCOUNT_ID,
             ),
         )
 
@@ -209,12 +485,84 @@ class AppConfiguration:
         return DirectNotificationScheduler(
             user_repository=self.user_repository,
             notification_service=self.notification_service,
+            timer_engine=self.timer_engine,
+        )
+
+    @cached_property
+    def sqlite_task_queue(self) -> SqliteTaskQueue:
+        return SqliteTaskQueue(
+            connections=SqliteConnections(get_settings().SQLITE_TASK_QUEUE_PATH),
+            max_attempts=get_settings().CLOUD_TASKS_MAX_ATTEMPTS,
+        )
+
+    @cached_property
+    def sqlite_notification_scheduler(self) -> NotificationScheduler:
+        return SqliteNotificationScheduler(task_queue=self.sqlite_task_queue)
+
+    @cached_property
+    def sqlite_task_dispatcher(self) -> SqliteTaskDispatcher:
+        return SqliteTaskDispatcher(
+            queue=self.sqlite_task_queue,
+            handlers=make_task_handlers(
+                assignment_service=self.assignment_service,
+                notification_service=self.notification_service,
+            ),
+            max_workers=get_settings().SQLITE_TASK_QUEUE_WORKERS,
+            batch_size=get_settings().SQLITE_TASK_QUEUE_BATCH_SIZE,
+        )
+
+    def start_task_dispatcher(self) -> None:
+        """Start running the tasks of the SQLite schedulers."""
+        if get_settings().USE_SQLITE_SCHEDULERS:
+            self.sqlite_task_dispatcher.start()
+
+    def stop_task_dispatcher(self) -> None:
+        if get_settings().USE_SQLITE_SCHEDULERS:
+            self.sqlite_task_dispatcher.stop()
+
+    @cached_property
+    def timer_engine(self) -> TimerEngine:
+        return TimerEngine(
+            max_workers=get_settings().TIMER_ENGINE_MAX_WORKERS,
+            max_pending=get_settings().TIMER_ENGINE_MAX_PENDING,
+            store=TimerStore(Path(get_settings().TIMER_ENGINE_STORE_PATH)),
+        )
+
+    def start_timer_engine(self) -> None:
+        """Start running the notifications and assignments of the direct schedulers."""
+        if not get_settings().USE_DIRECT_SCHEDULERS:
+            return
+        # the schedulers register their handlers, needed by the stored timers
+        self.direct_notification_scheduler
+        self.direct_assignment_scheduler
+        self.timer_engine.start()
+
+    def stop_timer_engine(self) -> None:
+        if not get_settings().USE_DIRECT_SCHEDULERS:
+            return
+        stored = self.timer_engine.stop()
+        stats = self.timer_engine.stats
+        logging.info(
+            "Timer engine stopped",
+            extra=dict(
+                json_fields=dict(
+                    fired=stats.fired,
+                    failed=stats.failed,
+                    mean_lag_seconds=stats.mean_lag_seconds,
+                    max_lag_seconds=stats.max_lag_seconds,
+                    stored=len(stored),
+                )
+            ),
         )
 
     @cached_property
     def assignment_service(self) -> AssignmentService:
         if get_settings().USE_DIRECT_SCHEDULERS:
             notification_scheduler = self.direct_notification_scheduler
+        elif get_settings().USE_SQLITE_SCHEDULERS:
+            notification_scheduler = self.sqlite_notification_scheduler
+        elif get_settings().CHAIN_REMINDER_NOTIFICATIONS:
+            notification_scheduler = self.chained_cloud_tasks_notification_scheduler
         else:
             notification_scheduler = self.cloud_tasks_notification_scheduler
 
@@ -229,37 +577,44 @@ class AppConfiguration:
     @cached_property
     def cloud_tasks_assignment_scheduler(self) -> AssignmentScheduler:
         return CloudTasksAssignmentScheduler(
-            tasks_api=CloudTasksAPI(
-                client=tasks_v2.CloudTasksClient(),
-                url=HttpUrl(
-                    urljoin(
-                        str(get_settings().SCHEDULER_SERVICE_BASE_URL),
-                        "schedule-assignment/",
-                    )
-                ),
-                project_id=get_settings().PROJECT_NAME,
-                location=get_settings().PROJECT_LOCATION,
+            tasks_api=make_cloud_tasks_api(
+                path="schedule-assignment/",
+                queue_name=get_settings().SCHEDULE_ASSIGNMENTS_TASKS_QUEUE_NAME,
+            ),
+            bundle_tasks_api=make_cloud_tasks_api(
+                path="schedule-assignment-bundle/",
                 queue_name=get_settings().SCHEDULE_ASSIGNMENTS_TASKS_QUEUE_NAME,
-                service_account_email=get_settings().CLOUD_TASKS_SERVICE_ACCOUNT_ID,
             ),
+            bundle_size=get_settings().ASSIGNMENT_BUNDLE_SIZE,
         )
 
     @cached_property
     def direct_assignment_scheduler(self) -> AssignmentScheduler:
         return DirectAssignmentScheduler(
             assignment_service=self.assignment_service,
+            timer_engine=self.timer_engine,
+        )
+
+    @cached_property
+    def sqlite_assignment_scheduler(self) -> AssignmentScheduler:
+        return SqliteAssignmentScheduler(
+            task_queue=self.sqlite_task_queue,
+            bundle_size=get_settings().ASSIGNMENT_BUNDLE_SIZE,
         )
 
     @cached_property
     def scheduler_service(self) -> SchedulerService:
         if get_settings().USE_DIRECT_SCHEDULERS:
             assignment_scheduler = self.direct_assignment_scheduler
+        elif get_settings().USE_SQLITE_SCHEDULERS:
+            assignment_scheduler = self.sqlite_assignment_scheduler
         else:
             assignment_scheduler = self.cloud_tasks_assignment_scheduler
         return SchedulerService(
             assignment_scheduler=assignment_scheduler,
             schedule_repository=self.schedule_repository,
             group_repository=self.group_repository,
+            bundle_same_time_assignments=get_settings().BUNDLE_SAME_TIME_ASSIGNMENTS,
         )
 
 
@@ -311,6 +666,18 @@ def get_firestore_client(use_emulator: bool = False) -> google.cloud.firestore.C
     return firebase_admin.firestore.client()
 
 
+@cache
+def get_async_firestore_client(
+    use_emulator: bool = False,
+) -> google.cloud.firestore.AsyncClient:
+    if (use_emulator or get_settings().USE_FIRESTORE_EMULATOR) and not os.environ.get(
+        "FIRESTORE_EMULATOR_HOST"
+    ):
+        os.environ["FIRESTORE_EMULATOR_HOST"] = "127.0.0.1:8080"
+    get_firebase_app()
+    return firebase_admin.firestore_async.client()
+
+
 @cache
 def get_firebase_app() -> firebase_admin.App:
     """
@@ -330,6 +697,68 @@ def get_firebase_app() -> firebase_admin.App:
     )
 
 
+@cache
+def get_cloud_tasks_client() -> tasks_v2.CloudTasksClient:
+    return tasks_v2.CloudTasksClient()
+
+
+@cache
+def get_cloud_tasks_rate_limiter(queue_name: str) -> TokenBucket:
+    """
+    Return the rate limiter shared by all the clients creating tasks on `queue_name`,
+    so that `CLOUD_TASKS_MAX_CREATE_RATE` bounds the rate of the whole queue.
+    """
+    return TokenBucket.for_rate(get_settings().CLOUD_TASKS_MAX_CREATE_RATE)
+
+
+def make_cloud_tasks_api(path: str, queue_name: str) -> CloudTasksAPI:
+    """
+    Return a client creating tasks on the `queue_name` queue, which call the scheduler
+    service at `path`.
+    """
+    return CloudTasksAPI(
+        client=get_cloud_tasks_client(),
+        url=HttpUrl(urljoin(str(get_settings().SCHEDULER_SERVICE_BASE_URL), path)),
+        project_id=get_settings().PROJECT_NAME,
+        location=get_settings().PROJECT_LOCATION,
+        queue_name=queue_name,
+        service_account_email=get_settings().CLOUD_TASKS_SERVICE_ACCOUNT_ID,
+        max_workers=get_settings().CLOUD_TASKS_MAX_WORKERS,
+        rate_limiter=get_cloud_tasks_rate_limiter(queue_name),
+        max_attempts=get_settings().CLOUD_TASKS_MAX_ATTEMPTS,
+    )
+
+
+def make_circuit_breaker(
+    publisher: NotificationPublisher,
+) -> CircuitBreakerNotificationPublisher:
+    settings = get_settings()
+    return CircuitBreakerNotificationPublisher(
+        publisher=publisher,
+        window_size=settings.CIRCUIT_BREAKER_WINDOW_SIZE,
+        min_calls=settings.CIRCUIT_BREAKER_MIN_CALLS,
+        failure_rate_threshold=settings.CIRCUIT_BREAKER_FAILURE_RATE,
+        cool_down_seconds=settings.CIRCUIT_BREAKER_COOL_DOWN_SECONDS,
+    )
+
+
+def make_notification_http_session() -> requests.Session:
+    settings = get_settings()
+    return make_http_session(
+        pool_size=settings.HTTP_POOL_SIZE,
+        max_retries=settings.HTTP_MAX_RETRIES,
+        backoff_factor=settings.HTTP_RETRY_BACKOFF_FACTOR,
+        backoff_max=settings.HTTP_RETRY_BACKOFF_MAX_SECONDS,
+    )
+
+
+def get_http_timeout() -> Timeout:
+    return (
+        get_settings().HTTP_CONNECT_TIMEOUT_SECONDS,
+        get_settings().HTTP_READ_TIMEOUT_SECONDS,
+    )
+
+
 def get_project_name() -> str:
     return get_settings().PROJECT_NAME
 
@@ -391,3 +820,7 @@ def get_vonage_notification_publisher() -> VonageNotificationPublisher:
 
 def get_expo_notification_publisher() -> ExpoNotificationPublisher:
     return get_configuration().expo_notification_publisher
+
+
+def get_expo_receipt_checker() -> ExpoReceiptChecker:
+    return get_configuration().expo_receipt_checker
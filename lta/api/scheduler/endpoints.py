@@ -1,21 +1,30 @@
+import dataclasses
 from datetime import datetime, time, timezone
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query
 from pydantic import BaseModel
 
 from lta.api.configuration import (
     get_assignment_service,
+    get_expo_receipt_checker,
     get_notification_service,
     get_scheduler_service,
 )
 from lta.domain.scheduler.assignment_service import AssignmentService
 from lta.domain.scheduler.notification_pulisher import NotificationType
+from lta.domain.scheduler.notification_scheduler import NotificationRequest
 from lta.domain.scheduler.notification_service import NotificationService
 from lta.domain.scheduler.scheduler_service import SchedulerService, get_next_monday
+from lta.infra.scheduler.expo.receipt_checker import ExpoReceiptChecker
 
 router = APIRouter()
 
 
+class ScheduleAssignmentsResponse(BaseModel):
+    scheduled: int
+    errors: int
+
+
 @router.get("/schedule-assignments/")
 def schedule_assignments(
     ref_time: datetime = Query(
@@ -24,8 +33,12 @@ def schedule_assignments(
         ),
     ),
     scheduler_service: SchedulerService = Depends(get_scheduler_service),
-) -> None:
-    scheduler_service.schedule_assignments(ref_time=ref_time)
+) -> ScheduleAssignmentsResponse:
+    summary = scheduler_service.schedule_assignments(ref_time=ref_time)
+    return ScheduleAssignmentsResponse(
+        scheduled=summary.scheduled,
+        errors=len(summary.errors),
+    )
 
 
 class ScheduleAssignmentRequest(BaseModel):
@@ -37,26 +50,94 @@ class ScheduleAssignmentRequest(BaseModel):
 def schedule_assignment(
     request: ScheduleAssignmentRequest,
     ref_time: datetime = Query(default_factory=lambda: datetime.now(tz=timezone.utc)),
+    task_name: str | None = Header(default=None, alias="X-CloudTasks-TaskName"),
     assignment_service: AssignmentService = Depends(get_assignment_service),
 ) -> None:
+    # The task name is kept across the retries of the task: a retry creates no
+    # second assignment.
     assignment_service.create_assignment(
-        user_id=request.user_id, survey_id=request.survey_id, ref_time=ref_time
+        user_id=request.user_id,
+        survey_id=request.survey_id,
+        ref_time=ref_time,
+        idempotency_key=task_name,
+    )
+
+
+class ScheduleAssignmentBundleRequest(BaseModel):
+    user_ids: list[str]
+    survey_id: str
+
+
+@router.post("/schedule-assignment-bundle/")
+def schedule_assignment_bundle(
+    request: ScheduleAssignmentBundleRequest,
+    ref_time: datetime = Query(default_factory=lambda: datetime.now(tz=timezone.utc)),
+    task_name: str | None = Header(default=None, alias="X-CloudTasks-TaskName"),
+    assignment_service: AssignmentService = Depends(get_assignment_service),
+) -> None:
+    # With bundles of at most 250 users (see `ASSIGNMENT_BUNDLE_SIZE`), the
+    # assignments are written in a single transaction.  The ids are derived from the
+    # task name, which is kept across retries: a retry skips the assignments already
+    # created.  Notifications that could not be scheduled fail the request, so that
+    # the task is retried.
+    assignment_service.create_assignments(
+        user_ids=request.user_ids,
+        survey_id=request.survey_id,
+        ref_time=ref_time,
+        idempotency_key=task_name,
     )
 
 
+class NextReminder(BaseModel):
+    when: datetime
+    reminder_index: int
+
+
 class NotifyUserRequest(BaseModel):
     user_id: str
     assignment_id: str
     notification_type: NotificationType
+    next_reminders: list[NextReminder] = []
 
 
 @router.post("/notify-user/")
 def notify_user(
     request: NotifyUserRequest,
     notification_service: NotificationService = Depends(get_notification_service),
+    assignment_service: AssignmentService = Depends(get_assignment_service),
 ) -> None:
-    notification_service.notify_user(
+    assignment = notification_service.notify_user(
         user_id=request.user_id,
         assignment_id=request.assignment_id,
         notification_type=request.notification_type,
     )
+    if request.next_reminders:
+        assignment_service.continue_notifications(
+            assignment,
+            [
+                NotificationRequest(
+                    user_id=request.user_id,
+                    assignment_id=request.assignment_id,
+                    notification_type=NotificationType.REMINDER,
+                    when=reminder.when,
+                    reminder_index=reminder.reminder_index,
+                )
+                for reminder in request.next_reminders
+            ],
+        )
+
+
+class CheckPushReceiptsResponse(BaseModel):
+    checked: int
+    pending: int
+    errors: int
+    removed_devices: int
+
+
+@router.get("/check-push-receipts/")
+def check_push_receipts(
+    ref_time: datetime = Query(default_factory=lambda: datetime.now(tz=timezone.utc)),
+    receipt_checker: ExpoReceiptChecker = Depends(get_expo_receipt_checker),
+) -> CheckPushReceiptsResponse:
+    summary = receipt_checker.check_receipts(ref_time=ref_time)
+    return CheckPushReceiptsResponse(**dataclasses.asdict(summary))
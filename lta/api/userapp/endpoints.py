@@ -1,6 +1,11 @@
+import asyncio
+import logging
+import time
 from datetime import datetime, timezone
+from typing import Awaitable, TypeVar
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 from lta.api.configuration import (
@@ -26,6 +31,8 @@ from lta.infra.scheduler.expo.notification_publisher import ExpoNotificationPubl
 
 router = APIRouter()
 
+T = TypeVar("T")
+
 
 class Assignment(BaseModel):
     id: str
@@ -46,40 +53,60 @@ class AssignmentListResponse(BaseModel):
     pending_assignment: PendingAssignment | None
 
 
+async def _timed(name: str, durations: dict[str, float], awaitable: Awaitable[T]) -> T:
+    """Await `awaitable` and record its duration, in milliseconds, in `durations`."""
+    start = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        durations[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
 @router.get("/assignments/")
 async def get_assignments(
     when: datetime = Query(default_factory=lambda: datetime.now(timezone.utc)),
     configuration: AppConfiguration = Depends(get_configuration),
     user: AuthenticatedUser = Depends(get_authenticated_user),
 ) -> AssignmentListResponse:
-    assignments = configuration.assignment_repository.list_assignments(
-        user.id, limit=configuration.assignment_limit_on_app_home_page
-    )
-    total_assignments = configuration.assignment_repository.count_assignments(user.id)
-    non_answered_assignments = (
-        configuration.assignment_repository.count_non_answered_assignments(user.id)
+    assignment_repository = configuration.async_assignment_repository
+    durations: dict[str, float] = {}
+    assignments, stats = await asyncio.gather(
+        _timed(
+            "list_assignment_summaries",
+            durations,
+            assignment_repository.list_assignment_summaries(
+                user.id, limit=configuration.assignment_limit_on_app_home_page
+            ),
+        ),
+        _timed(
+            "get_assignment_stats",
+            durations,
+            assignment_repository.get_assignment_stats(user.id, when),
+        ),
     )
-    pending_assignment = (
-        configuration.assignment_repository.get_next_pending_assignment(user.id, when)
+    logging.info(
+        "Home page queries",
+        extra=dict(json_fields=dict(user_id=user.id, durations_ms=durations)),
     )
     return AssignmentListResponse(
         assignments=[
             Assignment(
                 id=a.id,
                 title=a.title,
-                answered=a.answers is not None,
+                answered=a.answered,
                 date=a.created_at,
             )
             for a in assignments
         ],
-        total_assignments=total_assignments,
-        answered_assignments=total_assignments - non_answered_assignments,
+        total_assignments=stats.total,
+        answered_assignments=stats.submitted,
         pending_assignment=(
             PendingAssignment(
-                id=pending_assignment.id,
-                expired_at=pending_assignment.expired_at,
+                id=stats.next_pending_id,
+                expired_at=stats.next_pending_expired_at,
             )
-            if pending_assignment
+            if stats.next_pending_id is not None
+            and stats.next_pending_expired_at is not None
             else None
         ),
     )
@@ -99,15 +126,17 @@ async def get_assignment_with_user_id(
     user_id: str,
     configuration: AppConfiguration = Depends(get_configuration),
 ) -> AssignmentResponse:
-    assignment = configuration.assignment_repository.get_assignment(
+    assignment = await configuration.async_assignment_repository.get_assignment(
         user_id, assignment_id
     )
     if assignment.submitted_at is not None:
         raise HTTPException(status_code=410, detail="Assignment already submitted")
 
-    survey = configuration.survey_repository.get_survey(assignment.survey_id)
+    survey = await run_in_threadpool(
+        configuration.survey_repository.get_survey, assignment.survey_id
+    )
 
-    configuration.assignment_repository.open_assignment(
+    await configuration.async_assignment_repository.open_assignment(
         user_id=user_id,
         id=assignment_id,
         when=datetime.now(tz=timezone.utc),
@@ -128,15 +157,17 @@ async def get_assignment(
     configuration: AppConfiguration = Depends(get_configuration),
     user: AuthenticatedUser = Depends(get_authenticated_user),
 ) -> AssignmentResponse:
-    assignment = configuration.assignment_repository.get_assignment(
+    assignment = await configuration.async_assignment_repository.get_assignment(
         user.id, assignment_id
     )
     if assignment.submitted_at is not None:
         raise HTTPException(status_code=410, detail="Assignment already submitted")
 
-    survey = configuration.survey_repository.get_survey(assignment.survey_id)
+    survey = await run_in_threadpool(
+        configuration.survey_repository.get_survey, assignment.survey_id
+    )
 
-    configuration.assignment_repository.open_assignment(
+    await configuration.async_assignment_repository.open_assignment(
         user_id=user.id,
         id=assignment_id,
         when=datetime.now(tz=timezone.utc),
@@ -160,11 +191,13 @@ async def put_assignment_answers_with_userid(
     request: SubmitAssignmentAnswersRequest,
     assignment_id: str,
     user_id: str,
+    background_tasks: BackgroundTasks,
     when: datetime = Query(default_factory=lambda: datetime.now(timezone.utc)),
     configuration: AppConfiguration = Depends(get_configuration),
+    assignment_service: AssignmentService = Depends(get_assignment_service),
 ) -> None:
     try:
-        configuration.assignment_repository.submit_assignment(
+        await configuration.async_assignment_repository.submit_assignment(
             user_id=user_id,
             id=assignment_id,
             when=when,
@@ -172,18 +205,26 @@ async def put_assignment_answers_with_userid(
         )
     except SubmissionTooLate:
         raise HTTPException(status_code=410)
+    # the reminders are cancelled after the response is sent
+    background_tasks.add_task(
+        assignment_service.cancel_reminders,
+        user_id=user_id,
+        assignment_id=assignment_id,
+    )
 
 
 @router.put("/assignments/{assignment_id}/")
 async def put_assignment_answers(
     request: SubmitAssignmentAnswersRequest,
     assignment_id: str,
+    background_tasks: BackgroundTasks,
     when: datetime = Query(default_factory=lambda: datetime.now(timezone.utc)),
     configuration: AppConfiguration = Depends(get_configuration),
     user: AuthenticatedUser = Depends(get_authenticated_user),
+    assignment_service: AssignmentService = Depends(get_assignment_service),
 ) -> None:
     try:
-        configuration.assignment_repository.submit_assignment(
+        await configuration.async_assignment_repository.submit_assignment(
             user_id=user.id,
             id=assignment_id,
             when=when,
@@ -191,6 +232,12 @@ async def put_assignment_answers(
         )
     except SubmissionTooLate:
         raise HTTPException(status_code=410)
+    # the reminders are cancelled after the response is sent
+    background_tasks.add_task(
+        assignment_service.cancel_reminders,
+        user_id=user.id,
+        assignment_id=assignment_id,
+    )
 
 
 class DeviceRegistrationRequest(BaseModel):
@@ -248,9 +295,8 @@ def test_push_notification(
 ) -> None:
     devices = user_repository.get_user(user.id).notification_info.devices
     tokens = [device.token for device in devices if device.token != "__null__"]
-    for token in tokens:
-        notification_publisher.send_push_notification(
-            device_token=token,
-            title="LTA test notification",
-            body="This is a test push notification.",
-        )
+    notification_publisher.send_push_notifications(
+        device_tokens=tokens,
+        title="LTA test notification",
+        body="This is a test push notification.",
+    )
@@ -3,10 +3,11 @@ import json
 import logging
 import uuid
 from collections import defaultdict
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 from pprint import pprint
-from typing import Any
+from typing import Any, Iterator
 
 import firebase_admin.auth
 import pydantic
@@ -17,7 +18,9 @@ from lta.api.configuration import (
     Environment,
     get_assignment_repository,
     get_assignment_service,
+    get_configuration,
     get_expo_notification_publisher,
+    get_expo_receipt_checker,
     get_firebase_app,
     get_firestore_client,
     get_mailgun_notification_publisher,
@@ -32,10 +35,24 @@ from lta.authentication import HAS_SET_OWN_PASSWORD_FIELD
 from lta.domain.assignment import Assignment
 from lta.domain.survey import Survey
 from lta.domain.survey_repository import SurveyCreation
+from lta.infra.repositories.firestore.utils import MAX_WRITE_BATCH_SIZE
 
 logging.basicConfig(level=logging.DEBUG)
 
 
+@contextmanager
+def running_timer_engine() -> Iterator[None]:
+    """
+    With the direct schedulers, run the timers due before the command exits, and
+    store the later ones for the app (which loads them when it starts).
+    """
+    get_configuration().start_timer_engine()
+    try:
+        yield
+    finally:
+        get_configuration().stop_timer_engine()
+
+
 app = Typer(pretty_exceptions_enable=False)
 
 
@@ -103,7 +120,11 @@ def schedule_assignments(
     """Schedule assignments for the ref date"""
     set_environment(Environment.LOCAL_PROD)
     service = get_scheduler_service()
-    service.schedule_assignments(ref_time=ref_time)
+    with running_timer_engine():
+        summary = service.schedule_assignments(ref_time=ref_time)
+    print(f"Scheduled: {summary.scheduled}, errors: {len(summary.errors)}")
+    for error in summary.errors:
+        print(f"Error for user {error.user_id}: {error.error_message}")
 
 
 @app.command()
@@ -138,9 +159,10 @@ def schedule_assignment(
 ) -> None:
     set_environment(Environment.LOCAL_PROD)
     assignment_service = get_assignment_service()
-    assignment_service.create_assignment(
-        user_id=user_id, survey_id=survey_id, ref_time=ref_time
-    )
+    with running_timer_engine():
+        assignment_service.create_assignment(
+            user_id=user_id, survey_id=survey_id, ref_time=ref_time
+        )
 
 
 @app.command()
@@ -203,6 +225,38 @@ def stats() -> None:
         print(f"User: {user.id} - {user.email_address}: {submitted} / {total}")
 
 
+@app.command()
+def rebuild_assignment_stats(
+    user_ids: list[str] = Option(
+        [], "--user-id", help="may be repeated (default: all users)"
+    ),
+) -> None:
+    """Recompute the assignment counters of the users from their assignments"""
+    set_environment(Environment.LOCAL_PROD)
+    user_repository = get_user_repository()
+    assignment_repository = get_assignment_repository()
+    if not user_ids:
+        user_ids = [user.id for user in user_repository.list_users()]
+    ref_time = datetime.now(tz=timezone.utc)
+    for user_id in user_ids:
+        assignment_repository.rebuild_assignment_stats(user_id, ref_time)
+        stats = assignment_repository.get_assignment_stats(user_id, ref_time)
+        print(f"User: {user_id} - {stats.submitted} / {stats.total}")
+
+
+@app.command()
+def check_push_receipts() -> None:
+    """Read the Expo push receipts, and remove the devices which are not registered"""
+    set_environment(Environment.LOCAL_PROD)
+    summary = get_expo_receipt_checker().check_receipts(
+        ref_time=datetime.now(tz=timezone.utc)
+    )
+    print(
+        f"Receipts checked: {summary.checked} - pending: {summary.pending} - "
+        f"errors: {summary.errors} - devices removed: {summary.removed_devices}"
+    )
+
+
 @app.command()
 def send_test_sms_notification(
     user_id: str = Option(...),
@@ -236,13 +290,15 @@ def send_test_push_notification(
         print(f"No device token found for user id: {user_id}")
         return
 
-    for token in tokens:
-        print(f"Sending push notification to device token: {token}")
-        notification_publisher.send_push_notification(
-            device_token=token,
-            title="LTA test notification",
-            body="This is a test push notification.",
-        )
+    print(f"Sending push notification to device tokens: {', '.join(tokens)}")
+    tickets = notification_publisher.send_push_notifications(
+        device_tokens=tokens,
+        title="LTA test notification",
+        body="This is a test push notification.",
+    )
+    for ticket in tickets:
+        if not ticket.ok:
+            print(f"Error for device token {ticket.device_token}: {ticket.message}")
 
 
 @app.command()
@@ -387,6 +443,36 @@ def _backup_assignments(client: firestore.Client, output_file: Path) -> None:
         json.dump(data, fh, indent=2, cls=CustomJSONEncoder)
 
 
+@app.command()
+def backfill_last_opened_at() -> None:
+    """Copy the last opening time of the assignments opened before it was stored"""
+    set_environment(Environment.LOCAL_PROD)
+    client = get_firestore_client()
+    updated = 0
+    for user_doc in client.collection("users").stream():
+        batch = client.batch()
+        batch_size = 0
+        docs = (
+            user_doc.reference.collection("assignments")
+            .select(["opened_at", "last_opened_at"])
+            .stream()
+        )
+        for doc in docs:
+            data = doc.to_dict()
+            if data.get("opened_at") and data.get("last_opened_at") is None:
+                batch.update(doc.reference, {"last_opened_at": max(data["opened_at"])})
+                batch_size += 1
+            if batch_size == MAX_WRITE_BATCH_SIZE:
+                batch.commit()
+                updated += batch_size
+                batch = client.batch()
+                batch_size = 0
+        if batch_size:
+            batch.commit()
+            updated += batch_size
+    print(f"Updated {updated} assignments")
+
+
 @app.command()
 def clone_survey(
     survey_id: str = Option(...),
@@ -31,3 +31,37 @@ class Assignment(BaseModel):
     opened_at: list[datetime] = Field(default_factory=list)
     submitted_at: datetime | None = None
     answers: list[AnswerType] | None = None
+
+
+class AssignmentSummary(BaseModel):
+    """The fields of an assignment needed by the list views."""
+
+    id: str
+    title: str
+    created_at: datetime
+    submitted_at: datetime | None = None
+    last_opened_at: datetime | None = None
+
+    @property
+    def answered(self) -> bool:
+        # The answers are stored when the assignment is submitted.
+        return self.submitted_at is not None
+
+
+class AssignmentStats(BaseModel):
+    """
+    Counters of the assignments of a user.
+
+    `next_pending_id` and `next_pending_expired_at` describe the assignment that
+    `get_next_pending_assignment` returns at the ref time the stats were read for.
+    """
+
+    total: int = 0
+    submitted: int = 0
+    last_created_at: datetime | None = None
+    next_pending_id: str | None = None
+    next_pending_expired_at: datetime | None = None
+
+    @property
+    def non_answered(self) -> int:
+        return self.total - self.submitted
@@ -3,7 +3,13 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Protocol
 
-from lta.domain.assignment import AnswerType, Assignment
+from lta.domain.assignment import (
+    AnswerType,
+    Assignment,
+    AssignmentStats,
+    AssignmentSummary,
+)
+from lta.domain.pagination import Page
 
 
 @dataclass
@@ -18,6 +24,15 @@ class SubmissionTooLate(Exception):
     assignment_id: str
 
 
+@dataclass
+class AssignmentCreation:
+    user_id: str
+    id: str
+    survey_id: str
+    survey_title: str
+    created_at: datetime
+
+
 class AssignmentRepository(Protocol):
     @abstractmethod
     def get_assignment(self, user_id: str, id: str) -> Assignment: ...
@@ -32,11 +47,33 @@ class AssignmentRepository(Protocol):
         created_at: datetime,
     ) -> None: ...
 
+    @abstractmethod
+    def create_assignments(self, creations: list[AssignmentCreation]) -> None:
+        """
+        Like `create_assignment` for each creation.  An assignment which already
+        exists is left as is (so that a retried creation doesn't reset it).
+        """
+
     @abstractmethod
     def list_assignments(
         self, user_id: str, limit: int | None = None
     ) -> list[Assignment]: ...
 
+    @abstractmethod
+    def list_assignment_summaries(
+        self, user_id: str, limit: int | None = None
+    ) -> list[AssignmentSummary]:
+        """Same order as `list_assignments`, without the answers and the event lists."""
+
+    @abstractmethod
+    def list_assignment_summaries_page(
+        self, user_id: str, page_size: int, cursor: str | None = None
+    ) -> Page[AssignmentSummary]:
+        """
+        Same order as `list_assignment_summaries`, `page_size` at a time.  Raise
+        `InvalidCursor` if `cursor` was not returned by this method.
+        """
+
     @abstractmethod
     def count_assignments(self, user_id: str) -> int: ...
 
@@ -61,3 +98,65 @@ class AssignmentRepository(Protocol):
     ) -> Assignment | None: ...
 
     def count_non_answered_assignments(self, user_id: str) -> int: ...
+
+    @abstractmethod
+    def get_assignment_stats(
+        self, user_id: str, ref_time: datetime
+    ) -> AssignmentStats: ...
+
+    def rebuild_assignment_stats(self, user_id: str, ref_time: datetime) -> None:
+        """
+        Recompute the stats of the user from all their assignments.
+
+        Nothing to do for repositories that compute the stats when they are read.
+        """
+        return None
+
+
+class AsyncAssignmentRepository(Protocol):
+    """
+    Async counterpart of `AssignmentRepository`, limited to the methods used by the
+    async API handlers.
+    """
+
+    @abstractmethod
+    async def get_assignment(self, user_id: str, id: str) -> Assignment: ...
+
+    @abstractmethod
+    async def list_assignments(
+        self, user_id: str, limit: int | None = None
+    ) -> list[Assignment]: ...
+
+    @abstractmethod
+    async def list_assignment_summaries(
+        self, user_id: str, limit: int | None = None
+    ) -> list[AssignmentSummary]: ...
+
+    @abstractmethod
+    async def list_assignment_summaries_page(
+        self, user_id: str, page_size: int, cursor: str | None = None
+    ) -> Page[AssignmentSummary]: ...
+
+    @abstractmethod
+    async def count_assignments(self, user_id: str) -> int: ...
+
+    @abstractmethod
+    async def count_non_answered_assignments(self, user_id: str) -> int: ...
+
+    @abstractmethod
+    async def get_assignment_stats(
+        self, user_id: str, ref_time: datetime
+    ) -> AssignmentStats: ...
+
+    @abstractmethod
+    async def get_next_pending_assignment(
+        self, user_id: str, ref_time: datetime
+    ) -> Assignment | None: ...
+
+    @abstractmethod
+    async def open_assignment(self, user_id: str, id: str, when: datetime) -> None: ...
+
+    @abstractmethod
+    async def submit_assignment(
+        self, user_id: str, id: str, when: datetime, answers: list[AnswerType]
+    ) -> None: ...
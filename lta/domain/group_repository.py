@@ -18,6 +18,13 @@ class GroupRepository(Protocol):
     @abstractmethod
     def get_group(self, id: str) -> Group: ...
 
+    @abstractmethod
+    def get_groups(self, ids: list[str]) -> list[Group]:
+        """
+        Groups in the order of `ids`, without duplicates.  The groups that don't exist
+        are left out.
+        """
+
     @abstractmethod
     def create_group(self, id: str, name: str, created_at: datetime) -> None: ...
 
@@ -35,3 +42,13 @@ class GroupRepository(Protocol):
 
     @abstractmethod
     def set_users(self, group_id: str, user_ids: list[str]) -> None: ...
+
+
+class AsyncGroupRepository(Protocol):
+    """
+    Async counterpart of `GroupRepository`, limited to the methods used by the async
+    API handlers.
+    """
+
+    @abstractmethod
+    async def list_groups(self) -> list[Group]: ...
@@ -0,0 +1,69 @@
+import base64
+import binascii
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class Page(Generic[T]):
+    items: list[T]
+    # Pass it back to get the next page; None on the last page.
+    next_cursor: str | None = None
+
+
+@dataclass
+class InvalidCursor(Exception):
+    cursor: str
+
+
+def encode_cursor(position: dict[str, Any]) -> str:
+    """
+    Make an opaque cursor from the sort key of the last item of a page.
+
+    The values must be serializable to JSON (datetimes should be converted with
+    `isoformat`).
+    """
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_cursor(cursor: str, keys: set[str]) -> dict[str, str]:
+    """
+    Inverse of `encode_cursor`; raise `InvalidCursor` if `keys` are not all there, as
+    strings.
+    """
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor(cursor=cursor)
+    if not isinstance(position, dict) or not keys <= position.keys():
+        raise InvalidCursor(cursor=cursor)
+    if not all(isinstance(position[key], str) for key in keys):
+        raise InvalidCursor(cursor=cursor)
+    return position
+
+
+def decode_cursor_datetime(cursor: str, value: str) -> datetime:
+    """Parse a datetime of a cursor position; raise `InvalidCursor` if it isn't one."""
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise InvalidCursor(cursor=cursor)
+
+
+def make_page(
+    items: list[T], page_size: int, get_position: Callable[[T], dict[str, Any]]
+) -> Page[T]:
+    """
+    Make a page from the `page_size` first items.  Fetch one more item than
+    `page_size`: the next cursor is only set if there is one.
+    """
+    if len(items) <= page_size:
+        return Page(items=items)
+    return Page(
+        items=items[:page_size],
+        next_cursor=encode_cursor(get_position(items[page_size - 1])),
+    )
@@ -0,0 +1,34 @@
+from abc import abstractmethod
+from datetime import datetime
+from typing import Protocol
+
+from pydantic import BaseModel
+
+
+class PushTicket(BaseModel):
+    """A push notification accepted by Expo, whose receipt is not checked yet."""
+
+    id: str
+    user_id: str
+    device_token: str
+    created_at: datetime
+
+
+class PushTicketRepository(Protocol):
+    @abstractmethod
+    def add_tickets(self, tickets: list[PushTicket]) -> None: ...
+
+    @abstractmethod
+    def list_tickets(
+        self,
+        created_before: datetime,
+        limit: int,
+        after: PushTicket | None = None,
+    ) -> list[PushTicket]:
+        """
+        The first `limit` tickets created before `created_before`, sorted by creation
+        time and id, starting after the ticket `after` if given.
+        """
+
+    @abstractmethod
+    def delete_tickets(self, ids: list[str]) -> None: ...
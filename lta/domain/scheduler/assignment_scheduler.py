@@ -1,10 +1,99 @@
+from __future__ import annotations
+
 from abc import abstractmethod
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Protocol
 
 
+@dataclass
+class AssignmentRequest:
+    user_id: str
+    survey_id: str
+    when: datetime
+
+
+@dataclass
+class AssignmentBundle:
+    """Assignments of the same survey, for several users, all at the same time."""
+
+    user_ids: list[str]
+    survey_id: str
+    when: datetime
+
+    def to_requests(self) -> list[AssignmentRequest]:
+        return [
+            AssignmentRequest(user_id=user_id, survey_id=self.survey_id, when=self.when)
+            for user_id in self.user_ids
+        ]
+
+
+@dataclass
+class AssignmentSchedulingError:
+    user_id: str
+    survey_id: str
+    when: datetime
+    error_message: str
+
+
+@dataclass
+class SchedulingSummary:
+    scheduled: int = 0
+    errors: list[AssignmentSchedulingError] = field(default_factory=list)
+
+    def add_success(self) -> None:
+        self.scheduled += 1
+
+    def merge(self, other: SchedulingSummary) -> None:
+        self.scheduled += other.scheduled
+        self.errors.extend(other.errors)
+
+    def add_error(self, request: AssignmentRequest, error: BaseException) -> None:
+        self.errors.append(
+            AssignmentSchedulingError(
+                user_id=request.user_id,
+                survey_id=request.survey_id,
+                when=request.when,
+                error_message=str(error) or type(error).__name__,
+            )
+        )
+
+
 class AssignmentScheduler(Protocol):
     @abstractmethod
     def schedule_assignment(
         self, user_id: str, survey_id: str, when: datetime
     ) -> None: ...
+
+    def schedule_assignments(
+        self, requests: list[AssignmentRequest]
+    ) -> SchedulingSummary:
+        """
+        Schedule all the requests, one after the other.
+
+        A failing request doesn't stop the others: the error is recorded in the summary.
+        """
+        summary = SchedulingSummary()
+        for request in requests:
+            try:
+                self.schedule_assignment(
+                    user_id=request.user_id,
+                    survey_id=request.survey_id,
+                    when=request.when,
+                )
+            except Exception as e:
+                summary.add_error(request, e)
+            else:
+                summary.add_success()
+        return summary
+
+    def schedule_assignment_bundles(
+        self, bundles: list[AssignmentBundle]
+    ) -> SchedulingSummary:
+        """
+        By default, bundles are expanded into individual requests.  Implementations may
+        schedule each bundle as a whole.
+        """
+        return self.schedule_assignments(
+            [request for bundle in bundles for request in bundle.to_requests()]
+        )
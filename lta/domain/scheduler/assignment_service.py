@@ -1,9 +1,16 @@
+import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from random import Random
 
-from lta.domain.assignment_repository import AssignmentRepository
-from lta.domain.scheduler.notification_scheduler import NotificationScheduler
+from lta.domain.assignment import Assignment
+from lta.domain.assignment_repository import AssignmentCreation, AssignmentRepository
+from lta.domain.scheduler.notification_pulisher import NotificationType
+from lta.domain.scheduler.notification_scheduler import (
+    NotificationRequest,
+    NotificationScheduler,
+    NotificationSchedulingFailed,
+)
 from lta.domain.survey_repository import SurveyRepository
 from lta.utils import make_uuid4
 
@@ -22,9 +29,17 @@ class AssignmentService:
         survey_id: str,
         ref_time: datetime,
         send_reminder_notifications: bool = True,
+        idempotency_key: str | None = None,
     ) -> None:
+        """
+        See `_make_assignment_id` for `idempotency_key`.
+
+        Raise `NotificationSchedulingFailed` if some notifications could not be
+        scheduled, once the assignment is created: the caller should retry, with the
+        same `idempotency_key`.
+        """
         survey = self.survey_repository.get_survey(survey_id)
-        assignment_id = str(make_uuid4(self.rand))
+        assignment_id = self._make_assignment_id(user_id, idempotency_key)
         self.assignment_repository.create_assignment(
             user_id=user_id,
             id=assignment_id,
@@ -33,18 +48,144 @@ class AssignmentService:
             created_at=ref_time,
         )
 
-        first_notification_time = ref_time
-        self.notification_scheduler.schedule_initial_notification(
-            user_id=user_id,
-            assignment_id=assignment_id,
-            when=first_notification_time,
+        self.notification_scheduler.schedule_notifications(
+            self._make_notification_requests(
+                user_id=user_id,
+                assignment_id=assignment_id,
+                ref_time=ref_time,
+                send_reminder_notifications=send_reminder_notifications,
+            )
         )
 
+    def cancel_reminders(self, user_id: str, assignment_id: str) -> None:
+        """
+        Cancel the reminders of a submitted assignment.
+
+        Errors are only logged: a reminder that is not cancelled is not sent anyway.
+        """
+        try:
+            self.notification_scheduler.cancel_reminders(
+                user_id=user_id,
+                assignment_id=assignment_id,
+                reminder_count=len(self.reminder_notification_delays),
+            )
+        except Exception as e:
+            logging.error(
+                "Error when cancelling reminder notifications",
+                extra=dict(
+                    json_fields=dict(
+                        user_id=user_id,
+                        assignment_id=assignment_id,
+                        error_message=str(e),
+                    )
+                ),
+            )
+
+    def create_assignments(
+        self,
+        user_ids: list[str],
+        survey_id: str,
+        ref_time: datetime,
+        send_reminder_notifications: bool = True,
+        idempotency_key: str | None = None,
+    ) -> None:
+        """
+        Same as `create_assignment` for several users, but the survey is read once,
+        the assignments are written in batches and the notifications are scheduled
+        with a single call.
+
+        The assignment ids are drawn from `rand` in the order of `user_ids`, as with
+        successive calls to `create_assignment`.  If some notifications could not be
+        scheduled, `NotificationSchedulingFailed` names them, once all the assignments
+        are created: the caller should retry the whole bundle, with the same
+        `idempotency_key`.
+        """
+        survey = self.survey_repository.get_survey(survey_id)
+        creations = [
+            AssignmentCreation(
+                user_id=user_id,
+                id=self._make_assignment_id(user_id, idempotency_key),
+                survey_id=survey_id,
+                survey_title=survey.title,
+                created_at=ref_time,
+            )
+            for user_id in user_ids
+        ]
+        self.assignment_repository.create_assignments(creations)
+
+        notification_requests: list[NotificationRequest] = []
+        for creation in creations:
+            notification_requests.extend(
+                self._make_notification_requests(
+                    user_id=creation.user_id,
+                    assignment_id=creation.id,
+                    ref_time=ref_time,
+                    send_reminder_notifications=send_reminder_notifications,
+                )
+            )
+        self.notification_scheduler.schedule_notifications(notification_requests)
+
+    def continue_notifications(
+        self, assignment: Assignment, next_reminders: list[NotificationRequest]
+    ) -> None:
+        """
+        Schedule the reminders left by a notification (see
+        `ChainedCloudTasksNotificationScheduler`), unless the assignment is submitted.
+        The reminders after the expiration of the assignment are dropped.
+        """
+        if assignment.submitted_at is not None:
+            return
+        requests = [
+            request
+            for request in next_reminders
+            if request.when is not None and request.when < assignment.expired_at
+        ]
+        if not requests:
+            return
+        try:
+            self.notification_scheduler.schedule_notifications(requests)
+        except NotificationSchedulingFailed:
+            # already logged; the notification is sent, so a retry would send it again
+            pass
+
+    def _make_assignment_id(self, user_id: str, idempotency_key: str | None) -> str:
+        """
+        Drawn from `rand`, unless an `idempotency_key` is given (e.g. the name of the
+        task that creates the assignment): then the id is derived from the key and the
+        user id.  A retry with the same key gets the same ids, and the repository
+        leaves the assignments created by the first attempt as they are.  The
+        notifications are scheduled again, under the same task ids.
+        """
+        if idempotency_key is None:
+            return str(make_uuid4(self.rand))
+        return str(make_uuid4(Random(f"{idempotency_key}/{user_id}")))
+
+    def _make_notification_requests(
+        self,
+        user_id: str,
+        assignment_id: str,
+        ref_time: datetime,
+        send_reminder_notifications: bool,
+    ) -> list[NotificationRequest]:
+        requests = [
+            NotificationRequest(
+                user_id=user_id,
+                assignment_id=assignment_id,
+                notification_type=NotificationType.INITIAL,
+                when=ref_time,
+            )
+        ]
         if send_reminder_notifications:
-            for delay in self.reminder_notification_delays:
-                second_notification_time = ref_time + delay
-                self.notification_scheduler.schedule_reminder_notification(
+            requests.extend(
+                NotificationRequest(
                     user_id=user_id,
                     assignment_id=assignment_id,
-                    when=second_notification_time,
+                    notification_type=NotificationType.REMINDER,
+                    when=ref_time + delay,
+                    reminder_index=reminder_index,
+                )
+                for reminder_index, delay in enumerate(
+                    self.reminder_notification_delays
                 )
+            )
+        return requests
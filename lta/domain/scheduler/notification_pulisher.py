@@ -12,6 +12,10 @@ class NotificationType(str, Enum):
 
 
 class NotificationPublisher(Protocol):
+    @property
+    def name(self) -> str:
+        return type(self).__name__
+
     @abstractmethod
     def send_notification(
         self,
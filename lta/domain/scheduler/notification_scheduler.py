@@ -1,7 +1,38 @@
+import logging
 from abc import abstractmethod
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Protocol
 
+from lta.domain.scheduler.notification_pulisher import NotificationType
+
+
+@dataclass
+class NotificationRequest:
+    user_id: str
+    assignment_id: str
+    notification_type: NotificationType
+    when: datetime | None = None
+    reminder_index: int = 0
+
+
+@dataclass
+class NotificationSchedulingFailed(Exception):
+    """Some notifications could not be scheduled: the caller should retry them."""
+
+    errors: list[tuple[NotificationRequest, BaseException]]
+    max_named: int = 10
+
+    def __str__(self) -> str:
+        named = ", ".join(
+            f"{request.notification_type.value} of {request.user_id}/"
+            f"{request.assignment_id} ({error})"
+            for request, error in self.errors[: self.max_named]
+        )
+        if len(self.errors) > self.max_named:
+            named += f", and {len(self.errors) - self.max_named} more"
+        return f"{len(self.errors)} notifications not scheduled: {named}"
+
 
 class NotificationScheduler(Protocol):
     @abstractmethod
@@ -18,4 +49,65 @@ class NotificationScheduler(Protocol):
         user_id: str,
         assignment_id: str,
         when: datetime,
-    ) -> None: ...
+        reminder_index: int = 0,
+    ) -> None:
+        """
+        `reminder_index` is the position of the reminder among the reminders of the
+        assignment, so that `cancel_reminders` can find it.
+        """
+
+    def cancel_reminders(
+        self, user_id: str, assignment_id: str, reminder_count: int
+    ) -> None:
+        """
+        Cancel the first `reminder_count` reminders of the assignment that are not sent
+        yet.  Nothing to do by default: the notification service doesn't send the
+        reminders of a submitted assignment anyway.
+        """
+        return None
+
+    def schedule_notifications(self, requests: list[NotificationRequest]) -> None:
+        """
+        Schedule all the requests, one after the other.
+
+        A failing request doesn't stop the others: the error is logged, and
+        `NotificationSchedulingFailed` is raised once all the requests are tried.
+        """
+        errors: list[tuple[NotificationRequest, BaseException]] = []
+        for request in requests:
+            try:
+                if request.notification_type == NotificationType.INITIAL:
+                    self.schedule_initial_notification(
+                        user_id=request.user_id,
+                        assignment_id=request.assignment_id,
+                        when=request.when,
+                    )
+                else:
+                    assert request.when is not None
+                    self.schedule_reminder_notification(
+                        user_id=request.user_id,
+                        assignment_id=request.assignment_id,
+                        when=request.when,
+                        reminder_index=request.reminder_index,
+                    )
+            except Exception as e:
+                log_notification_scheduling_error(request, e)
+                errors.append((request, e))
+        if errors:
+            raise NotificationSchedulingFailed(errors)
+
+
+def log_notification_scheduling_error(
+    request: NotificationRequest, error: BaseException
+) -> None:
+    logging.error(
+        "Error when scheduling notification",
+        extra=dict(
+            json_fields=dict(
+                user_id=request.user_id,
+                assignment_id=request.assignment_id,
+                notification_type=request.notification_type.value,
+                error_message=str(error),
+            )
+        ),
+    )
@@ -1,5 +1,8 @@
+import dataclasses
 import logging
-from dataclasses import dataclass
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
 from lta.domain.assignment import Assignment
@@ -13,6 +16,23 @@ from lta.domain.user import User
 from lta.domain.user_repository import UserRepository
 
 
+@dataclass
+class ChannelResult:
+    publisher: str
+    sent: bool
+    duration_ms: int
+    error: str | None = None
+
+
+@dataclass
+class NotificationResult:
+    channels: list[ChannelResult] = field(default_factory=list)
+
+    @property
+    def sent(self) -> bool:
+        return any(channel.sent for channel in self.channels)
+
+
 @dataclass
 class NotificationService:
     """
@@ -27,12 +47,16 @@ class NotificationService:
     The service also update the assignment with the notification time.
 
     The notification is sent only if the assignment is not already submitted.
+
+    The publishers are called concurrently.  A publisher not done after
+    `publisher_timeout_seconds` is counted as not sent (its call is not interrupted).
     """
 
     publishers: list[NotificationPublisher]
     user_repository: UserRepository
     assignment_repository: AssignmentRepository
     survey_repository: SurveyRepository
+    publisher_timeout_seconds: float = 10.0
 
     def notify_user(
         self,
@@ -40,9 +64,10 @@ class NotificationService:
         assignment_id: str,
         notification_type: NotificationType,
         when: datetime | None = None,
-    ) -> None:
+    ) -> Assignment:
         """
-        Send a notification now.
+        Send a notification now, and return the assignment (as read before the
+        notification).
 
         `when` is the time to be written in the assignment. It defaults to now if not provided.
         """
@@ -55,21 +80,37 @@ class NotificationService:
                     json_fields={"user_id": user_id, "assignment_id": assignment_id}
                 ),
             )
-            return
+            return assignment
 
-        has_sent = self.send_notification(user, assignment, notification_type)
-        if not has_sent:
+        result = self.publish(user, assignment, notification_type)
+        channels = [dataclasses.asdict(channel) for channel in result.channels]
+        if not result.sent:
             logging.warning(
                 "Notification not sent: no notification channel available or not defined in survey",
                 extra=dict(
-                    json_fields={"user_id": user_id, "assignment_id": assignment_id}
+                    json_fields={
+                        "user_id": user_id,
+                        "assignment_id": assignment_id,
+                        "channels": channels,
+                    }
                 ),
             )
-            return
+            return assignment
+        logging.info(
+            "Notification sent",
+            extra=dict(
+                json_fields={
+                    "user_id": user_id,
+                    "assignment_id": assignment_id,
+                    "channels": channels,
+                }
+            ),
+        )
 
         if when is None:
             when = datetime.now(tz=timezone.utc)
         self._update_assignment(user, assignment, when)
+        return assignment
 
     def send_notification(
         self,
@@ -77,26 +118,88 @@ class NotificationService:
         assignment: Assignment,
         notification_type: NotificationType,
     ) -> bool:
+        return self.publish(user, assignment, notification_type).sent
+
+    def publish(
+        self,
+        user: User,
+        assignment: Assignment,
+        notification_type: NotificationType,
+    ) -> NotificationResult:
+        """
+        Send the notification with all the publishers, and return the result of each
+        of them.
+
+        If no publisher sent the notification and one of them raised an exception, the
+        exception is raised (after all the publishers are done or timed out).
+        """
         user_notification_info = user.notification_info
         if user_notification_info is None:
-            return False
+            return NotificationResult()
 
         survey = self.survey_repository.get_survey(assignment.survey_id)
         survey_notification_info = survey.notifications
         if survey_notification_info is None:
-            return False
-
-        sent = False
-        for publisher in self.publishers:
-            success = publisher.send_notification(
-                user_id=user.id,
-                assignment_id=assignment.id,
-                user_notification_info=user_notification_info,
-                survey_notification_info=survey_notification_info,
-                notification_type=notification_type,
-            )
-            sent = sent or success
-        return sent
+            return NotificationResult()
+        if not self.publishers:
+            return NotificationResult()
+
+        def send(
+            publisher: NotificationPublisher,
+        ) -> tuple[ChannelResult, Exception | None]:
+            start = time.perf_counter()
+            try:
+                sent = publisher.send_notification(
+                    user_id=user.id,
+                    assignment_id=assignment.id,
+                    user_notification_info=user_notification_info,
+                    survey_notification_info=survey_notification_info,
+                    notification_type=notification_type,
+                )
+            except Exception as e:
+                duration_ms = round((time.perf_counter() - start) * 1000)
+                error = str(e) or type(e).__name__
+                return ChannelResult(publisher.name, False, duration_ms, error), e
+            duration_ms = round((time.perf_counter() - start) * 1000)
+            return ChannelResult(publisher.name, sent, duration_ms), None
+
+        executor = ThreadPoolExecutor(max_workers=len(self.publishers))
+        try:
+            futures = [
+                executor.submit(send, publisher) for publisher in self.publishers
+            ]
+            wait(futures, timeout=self.publisher_timeout_seconds)
+        finally:
+            # don't wait for the publishers which timed out
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        result = NotificationResult()
+        errors: list[Exception] = []
+        timeout_ms = round(self.publisher_timeout_seconds * 1000)
+        for publisher, future in zip(self.publishers, futures):
+            if future.done():
+                channel, error = future.result()
+                if error is not None:
+                    errors.append(error)
+            else:
+                channel = ChannelResult(publisher.name, False, timeout_ms, "timeout")
+            result.channels.append(channel)
+            if channel.error is not None:
+                logging.error(
+                    "Notification publisher failed",
+                    extra=dict(
+                        json_fields=dict(
+                            user_id=user.id,
+                            assignment_id=assignment.id,
+                            publisher=channel.publisher,
+                            error=channel.error,
+                        )
+                    ),
+                )
+
+        if not result.sent and errors:
+            raise errors[0]
+        return result
 
     def _update_assignment(
         self, user: User, assignment: Assignment, when: datetime
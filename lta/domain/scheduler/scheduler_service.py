@@ -4,10 +4,16 @@ from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta, timezone
 from typing import Generator, Optional
 
+from lta.domain.group import Group
 from lta.domain.group_repository import GroupRepository
 from lta.domain.schedule import Day, Schedule, TimeRange
 from lta.domain.schedule_repository import ScheduleRepository
-from lta.domain.scheduler.assignment_scheduler import AssignmentScheduler
+from lta.domain.scheduler.assignment_scheduler import (
+    AssignmentBundle,
+    AssignmentRequest,
+    AssignmentScheduler,
+    SchedulingSummary,
+)
 
 
 @dataclass
@@ -16,60 +22,148 @@ class SchedulerService:
     schedule_repository: ScheduleRepository
     group_repository: GroupRepository
     rand: random.Random = field(default_factory=random.Random)
+    bundle_same_time_assignments: bool = False
 
-    def schedule_assignments(self, ref_time: datetime) -> None:
+    def schedule_assignments(self, ref_time: datetime) -> SchedulingSummary:
         schedules = self.schedule_repository.list_active_schedules()
-        for schedule in schedules:
-            self.schedule_assignment(schedule, ref_time)
+        # All the groups referenced by the schedules are read at once, and this snapshot
+        # is used for the whole run.  A schedule with a deleted group is skipped, rather
+        # than failing the whole run.
+        groups = self._get_groups(
+            [group_id for schedule in schedules for group_id in schedule.group_ids]
+        )
+        requests = [
+            request
+            for schedule in schedules
+            for request in self._generate_requests(schedule, ref_time, groups)
+        ]
+        return self._schedule_requests(requests)
+
+    def schedule_assignment(
+        self,
+        schedule: Schedule,
+        ref_time: datetime,
+        groups: dict[str, Group] | None = None,
+    ) -> SchedulingSummary:
+        """
+        `groups` maps group ids to groups.  If not provided, the groups are read from the
+        repository.  Nothing is scheduled if a group of the schedule is missing.
+        """
+        if groups is None:
+            groups = self._get_groups(schedule.group_ids)
+        requests = list(self._generate_requests(schedule, ref_time, groups))
+        return self._schedule_requests(requests)
+
+    def _generate_requests(
+        self, schedule: Schedule, ref_time: datetime, groups: dict[str, Group]
+    ) -> Generator[AssignmentRequest | AssignmentBundle, None, None]:
+        """
+        When `bundle_same_time_assignments` is set, the assignments of a schedule with the
+        same time for all users are generated as a single bundle.
+        """
+        missing_group_ids = [id for id in schedule.group_ids if id not in groups]
+        if missing_group_ids:
+            logging.error(
+                "Schedule skipped, some of its groups don't exist",
+                extra=dict(
+                    json_fields=dict(
+                        schedule_id=schedule.id,
+                        group_ids=missing_group_ids,
+                    )
+                ),
+            )
+            return
 
-    def schedule_assignment(self, schedule: Schedule, ref_time: datetime) -> None:
         if schedule.same_time_for_all_users:
             when = self._get_random_datetime(schedule, ref_time)
             if when is None:
                 return
-            for user_id in self._generate_user_ids(
-                schedule.user_ids, schedule.group_ids
-            ):
-                self._schedule_assignment(user_id, schedule.survey_id, when)
+            user_ids = self._generate_user_ids(
+                schedule.user_ids, schedule.group_ids, groups
+            )
+            if self.bundle_same_time_assignments:
+                yield AssignmentBundle(list(user_ids), schedule.survey_id, when)
+            else:
+                for user_id in user_ids:
+                    yield AssignmentRequest(user_id, schedule.survey_id, when)
 
         else:
-            for user_id in self._generate_user_ids(
-                schedule.user_ids, schedule.group_ids
-            ):
-                when = self._get_random_datetime(schedule, ref_time)
-                if when is None:
-                    continue
-                self._schedule_assignment(user_id, schedule.survey_id, when)
+            all_user_ids = list(
+                self._generate_user_ids(schedule.user_ids, schedule.group_ids, groups)
+            )
+            whens = self._get_random_datetimes(schedule, ref_time, len(all_user_ids))
+            for user_id, when in zip(all_user_ids, whens):
+                yield AssignmentRequest(user_id, schedule.survey_id, when)
 
     def _get_random_datetime(
         self, schedule: Schedule, ref_time: datetime
     ) -> datetime | None:
-        rv = get_random_datetime(
+        rv = self._get_random_datetimes(schedule, ref_time, 1)
+        return rv[0] if rv else None
+
+    def _get_random_datetimes(
+        self, schedule: Schedule, ref_time: datetime, n: int
+    ) -> list[datetime]:
+        rv = get_random_datetimes(
             ref_time=ref_time,
             days=schedule.days,
             time_range=schedule.time_range,
+            n=n,
             rand=self.rand,
         )
-        if rv is None:
+        if n and not rv:
             logging.warning(f"No valid time range found for schedule {schedule.id}")
         return rv
 
-    def _schedule_assignment(
-        self, user_id: str, survey_id: str, when: datetime
-    ) -> None:
-        self.assignment_scheduler.schedule_assignment(
-            user_id=user_id, survey_id=survey_id, when=when
+    def _schedule_requests(
+        self, requests: list[AssignmentRequest | AssignmentBundle]
+    ) -> SchedulingSummary:
+        summary = self.assignment_scheduler.schedule_assignments(
+            [request for request in requests if isinstance(request, AssignmentRequest)]
+        )
+        bundles = [
+            request for request in requests if isinstance(request, AssignmentBundle)
+        ]
+        if bundles:
+            summary.merge(
+                self.assignment_scheduler.schedule_assignment_bundles(bundles)
+            )
+        for error in summary.errors:
+            logging.error(
+                "Error when scheduling assignment",
+                extra=dict(
+                    json_fields=dict(
+                        user_id=error.user_id,
+                        survey_id=error.survey_id,
+                        when=error.when.isoformat(),
+                        error_message=error.error_message,
+                    )
+                ),
+            )
+        logging.info(
+            "Assignments scheduled",
+            extra=dict(
+                json_fields=dict(
+                    scheduled=summary.scheduled,
+                    errors=len(summary.errors),
+                )
+            ),
         )
+        return summary
+
+    def _get_groups(self, group_ids: list[str]) -> dict[str, Group]:
+        return {
+            group.id: group for group in self.group_repository.get_groups(group_ids)
+        }
 
     def _generate_user_ids(
-        self, user_ids: list[str], group_ids: list[str]
+        self, user_ids: list[str], group_ids: list[str], groups: dict[str, Group]
     ) -> Generator[str, None, None]:
         for user_id in user_ids:
             yield user_id
 
         for group_id in group_ids:
-            group = self.group_repository.get_group(group_id)
-            for user_id in group.user_ids:
+            for user_id in groups[group_id].user_ids:
                 yield user_id
 
 
@@ -82,6 +176,22 @@ class DatetimeRange:
 def get_random_datetime(
     ref_time: datetime, days: list[Day], time_range: TimeRange, rand: random.Random
 ) -> Optional[datetime]:
+    rv = get_random_datetimes(ref_time, days, time_range, 1, rand)
+    return rv[0] if rv else None
+
+
+def get_random_datetimes(
+    ref_time: datetime,
+    days: list[Day],
+    time_range: TimeRange,
+    n: int,
+    rand: random.Random,
+) -> list[datetime]:
+    """
+    `n` random datetimes, drawn like `n` calls of `get_random_datetime` with `rand`
+    (so the same values, for the same state of `rand`), but with the valid ranges
+    computed once.  Empty if there is no valid range.
+    """
     dates: list[date] = get_dates_from_days(ref_time, days)
     ranges: list[DatetimeRange] = get_datetime_ranges_from_dates_and_time_range(
         dates, time_range
@@ -89,13 +199,21 @@ def get_random_datetime(
     ranges = keep_ranges_after_ref_time(ref_time, ranges)
 
     if not ranges:
-        return None
+        return []
 
-    range_: DatetimeRange = rand.choice(ranges)
-    start = int(range_.start.timestamp())
-    end = int(range_.end.timestamp())
-    t = rand.randint(start, end)
-    return datetime.fromtimestamp(t, tz=range_.start.tzinfo)
+    bounds = [
+        (
+            int(range_.start.timestamp()),
+            int(range_.end.timestamp()),
+            range_.start.tzinfo,
+        )
+        for range_ in ranges
+    ]
+    rv: list[datetime] = []
+    for _ in range(n):
+        start, end, tz = rand.choice(bounds)
+        rv.append(datetime.fromtimestamp(rand.randint(start, end), tz=tz))
+    return rv
 
 
 def get_dates_from_days(ref_time: datetime, days: list[Day]) -> list[date]:
@@ -1,3 +1,4 @@
+from functools import cache
 from typing import Literal
 
 from pydantic import BaseModel, Field
@@ -53,7 +54,9 @@ class Survey(BaseModel):
     )
 
 
+@cache
 def get_test_survey() -> Survey:
+    """The test survey is built once and shared: it must not be mutated."""
     return Survey(
         id="test-survey",
         title="Test Survey",
@@ -5,6 +5,7 @@ from typing import Protocol
 
 from pydantic import EmailStr
 
+from lta.domain.pagination import Page
 from lta.domain.user import Device, DeviceOS, User
 
 
@@ -17,17 +18,35 @@ class UserRepository(Protocol):
     @abstractmethod
     def list_users(self) -> list[User]: ...
 
+    @abstractmethod
+    def list_users_page(self, page_size: int, cursor: str | None = None) -> Page[User]:
+        """
+        Users sorted by id, `page_size` at a time.  Raise `InvalidCursor` if `cursor`
+        was not returned by this method.
+        """
+
     @abstractmethod
     def get_device_registrations_from_user_id(self, id: str) -> list[Device]: ...
 
     @abstractmethod
     def get_user(self, id: str) -> User: ...
 
+    @abstractmethod
+    def get_users(self, ids: list[str]) -> list[User]:
+        """
+        Users in the order of `ids`, without duplicates.  Raise `UserNotFound` if any of
+        them doesn't exist.
+        """
+
     @abstractmethod
     def add_device_registration(
         self, id: str, token: str, os: DeviceOS, version: str | None, date: datetime
     ) -> None: ...
 
+    @abstractmethod
+    def remove_device_registration(self, id: str, token: str) -> None:
+        """Remove the device with this token, if the user has one."""
+
     @abstractmethod
     def create_user(
         self,
@@ -40,3 +59,24 @@ class UserRepository(Protocol):
 
     @abstractmethod
     def exists(self, id: str) -> bool: ...
+
+
+class AsyncUserRepository(Protocol):
+    """
+    Async counterpart of `UserRepository`, limited to the methods used by the async
+    API handlers.
+    """
+
+    @abstractmethod
+    async def list_users(self) -> list[User]: ...
+
+    @abstractmethod
+    async def list_users_page(
+        self, page_size: int, cursor: str | None = None
+    ) -> Page[User]: ...
+
+    @abstractmethod
+    async def get_user(self, id: str) -> User: ...
+
+    @abstractmethod
+    async def get_users(self, ids: list[str]) -> list[User]: ...
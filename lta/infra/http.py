@@ -0,0 +1,78 @@
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Statuses of requests refused before being processed, which are safe to send again.
+RETRYABLE_STATUS_CODES = (429,)
+
+# (connect timeout, read timeout), in seconds, as accepted by `requests`
+Timeout = tuple[float, float]
+
+
+def make_http_retry(
+    max_retries: int = 2,
+    backoff_factor: float = 0.5,
+    backoff_max: float = 2.0,
+) -> Retry:
+    """
+    Retry connection errors and 429 statuses, up to `max_retries` times with an
+    exponential backoff of at most `backoff_max` seconds (`Retry-After` is ignored,
+    so that the wait stays bounded).  POST requests are retried too, as none of these
+    errors means the request was processed: read timeouts and 5xx statuses are not
+    retried, since the provider may have sent the message already.  After the last
+    retry, the last response is returned so that `raise_for_status` reports its
+    status.
+    """
+    return Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=0,
+        other=0,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        backoff_max=backoff_max,
+        status_forcelist=RETRYABLE_STATUS_CODES,
+        allowed_methods=None,
+        respect_retry_after_header=False,
+        raise_on_status=False,
+    )
+
+
+def get_max_request_seconds(
+    timeout: Timeout,
+    max_retries: int = 2,
+    backoff_factor: float = 0.5,
+    backoff_max: float = 2.0,
+) -> float:
+    """
+    Upper bound of the time spent in a request retried as in `make_http_retry`: every
+    attempt may take up to the connect and the read timeouts, and urllib3 doesn't
+    wait before the first retry.
+    """
+    connect_timeout, read_timeout = timeout
+    backoffs = sum(
+        min(backoff_factor * 2.0 ** (retry - 1), backoff_max)
+        for retry in range(2, max_retries + 1)
+    )
+    return (max_retries + 1) * (connect_timeout + read_timeout) + backoffs
+
+
+def make_http_session(
+    pool_size: int = 10,
+    max_retries: int = 2,
+    backoff_factor: float = 0.5,
+    backoff_max: float = 2.0,
+) -> requests.Session:
+    """
+    Return a session keeping up to `pool_size` connections alive per host, and
+    retrying the requests as described in `make_http_retry`.
+    """
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=make_http_retry(max_retries, backoff_factor, backoff_max),
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
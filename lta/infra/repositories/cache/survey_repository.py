@@ -0,0 +1,72 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable
+
+from lta.domain.survey import Survey
+from lta.domain.survey_repository import SurveyCreation, SurveyRepository
+
+
+@dataclass
+class CachingSurveyRepository(SurveyRepository):
+    """
+    Read-through cache in front of another survey repository.
+
+    At most `max_size` surveys are kept (least recently used ones are evicted first),
+    each for at most `ttl_seconds`.  A survey created through this repository is
+    invalidated; the TTL bounds the staleness of changes made by other instances.
+
+    The cached surveys are shared between callers and must not be mutated.
+    """
+
+    repository: SurveyRepository
+    max_size: int = 256
+    ttl_seconds: float = 300.0
+    clock: Callable[[], float] = time.monotonic
+    hits: int = 0
+    misses: int = 0
+    _entries: OrderedDict[str, tuple[float, Survey]] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+    # Incremented by `invalidate`, so that a read started before an invalidation
+    # doesn't put the old survey back in the cache.
+    _generation: int = field(default=0, init=False)
+
+    def get_survey(self, id: str) -> Survey:
+        with self._lock:
+            entry = self._entries.get(id)
+            if entry is not None and entry[0] > self.clock():
+                self._entries.move_to_end(id)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+
+        survey = self.repository.get_survey(id)
+
+        with self._lock:
+            if generation != self._generation:
+                return survey
+            self._entries[id] = (self.clock() + self.ttl_seconds, survey)
+            self._entries.move_to_end(id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return survey
+
+    def create_survey(self, id: str, survey: SurveyCreation) -> None:
+        self.repository.create_survey(id, survey)
+        self.invalidate(id)
+
+    def list_surveys(self) -> list[Survey]:
+        return self.repository.list_surveys()
+
+    def invalidate(self, id: str | None = None) -> None:
+        """Forget the survey `id`, or all the surveys if `id` is None."""
+        with self._lock:
+            self._generation += 1
+            if id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(id, None)
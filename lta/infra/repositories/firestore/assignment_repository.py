@@ -13,16 +13,26 @@ from pydantic import BaseModel, ConfigDict
 from lta.domain.assignment import (
     AnswerType,
     Assignment,
+    AssignmentStats,
+    AssignmentSummary,
     MultipleChoiceAnswer,
     OpenEndedAnswer,
     SingleChoiceAnswer,
 )
 from lta.domain.assignment_repository import (
+    AssignmentCreation,
     AssignmentNotFound,
     AssignmentRepository,
+    AsyncAssignmentRepository,
     SubmissionTooLate,
 )
-from lta.infra.repositories.firestore.utils import get_collection_count, make_filter
+from lta.domain.pagination import Page, decode_cursor, decode_cursor_datetime, make_page
+from lta.infra.repositories.firestore.utils import (
+    MAX_WRITE_BATCH_SIZE,
+    get_async_collection_count,
+    get_collection_count,
+    make_filter,
+)
 
 
 class StoredAnswers(BaseModel):
@@ -42,6 +52,9 @@ class StoredAssignment(BaseModel):
     opened_at: list[datetime]
     submitted_at: datetime | None
     answers: str | None
+    # Copy of the last element of `opened_at`, so that the list views don't have to
+    # read the list.  Missing in the assignments opened before it was introduced.
+    last_opened_at: datetime | None = None
 
     model_config = ConfigDict(extra="forbid")
 
@@ -58,6 +71,7 @@ class StoredAssignment(BaseModel):
             opened_at=assigment.opened_at,
             submitted_at=assigment.submitted_at,
             answers=cls.serialize_answers(assigment.answers),
+            last_opened_at=max(assigment.opened_at, default=None),
         )
 
     @staticmethod
@@ -107,11 +121,103 @@ class StoredAssignment(BaseModel):
             return rv
 
 
+# The fields of a StoredAssignment read by the list views.
+SUMMARY_FIELDS = ["id", "title", "created_at", "submitted_at", "last_opened_at"]
+
+
+class StoredAssignmentStats(BaseModel):
+    """
+    Counters of the assignments of a user, updated in the same transaction as the
+    assignments.
+
+    `next_pending_*` is the oldest pending assignment at `updated_at`.  Because an
+    assignment only stops being pending (when it expires or is submitted), it is
+    still the oldest pending assignment at a later ref time if it hasn't expired.
+    """
+
+    revision: Literal[1] = 1
+    total: int = 0
+    submitted: int = 0
+    last_created_at: datetime | None = None
+    next_pending_id: str | None = None
+    next_pending_created_at: datetime | None = None
+    next_pending_expired_at: datetime | None = None
+    updated_at: datetime | None = None
+
+    model_config = ConfigDict(extra="forbid")
+
+    @classmethod
+    def from_assignments(
+        cls, assignments: list[Assignment], ref_time: datetime
+    ) -> StoredAssignmentStats:
+        stats = StoredAssignmentStats(
+            total=len(assignments),
+            submitted=sum(a.submitted_at is not None for a in assignments),
+            last_created_at=max((a.created_at for a in assignments), default=None),
+        )
+        pending = sorted(
+            (
+                a
+                for a in assignments
+                if a.submitted_at is None and a.expired_at > ref_time
+            ),
+            key=lambda a: a.created_at,
+        )
+        stats.set_next_pending(pending[0] if pending else None, ref_time)
+        return stats
+
+    def is_next_pending_valid(self, ref_time: datetime) -> bool:
+        if self.updated_at is None or ref_time < self.updated_at:
+            return False
+        return (
+            self.next_pending_expired_at is None
+            or self.next_pending_expired_at > ref_time
+        )
+
+    def set_next_pending(
+        self, assignment: Assignment | None, ref_time: datetime
+    ) -> None:
+        self.next_pending_id = assignment.id if assignment else None
+        self.next_pending_created_at = assignment.created_at if assignment else None
+        self.next_pending_expired_at = assignment.expired_at if assignment else None
+        self.updated_at = ref_time
+
+    def add_assignment(self, assignment: Assignment) -> None:
+        """Count a new assignment; `next_pending_*` must be valid at its creation."""
+        self.total += 1
+        if self.last_created_at is None or assignment.created_at > self.last_created_at:
+            self.last_created_at = assignment.created_at
+        if (
+            self.next_pending_created_at is None
+            or assignment.created_at < self.next_pending_created_at
+        ):
+            self.next_pending_id = assignment.id
+            self.next_pending_created_at = assignment.created_at
+            self.next_pending_expired_at = assignment.expired_at
+        self.updated_at = assignment.created_at
+
+    def to_domain(self) -> AssignmentStats:
+        return AssignmentStats(
+            total=self.total,
+            submitted=self.submitted,
+            last_created_at=self.last_created_at,
+            next_pending_id=self.next_pending_id,
+            next_pending_expired_at=self.next_pending_expired_at,
+        )
+
+
 @dataclass
 class FirestoreAssignmentRepository(AssignmentRepository):
+    """
+    The assignments are stored in `users/{user_id}/assignments/`, and their counters
+    in `assignment_stats/{user_id}`, updated transactionally on creation and
+    submission.
+    """
+
     client: firestore.Client
     collection_name: str = "assignments"
     user_collection_name: str = "users"
+    stats_collection_name: str = "assignment_stats"
     expiration_delay: timedelta = timedelta(hours=1)
 
     def get_assignment(self, user_id: str, id: str) -> Assignment:
@@ -132,19 +238,98 @@ class FirestoreAssignmentRepository(AssignmentRepository):
         survey_title: str,
         created_at: datetime,
     ) -> None:
-        assigment = Assignment(
-            id=id,
-            title=survey_title,
-            survey_id=survey_id,
-            user_id=user_id,
-            created_at=created_at,
-            expired_at=created_at + self.expiration_delay,
-        )
-        stored_assignment = StoredAssignment.from_domain(assigment)
-        self._get_collection_ref(user_id).document(id).set(
-            stored_assignment.model_dump()
+        self._create_assignments(
+            [
+                Assignment(
+                    id=id,
+                    title=survey_title,
+                    survey_id=survey_id,
+                    user_id=user_id,
+                    created_at=created_at,
+                    expired_at=created_at + self.expiration_delay,
+                )
+            ]
         )
 
+    def create_assignments(self, creations: list[AssignmentCreation]) -> None:
+        """
+        Write the assignments, and update the stats of their users, with one
+        transaction per 250 assignments (each one writes two documents).  The
+        assignments which already exist are left as is.
+        """
+        assignments = [
+            Assignment(
+                id=creation.id,
+                title=creation.survey_title,
+                survey_id=creation.survey_id,
+                user_id=creation.user_id,
+                created_at=creation.created_at,
+                expired_at=creation.created_at + self.expiration_delay,
+            )
+            for creation in creations
+        ]
+        chunk_size = MAX_WRITE_BATCH_SIZE // 2
+        for i in range(0, len(assignments), chunk_size):
+            self._create_assignments(assignments[i : i + chunk_size])
+
+    def _create_assignments(self, assignments: list[Assignment]) -> None:
+        def run(transaction: firestore.Transaction) -> None:
+            # All the reads must happen before the writes.
+            refs = [
+                self._get_collection_ref(a.user_id).document(a.id) for a in assignments
+            ]
+            existing = {
+                doc.reference.path
+                for doc in self.client.get_all(refs, transaction=transaction)
+                if doc.exists
+            }
+            new_assignments = [
+                assignment
+                for assignment, ref in zip(assignments, refs)
+                if ref.path not in existing
+            ]
+            if not new_assignments:
+                return
+            user_ids = list(dict.fromkeys(a.user_id for a in new_assignments))
+            docs = self.client.get_all(
+                [self._get_stats_ref(user_id) for user_id in user_ids],
+                transaction=transaction,
+            )
+            all_stats = {
+                doc.id: pydantic.TypeAdapter(StoredAssignmentStats).validate_python(
+                    doc.to_dict()
+                )
+                for doc in docs
+                if doc.exists
+            }
+            for assignment in sorted(new_assignments, key=lambda a: a.created_at):
+                user_id = assignment.user_id
+                if user_id not in all_stats:
+                    all_stats[user_id] = self._compute_stats(
+                        user_id, assignment.created_at, transaction
+                    )
+                stats = all_stats[user_id]
+                if not stats.is_next_pending_valid(assignment.created_at):
+                    stats.set_next_pending(
+                        self._query_next_pending(
+                            user_id, assignment.created_at, transaction
+                        ),
+                        assignment.created_at,
+                    )
+                stats.add_assignment(assignment)
+
+            for assignment in new_assignments:
+                transaction.set(
+                    self._get_collection_ref(assignment.user_id).document(
+                        assignment.id
+                    ),
+                    StoredAssignment.from_domain(assignment).model_dump(),
+                )
+            for user_id, stats in all_stats.items():
+                transaction.set(self._get_stats_ref(user_id), stats.model_dump())
+
+        firestore.transactional(run)(self.client.transaction())
+
     def list_assignments(
         self, user_id: str, limit: int | None = None
     ) -> list[Assignment]:
@@ -165,6 +350,49 @@ class FirestoreAssignmentRepository(AssignmentRepository):
             stored_assignment.to_domain() for stored_assignment in stored_assignments
         ]
 
+    def list_assignment_summaries(
+        self, user_id: str, limit: int | None = None
+    ) -> list[AssignmentSummary]:
+        query = self._get_collection_ref(user_id).order_by(
+            "created_at", direction=firestore.Query.DESCENDING
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        docs = (
+            query.where(filter=make_filter("user_id", "==", user_id))
+            .select(SUMMARY_FIELDS)
+            .stream()
+        )
+        return [AssignmentSummary.model_validate(doc.to_dict()) for doc in docs]
+
+    def list_assignment_summaries_page(
+        self, user_id: str, page_size: int, cursor: str | None = None
+    ) -> Page[AssignmentSummary]:
+        query = (
+            self._get_collection_ref(user_id)
+            .where(filter=make_filter("user_id", "==", user_id))
+            .order_by("created_at", direction=firestore.Query.DESCENDING)
+            .order_by("id", direction=firestore.Query.DESCENDING)
+            .select(SUMMARY_FIELDS)
+            .limit(page_size + 1)
+        )
+        if cursor is not None:
+            position = decode_cursor(cursor, {"created_at", "id"})
+            query = query.start_after(
+                dict(
+                    created_at=decode_cursor_datetime(cursor, position["created_at"]),
+                    id=position["id"],
+                )
+            )
+        summaries = [
+            AssignmentSummary.model_validate(doc.to_dict()) for doc in query.stream()
+        ]
+        return make_page(
+            summaries,
+            page_size,
+            lambda s: dict(created_at=s.created_at.isoformat(), id=s.id),
+        )
+
     def count_assignments(self, user_id: str) -> int:
         return get_collection_count(self._get_collection_ref(user_id))
 
@@ -176,7 +404,12 @@ class FirestoreAssignmentRepository(AssignmentRepository):
 
     def open_assignment(self, user_id: str, id: str, when: datetime) -> None:
         doc_ref = self._get_collection_ref(user_id).document(id)
-        self._update(doc_ref, user_id, id, {"opened_at": firestore.ArrayUnion([when])})
+        self._update(
+            doc_ref,
+            user_id,
+            id,
+            {"opened_at": firestore.ArrayUnion([when]), "last_opened_at": when},
+        )
 
     def submit_assignment(
         self,
@@ -186,20 +419,43 @@ class FirestoreAssignmentRepository(AssignmentRepository):
         answers: list[AnswerType],
     ) -> None:
         doc_ref = self._get_collection_ref(user_id).document(id)
-        doc = doc_ref.get()
-        if not doc.exists:
-            raise AssignmentNotFound(user_id=user_id, assignment_id=id)
-        if when > doc.to_dict()["expired_at"]:
-            raise SubmissionTooLate(user_id=user_id, assignment_id=id)
-        self._update(
-            doc_ref,
-            user_id,
-            id,
-            {
-                "submitted_at": when,
-                "answers": StoredAssignment.serialize_answers(answers),
-            },
-        )
+        stats_ref = self._get_stats_ref(user_id)
+
+        def run(transaction: firestore.Transaction) -> None:
+            doc = doc_ref.get(transaction=transaction)
+            if not doc.exists:
+                raise AssignmentNotFound(user_id=user_id, assignment_id=id)
+            data = doc.to_dict()
+            if when > data["expired_at"]:
+                raise SubmissionTooLate(user_id=user_id, assignment_id=id)
+
+            stats_doc = stats_ref.get(transaction=transaction)
+            if stats_doc.exists:
+                stats = pydantic.TypeAdapter(StoredAssignmentStats).validate_python(
+                    stats_doc.to_dict()
+                )
+            else:
+                stats = self._compute_stats(user_id, when, transaction)
+            if data["submitted_at"] is None:
+                stats.submitted += 1
+            if stats.next_pending_id == id or not stats.is_next_pending_valid(when):
+                stats.set_next_pending(
+                    self._query_next_pending(
+                        user_id, when, transaction, excluded_id=id
+                    ),
+                    when,
+                )
+
+            transaction.update(
+                doc_ref,
+                {
+                    "submitted_at": when,
+                    "answers": StoredAssignment.serialize_answers(answers),
+                },
+            )
+            transaction.set(stats_ref, stats.model_dump())
+
+        firestore.transactional(run)(self.client.transaction())
 
     def list_pending_assignments(
         self, user_id: str, ref_time: datetime
@@ -251,6 +507,104 @@ class FirestoreAssignmentRepository(AssignmentRepository):
             .where(filter=make_filter("submitted_at", "==", None))
         )
 
+    def get_assignment_stats(self, user_id: str, ref_time: datetime) -> AssignmentStats:
+        """
+        Read the stats document.  If it is missing, or if its next pending assignment
+        is no longer valid at `ref_time`, the stats are computed (resp. the next
+        pending assignment is queried) and stored, so that the following reads don't
+        compute them again.
+        """
+        doc = self._get_stats_ref(user_id).get()
+        if doc.exists:
+            stats = pydantic.TypeAdapter(StoredAssignmentStats).validate_python(
+                doc.to_dict()
+            )
+            if stats.is_next_pending_valid(ref_time):
+                return stats.to_domain()
+        return self._refresh_stats(user_id, ref_time).to_domain()
+
+    def rebuild_assignment_stats(self, user_id: str, ref_time: datetime) -> None:
+        stats_ref = self._get_stats_ref(user_id)
+
+        def run(transaction: firestore.Transaction) -> None:
+            stats = self._compute_stats(user_id, ref_time, transaction)
+            transaction.set(stats_ref, stats.model_dump())
+
+        firestore.transactional(run)(self.client.transaction())
+
+    def _refresh_stats(self, user_id: str, ref_time: datetime) -> StoredAssignmentStats:
+        stats_ref = self._get_stats_ref(user_id)
+
+        def run(transaction: firestore.Transaction) -> StoredAssignmentStats:
+            doc = stats_ref.get(transaction=transaction)
+            if not doc.exists:
+                stats = self._compute_stats(user_id, ref_time, transaction)
+            else:
+                stats = pydantic.TypeAdapter(StoredAssignmentStats).validate_python(
+                    doc.to_dict()
+                )
+                if stats.is_next_pending_valid(ref_time):
+                    return stats
+                stored_at = stats.updated_at
+                stats.set_next_pending(
+                    self._query_next_pending(user_id, ref_time, transaction),
+                    ref_time,
+                )
+                if stored_at is not None and ref_time < stored_at:
+                    # don't move the document back in time
+                    return stats
+            transaction.set(stats_ref, stats.model_dump())
+            return stats
+
+        rv: StoredAssignmentStats = firestore.transactional(run)(
+            self.client.transaction()
+        )
+        return rv
+
+    def _compute_stats(
+        self,
+        user_id: str,
+        ref_time: datetime,
+        transaction: firestore.Transaction | None = None,
+    ) -> StoredAssignmentStats:
+        """Compute the stats from all the assignments of the user."""
+        docs = self._get_collection_ref(user_id).stream(transaction=transaction)
+        return StoredAssignmentStats.from_assignments(
+            [
+                pydantic.TypeAdapter(StoredAssignment)
+                .validate_python(doc.to_dict())
+                .to_domain()
+                for doc in docs
+            ],
+            ref_time,
+        )
+
+    def _query_next_pending(
+        self,
+        user_id: str,
+        ref_time: datetime,
+        transaction: firestore.Transaction | None = None,
+        excluded_id: str | None = None,
+    ) -> Assignment | None:
+        docs = (
+            self._get_collection_ref(user_id)
+            .where(filter=make_filter("user_id", "==", user_id))
+            .where(filter=make_filter("expired_at", ">", ref_time))
+            .where(filter=make_filter("submitted_at", "==", None))
+            .order_by("created_at", direction=firestore.Query.ASCENDING)
+            .limit(2)
+        ).stream(transaction=transaction)
+        for doc in docs:
+            if doc.id != excluded_id:
+                stored_assignment: StoredAssignment = pydantic.TypeAdapter(
+                    StoredAssignment
+                ).validate_python(doc.to_dict())
+                return stored_assignment.to_domain()
+        return None
+
+    def _get_stats_ref(self, user_id: str) -> firestore.DocumentReference:
+        return self.client.collection(self.stats_collection_name).document(user_id)
+
     def _get_collection_ref(self, user_id: str) -> firestore.CollectionReference:
         return (
             self.client.collection(self.user_collection_name)
@@ -269,3 +623,264 @@ class FirestoreAssignmentRepository(AssignmentRepository):
             doc_ref.update(updates)
         except NotFound:
             raise AssignmentNotFound(user_id=user_id, assignment_id=id)
+
+
+@dataclass
+class AsyncFirestoreAssignmentRepository(AsyncAssignmentRepository):
+    """Same storage as `FirestoreAssignmentRepository`, on the async Firestore client."""
+
+    client: firestore.AsyncClient
+    collection_name: str = "assignments"
+    user_collection_name: str = "users"
+    stats_collection_name: str = "assignment_stats"
+
+    async def get_assignment(self, user_id: str, id: str) -> Assignment:
+        doc = await self._get_collection_ref(user_id).document(id).get()
+        if not doc.exists:
+            raise AssignmentNotFound(user_id=user_id, assignment_id=id)
+        stored_assignment: StoredAssignment = pydantic.TypeAdapter(
+            StoredAssignment
+        ).validate_python(doc.to_dict())
+        return stored_assignment.to_domain()
+
+    async def list_assignments(
+        self, user_id: str, limit: int | None = None
+    ) -> list[Assignment]:
+        assignments_ref = self._get_collection_ref(user_id).order_by(
+            "created_at", direction=firestore.Query.DESCENDING
+        )
+        if limit is not None:
+            assignments_ref = assignments_ref.limit(limit)
+
+        docs = assignments_ref.where(
+            filter=make_filter("user_id", "==", user_id)
+        ).stream()
+        return [
+            pydantic.TypeAdapter(StoredAssignment)
+            .validate_python(doc.to_dict())
+            .to_domain()
+            async for doc in docs
+        ]
+
+    async def list_assignment_summaries(
+        self, user_id: str, limit: int | None = None
+    ) -> list[AssignmentSummary]:
+        query = self._get_collection_ref(user_id).order_by(
+            "created_at", direction=firestore.Query.DESCENDING
+        )
+        if limit is not None:
+            query = query.limit(limit)
+        docs = (
+            query.where(filter=make_filter("user_id", "==", user_id))
+            .select(SUMMARY_FIELDS)
+            .stream()
+        )
+        return [AssignmentSummary.model_validate(doc.to_dict()) async for doc in docs]
+
+    async def list_assignment_summaries_page(
+        self, user_id: str, page_size: int, cursor: str | None = None
+    ) -> Page[AssignmentSummary]:
+        query = (
+            self._get_collection_ref(user_id)
+            .where(filter=make_filter("user_id", "==", user_id))
+            .order_by("created_at", direction=firestore.Query.DESCENDING)
+            .order_by("id", direction=firestore.Query.DESCENDING)
+            .select(SUMMARY_FIELDS)
+            .limit(page_size + 1)
+        )
+        if cursor is not None:
+            position = decode_cursor(cursor, {"created_at", "id"})
+            query = query.start_after(
+                dict(
+                    created_at=decode_cursor_datetime(cursor, position["created_at"]),
+                    id=position["id"],
+                )
+            )
+        summaries = [
+            AssignmentSummary.model_validate(doc.to_dict())
+            async for doc in query.stream()
+        ]
+        return make_page(
+            summaries,
+            page_size,
+            lambda s: dict(created_at=s.created_at.isoformat(), id=s.id),
+        )
+
+    async def count_assignments(self, user_id: str) -> int:
+        return await get_async_collection_count(self._get_collection_ref(user_id))
+
+    async def count_non_answered_assignments(self, user_id: str) -> int:
+        """See `FirestoreAssignmentRepository.count_non_answered_assignments`."""
+        return await get_async_collection_count(
+            self._get_collection_ref(user_id)
+            .where(filter=make_filter("user_id", "==", user_id))
+            .where(filter=make_filter("submitted_at", "==", None))
+        )
+
+    async def get_assignment_stats(
+        self, user_id: str, ref_time: datetime
+    ) -> AssignmentStats:
+        """See `FirestoreAssignmentRepository.get_assignment_stats`."""
+        doc = await self._get_stats_ref(user_id).get()
+        if doc.exists:
+            stats = pydantic.TypeAdapter(StoredAssignmentStats).validate_python(
+                doc.to_dict()
+            )
+            if stats.is_next_pending_valid(ref_time):
+                return stats.to_domain()
+        return (await self._refresh_stats(user_id, ref_time)).to_domain()
+
+    async def get_next_pending_assignment(
+        self, user_id: str, ref_time: datetime
+    ) -> Assignment | None:
+        return await self._query_next_pending(user_id, ref_time)
+
+    async def open_assignment(self, user_id: str, id: str, when: datetime) -> None:
+        doc_ref = self._get_collection_ref(user_id).document(id)
+        await self._update(
+            doc_ref,
+            user_id,
+            id,
+            {"opened_at": firestore.ArrayUnion([when]), "last_opened_at": when},
+        )
+
+    async def submit_assignment(
+        self,
+        user_id: str,
+        id: str,
+        when: datetime,
+        answers: list[AnswerType],
+    ) -> None:
+        """See `FirestoreAssignmentRepository.submit_assignment`."""
+        doc_ref = self._get_collection_ref(user_id).document(id)
+        stats_ref = self._get_stats_ref(user_id)
+
+        async def run(transaction: firestore.AsyncTransaction) -> None:
+            doc = await doc_ref.get(transaction=transaction)
+            if not doc.exists:
+                raise AssignmentNotFound(user_id=user_id, assignment_id=id)
+            data = doc.to_dict()
+            if when > data["expired_at"]:
+                raise SubmissionTooLate(user_id=user_id, assignment_id=id)
+
+            stats_doc = await stats_ref.get(transaction=transaction)
+            if stats_doc.exists:
+                stats = pydantic.TypeAdapter(StoredAssignmentStats).validate_python(
+                    stats_doc.to_dict()
+                )
+            else:
+                stats = await self._compute_stats(user_id, when, transaction)
+            if data["submitted_at"] is None:
+                stats.submitted += 1
+            if stats.next_pending_id == id or not stats.is_next_pending_valid(when):
+                stats.set_next_pending(
+                    await self._query_next_pending(
+                        user_id, when, transaction, excluded_id=id
+                    ),
+                    when,
+                )
+
+            transaction.update(
+                doc_ref,
+                {
+                    "submitted_at": when,
+                    "answers": StoredAssignment.serialize_answers(answers),
+                },
+            )
+            transaction.set(stats_ref, stats.model_dump())
+
+        await firestore.async_transactional(run)(self.client.transaction())
+
+    async def _refresh_stats(
+        self, user_id: str, ref_time: datetime
+    ) -> StoredAssignmentStats:
+        """See `FirestoreAssignmentRepository._refresh_stats`."""
+        stats_ref = self._get_stats_ref(user_id)
+
+        async def run(transaction: firestore.AsyncTransaction) -> StoredAssignmentStats:
+            doc = await stats_ref.get(transaction=transaction)
+            if not doc.exists:
+                stats = await self._compute_stats(user_id, ref_time, transaction)
+            else:
+                stats = pydantic.TypeAdapter(StoredAssignmentStats).validate_python(
+                    doc.to_dict()
+                )
+                if stats.is_next_pending_valid(ref_time):
+                    return stats
+                stored_at = stats.updated_at
+                stats.set_next_pending(
+                    await self._query_next_pending(user_id, ref_time, transaction),
+                    ref_time,
+                )
+                if stored_at is not None and ref_time < stored_at:
+                    # don't move the document back in time
+                    return stats
+            transaction.set(stats_ref, stats.model_dump())
+            return stats
+
+        rv: StoredAssignmentStats = await firestore.async_transactional(run)(
+            self.client.transaction()
+        )
+        return rv
+
+    async def _compute_stats(
+        self,
+        user_id: str,
+        ref_time: datetime,
+        transaction: firestore.AsyncTransaction | None = None,
+    ) -> StoredAssignmentStats:
+        docs = self._get_collection_ref(user_id).stream(transaction=transaction)
+        return StoredAssignmentStats.from_assignments(
+            [
+                pydantic.TypeAdapter(StoredAssignment)
+                .validate_python(doc.to_dict())
+                .to_domain()
+                async for doc in docs
+            ],
+            ref_time,
+        )
+
+    async def _query_next_pending(
+        self,
+        user_id: str,
+        ref_time: datetime,
+        transaction: firestore.AsyncTransaction | None = None,
+        excluded_id: str | None = None,
+    ) -> Assignment | None:
+        docs = (
+            self._get_collection_ref(user_id)
+            .where(filter=make_filter("user_id", "==", user_id))
+            .where(filter=make_filter("expired_at", ">", ref_time))
+            .where(filter=make_filter("submitted_at", "==", None))
+            .order_by("created_at", direction=firestore.Query.ASCENDING)
+            .limit(2)
+        ).stream(transaction=transaction)
+        async for doc in docs:
+            if doc.id != excluded_id:
+                stored_assignment: StoredAssignment = pydantic.TypeAdapter(
+                    StoredAssignment
+                ).validate_python(doc.to_dict())
+                return stored_assignment.to_domain()
+        return None
+
+    def _get_stats_ref(self, user_id: str) -> firestore.AsyncDocumentReference:
+        return self.client.collection(self.stats_collection_name).document(user_id)
+
+    def _get_collection_ref(self, user_id: str) -> firestore.AsyncCollectionReference:
+        return (
+            self.client.collection(self.user_collection_name)
+            .document(user_id)
+            .collection(self.collection_name)
+        )
+
+    async def _update(
+        self,
+        doc_ref: firestore.AsyncDocumentReference,
+        user_id: str,
+        id: str,
+        updates: dict[str, Any],
+    ) -> None:
+        try:
+            await doc_ref.update(updates)
+        except NotFound:
+            raise AssignmentNotFound(user_id=user_id, assignment_id=id)
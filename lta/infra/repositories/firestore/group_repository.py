@@ -1,18 +1,28 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Literal, cast
+from typing import Any, List, Literal, cast
 
 import pydantic
 from google.cloud import firestore
 
 from lta.domain.group import Group
-from lta.domain.group_repository import GroupNotFound, GroupRepository
+from lta.domain.group_repository import (
+    AsyncGroupRepository,
+    GroupNotFound,
+    GroupRepository,
+)
+from lta.infra.repositories.firestore.utils import GET_ALL_CHUNK_SIZE
 
 
 class StoredGroup(Group):
     revision: Literal[1] = 1
 
 
+def parse_stored_group(data: dict[str, Any]) -> Group:
+    stored_group = pydantic.TypeAdapter(StoredGroup).validate_python(data)
+    return pydantic.TypeAdapter(Group).validate_python(stored_group.model_dump())
+
+
 @dataclass
 class FirestoreGroupRepository(GroupRepository):
     client: firestore.Client
@@ -34,8 +44,23 @@ class FirestoreGroupRepository(GroupRepository):
         doc = group_ref.get()
         if not doc.exists:
             raise GroupNotFound(group_id=id)
-        stored_group = pydantic.TypeAdapter(StoredGroup).validate_python(doc.to_dict())
-        return pydantic.TypeAdapter(Group).validate_python(stored_group.model_dump())
+        return parse_stored_group(doc.to_dict())
+
+    def get_groups(self, ids: list[str]) -> list[Group]:
+        """Fetch the groups with one batched read per 100 groups."""
+        ids = list(dict.fromkeys(ids))
+        collection_ref = self.client.collection(self.collection_name)
+        groups: dict[str, Group] = {}
+        for i in range(0, len(ids), GET_ALL_CHUNK_SIZE):
+            docs = self.client.get_all(
+                [collection_ref.document(id) for id in ids[i : i + GET_ALL_CHUNK_SIZE]]
+            )
+            groups.update(
+                (doc.id, parse_stored_group(doc.to_dict()))
+                for doc in docs
+                if doc.exists
+            )
+        return [groups[id] for id in ids if id in groups]
 
     def create_group(self, id: str, name: str, created_at: datetime) -> None:
         group_ref = self.client.collection(self.collection_name).document(id)
@@ -85,3 +110,21 @@ class FirestoreGroupRepository(GroupRepository):
         group = pydantic.TypeAdapter(StoredGroup).validate_python(doc.to_dict())
         group.user_ids = user_ids
         group_ref.set(group.model_dump())
+
+
+@dataclass
+class AsyncFirestoreGroupRepository(AsyncGroupRepository):
+    """Same storage as `FirestoreGroupRepository`, on the async Firestore client."""
+
+    client: firestore.AsyncClient
+    collection_name: str = "groups"
+
+    async def list_groups(self) -> List[Group]:
+        docs = self.client.collection(self.collection_name).stream()
+        stored_groups = [
+            pydantic.TypeAdapter(StoredGroup).validate_python(doc.to_dict())
+            async for doc in docs
+        ]
+        return pydantic.TypeAdapter(list[Group]).validate_python(
+            [g.model_dump() for g in stored_groups]
+        )
@@ -0,0 +1,62 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Literal
+
+import pydantic
+from google.cloud import firestore
+
+from lta.domain.push_ticket_repository import PushTicket, PushTicketRepository
+from lta.infra.repositories.firestore.utils import MAX_WRITE_BATCH_SIZE, make_filter
+
+
+class StoredPushTicket(PushTicket):
+    revision: Literal[1] = 1
+
+
+@dataclass
+class FirestorePushTicketRepository(PushTicketRepository):
+    client: firestore.Client
+    collection_name: str = "push_tickets"
+
+    def add_tickets(self, tickets: list[PushTicket]) -> None:
+        collection_ref = self.client.collection(self.collection_name)
+        for i in range(0, len(tickets), MAX_WRITE_BATCH_SIZE):
+            batch = self.client.batch()
+            for ticket in tickets[i : i + MAX_WRITE_BATCH_SIZE]:
+                batch.set(
+                    collection_ref.document(ticket.id),
+                    StoredPushTicket(**ticket.model_dump()).model_dump(),
+                )
+            batch.commit()
+
+    def list_tickets(
+        self,
+        created_before: datetime,
+        limit: int,
+        after: PushTicket | None = None,
+    ) -> list[PushTicket]:
+        query = (
+            self.client.collection(self.collection_name)
+            .where(filter=make_filter("created_at", "<", created_before))
+            .order_by("created_at")
+            .order_by("id")
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.start_after(dict(created_at=after.created_at, id=after.id))
+        docs = query.stream()
+        stored_tickets = (
+            pydantic.TypeAdapter(StoredPushTicket).validate_python(doc.to_dict())
+            for doc in docs
+        )
+        return pydantic.TypeAdapter(list[PushTicket]).validate_python(
+            [t.model_dump() for t in stored_tickets]
+        )
+
+    def delete_tickets(self, ids: list[str]) -> None:
+        collection_ref = self.client.collection(self.collection_name)
+        for i in range(0, len(ids), MAX_WRITE_BATCH_SIZE):
+            batch = self.client.batch()
+            for id in ids[i : i + MAX_WRITE_BATCH_SIZE]:
+                batch.delete(collection_ref.document(id))
+            batch.commit()
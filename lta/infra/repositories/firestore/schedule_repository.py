@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import time
-from typing import Literal
+from typing import Any, Literal
 
 import pydantic
 from google.cloud import firestore
@@ -61,6 +61,10 @@ class StoredSchedule(BaseModel):
         )
 
 
+def parse_stored_schedule(data: dict[str, Any]) -> Schedule:
+    return pydantic.TypeAdapter(StoredSchedule).validate_python(data).to_domain()
+
+
 @dataclass
 class FirestoreScheduleRepository(ScheduleRepository):
     client: firestore.Client = firestore.Client()
@@ -71,10 +75,7 @@ class FirestoreScheduleRepository(ScheduleRepository):
         doc = doc_ref.get()
         if not doc.exists:
             raise ScheduleNotFound(schedule_id=id)
-        stored_schedule = pydantic.TypeAdapter(StoredSchedule).validate_python(
-            doc.to_dict()
-        )
-        return stored_schedule.to_domain()
+        return parse_stored_schedule(doc.to_dict())
 
     def create_schedule(self, id: str, schedule: ScheduleCreation) -> None:
         doc_ref = self.client.collection(self.collection_name).document(id)
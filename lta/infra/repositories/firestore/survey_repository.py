@@ -1,6 +1,6 @@
 import json
 from dataclasses import dataclass
-from typing import List, Literal
+from typing import Any, List, Literal
 
 import pydantic
 from google.cloud import firestore
@@ -20,6 +20,11 @@ class StoredSurvey(Survey):
     model_config = ConfigDict(extra="forbid")
 
 
+def parse_stored_survey(data: dict[str, Any]) -> Survey:
+    stored_survey = pydantic.TypeAdapter(StoredSurvey).validate_python(data)
+    return pydantic.TypeAdapter(Survey).validate_python(stored_survey.model_dump())
+
+
 @dataclass
 class FirestoreSurveyRepository(SurveyRepository):
     client: firestore.Client
@@ -33,10 +38,7 @@ class FirestoreSurveyRepository(SurveyRepository):
         doc = doc_ref.get()
         if not doc.exists:
             raise SurveyNotFound(survey_id=id)
-        stored_survey = pydantic.TypeAdapter(StoredSurvey).validate_python(
-            doc.to_dict()
-        )
-        return pydantic.TypeAdapter(Survey).validate_python(stored_survey.model_dump())
+        return parse_stored_survey(doc.to_dict())
 
     def create_survey(self, id: str, survey: SurveyCreation) -> None:
         doc_ref = self.client.collection(self.collection_name).document(id)
@@ -52,10 +54,4 @@ class FirestoreSurveyRepository(SurveyRepository):
     def list_surveys(self) -> List[Survey]:
         surveys_ref = self.client.collection(self.collection_name)
         docs = surveys_ref.stream()
-        stored_surveys = (
-            pydantic.TypeAdapter(StoredSurvey).validate_python(doc.to_dict())
-            for doc in docs
-        )
-        return pydantic.TypeAdapter(list[Survey]).validate_python(
-            [s.model_dump() for s in stored_surveys]
-        )
+        return [parse_stored_survey(doc.to_dict()) for doc in docs]
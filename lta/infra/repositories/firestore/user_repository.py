@@ -1,13 +1,16 @@
+import asyncio
 from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Literal, cast
+from typing import Any, Callable, List, Literal, cast
 
 import pydantic
 from google.cloud import firestore
 from pydantic import ConfigDict, EmailStr
 
+from lta.domain.pagination import Page, decode_cursor, make_page
 from lta.domain.user import Device, DeviceOS, User, UserNotificationInfo
-from lta.domain.user_repository import UserNotFound, UserRepository
+from lta.domain.user_repository import AsyncUserRepository, UserNotFound, UserRepository
+from lta.infra.repositories.firestore.utils import GET_ALL_CHUNK_SIZE
 
 
 class StoredUser(User):
@@ -15,6 +18,16 @@ class StoredUser(User):
     model_config = ConfigDict(extra="forbid")
 
 
+def _users_in_order(ids: list[str], stored_users: dict[str, StoredUser]) -> list[User]:
+    for id in ids:
+        if id not in stored_users:
+            raise UserNotFound(user_id=id)
+    return [
+        pydantic.TypeAdapter(User).validate_python(stored_users[id].model_dump())
+        for id in ids
+    ]
+
+
 @dataclass
 class FirestoreUserRepository(UserRepository):
     client: firestore.Client
@@ -31,6 +44,24 @@ class FirestoreUserRepository(UserRepository):
             [u.model_dump() for u in stored_users]
         )
 
+    def list_users_page(self, page_size: int, cursor: str | None = None) -> Page[User]:
+        query = (
+            self.client.collection(self.collection_name)
+            .order_by("id")
+            .limit(page_size + 1)
+        )
+        if cursor is not None:
+            query = query.start_after(decode_cursor(cursor, {"id"}))
+        users = [
+            pydantic.TypeAdapter(User).validate_python(
+                pydantic.TypeAdapter(StoredUser)
+                .validate_python(doc.to_dict())
+                .model_dump()
+            )
+            for doc in query.stream()
+        ]
+        return make_page(users, page_size, lambda user: dict(id=user.id))
+
     def get_device_registrations_from_user_id(self, id: str) -> List[Device]:
         user = self.get_user(id)
         return user.notification_info.devices
@@ -43,32 +74,71 @@ class FirestoreUserRepository(UserRepository):
         stored_user = pydantic.TypeAdapter(StoredUser).validate_python(doc.to_dict())
         return pydantic.TypeAdapter(User).validate_python(stored_user.model_dump())
 
+    def get_users(self, ids: list[str]) -> list[User]:
+        """Fetch the users with one batched read per 100 users."""
+        ids = list(dict.fromkeys(ids))
+        collection_ref = self.client.collection(self.collection_name)
+        stored_users: dict[str, StoredUser] = {}
+        for i in range(0, len(ids), GET_ALL_CHUNK_SIZE):
+            docs = self.client.get_all(
+                [collection_ref.document(id) for id in ids[i : i + GET_ALL_CHUNK_SIZE]]
+            )
+            stored_users.update(
+                (
+                    doc.id,
+                    pydantic.TypeAdapter(StoredUser).validate_python(doc.to_dict()),
+                )
+                for doc in docs
+                if doc.exists
+            )
+        return _users_in_order(ids, stored_users)
+
     def add_device_registration(
         self, id: str, token: str, os: DeviceOS, version: str | None, date: datetime
     ) -> None:
-        user = self.get_user(id)
+        def update(devices: list[Device]) -> list[Device] | None:
+            for device in devices:
+                if device.token == token:
+                    device.add_connection_time(date)
+                    break
+            else:
+                devices.append(
+                    Device(token=token, os=os, version=version, connections=[date])
+                )
+            return devices
+
+        self._update_devices(id, update)
+
+    def remove_device_registration(self, id: str, token: str) -> None:
+        def update(devices: list[Device]) -> list[Device] | None:
+            kept = [d for d in devices if d.token != token]
+            return kept if len(kept) < len(devices) else None
 
-        for device in user.notification_info.devices:
-            if device.token == token:
-                device.add_connection_time(date)
-                break
-        else:
-            user.notification_info.devices.append(
-                Device(
-                    token=token,
-                    os=os,
-                    version=version,
-                    connections=[date],
+        self._update_devices(id, update)
+
+    def _update_devices(
+        self, id: str, update: Callable[[list[Device]], list[Device] | None]
+    ) -> None:
+        """
+        Replace the devices of the user by `update(devices)`, unless it returns None.
+        The devices are read and written in a transaction: the app registers devices
+        while the notification publishers remove the unregistered ones.
+        """
+        user_ref = self.client.collection(self.collection_name).document(id)
+
+        def run(transaction: firestore.Transaction) -> None:
+            doc = user_ref.get(transaction=transaction)
+            if not doc.exists:
+                raise UserNotFound(user_id=id)
+            user = pydantic.TypeAdapter(StoredUser).validate_python(doc.to_dict())
+            devices = update(user.notification_info.devices)
+            if devices is not None:
+                transaction.update(
+                    user_ref,
+                    {"notification_info.devices": [d.model_dump() for d in devices]},
                 )
-            )
 
-        self.client.collection(self.collection_name).document(id).update(
-            {
-                "notification_info.devices": [
-                    d.model_dump() for d in user.notification_info.devices
-                ]
-            }
-        )
+        firestore.transactional(run)(self.client.transaction())
 
     def create_user(
         self,
@@ -92,3 +162,70 @@ class FirestoreUserRepository(UserRepository):
     def exists(self, id: str) -> bool:
         user_ref = self.client.collection(self.collection_name).document(id)
         return cast(bool, user_ref.get().exists)
+
+
+@dataclass
+class AsyncFirestoreUserRepository(AsyncUserRepository):
+    """Same storage as `FirestoreUserRepository`, on the async Firestore client."""
+
+    client: firestore.AsyncClient
+    collection_name: str = "users"
+
+    async def list_users(self) -> List[User]:
+        docs = self.client.collection(self.collection_name).stream()
+        stored_users = [
+            pydantic.TypeAdapter(StoredUser).validate_python(doc.to_dict())
+            async for doc in docs
+        ]
+        return pydantic.TypeAdapter(list[User]).validate_python(
+            [u.model_dump() for u in stored_users]
+        )
+
+    async def list_users_page(
+        self, page_size: int, cursor: str | None = None
+    ) -> Page[User]:
+        query = (
+            self.client.collection(self.collection_name)
+            .order_by("id")
+            .limit(page_size + 1)
+        )
+        if cursor is not None:
+            query = query.start_after(decode_cursor(cursor, {"id"}))
+        users = [
+            pydantic.TypeAdapter(User).validate_python(
+                pydantic.TypeAdapter(StoredUser)
+                .validate_python(doc.to_dict())
+                .model_dump()
+            )
+            async for doc in query.stream()
+        ]
+        return make_page(users, page_size, lambda user: dict(id=user.id))
+
+    async def get_user(self, id: str) -> User:
+        doc = await self.client.collection(self.collection_name).document(id).get()
+        if not doc.exists:
+            raise UserNotFound(user_id=id)
+        stored_user = pydantic.TypeAdapter(StoredUser).validate_python(doc.to_dict())
+        return pydantic.TypeAdapter(User).validate_python(stored_user.model_dump())
+
+    async def get_users(self, ids: list[str]) -> list[User]:
+        """Fetch the users with concurrent batched reads of 100 users."""
+        ids = list(dict.fromkeys(ids))
+        collection_ref = self.client.collection(self.collection_name)
+
+        async def get_chunk(chunk: list[str]) -> list[Any]:
+            docs = self.client.get_all([collection_ref.document(id) for id in chunk])
+            return [doc async for doc in docs if doc.exists]
+
+        chunks = await asyncio.gather(
+            *(
+                get_chunk(ids[i : i + GET_ALL_CHUNK_SIZE])
+                for i in range(0, len(ids), GET_ALL_CHUNK_SIZE)
+            )
+        )
+        stored_users = {
+            doc.id: pydantic.TypeAdapter(StoredUser).validate_python(doc.to_dict())
+            for chunk in chunks
+            for doc in chunk
+        }
+        return _users_in_order(ids, stored_users)
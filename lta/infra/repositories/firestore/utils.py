@@ -3,6 +3,12 @@ from typing import Any, cast
 from google.cloud import firestore
 from google.cloud.firestore_v1 import FieldFilter
 
+# Firestore rejects write batches of more than 500 operations.
+MAX_WRITE_BATCH_SIZE = 500
+
+# Number of documents read by each `get_all` call.
+GET_ALL_CHUNK_SIZE = 100
+
 
 def make_filter(field_path: Any, op_string: Any, value: Any) -> FieldFilter:
     """
@@ -18,3 +24,10 @@ def get_collection_count(
     collection: firestore.CollectionReference | firestore.Query,
 ) -> int:
     return cast(int, collection.count().get()[0][0].value)
+
+
+async def get_async_collection_count(
+    collection: firestore.AsyncCollectionReference | firestore.AsyncQuery,
+) -> int:
+    result = await collection.count().get()
+    return cast(int, result[0][0].value)
@@ -1,22 +1,75 @@
+import bisect
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import List
 
-from lta.domain.assignment import AnswerType, Assignment
+from lta.domain.assignment import (
+    AnswerType,
+    Assignment,
+    AssignmentStats,
+    AssignmentSummary,
+)
 from lta.domain.assignment_repository import (
+    AssignmentCreation,
     AssignmentNotFound,
     AssignmentRepository,
     SubmissionTooLate,
 )
+from lta.domain.pagination import (
+    InvalidCursor,
+    Page,
+    decode_cursor,
+    decode_cursor_datetime,
+    make_page,
+)
+
+# Sort keys of the indexes.
+CreationKey = tuple[datetime, str]
+ExpirationKey = tuple[datetime, datetime, str]
+
+
+@dataclass
+class UserIndex:
+    """
+    Secondary indexes of the assignments of a user, kept sorted with `bisect`.
+
+    `by_creation` holds all the assignments, by (created_at, id).  `pending` holds the
+    non-submitted ones, by (expired_at, created_at, id), so that the ones still open at
+    a given time are a suffix of it.  `irregular` counts the non-submitted assignments
+    whose expiration is not `created_at` plus the expiration delay: while there are
+    none, the pending assignments expire in the order they were created in.
+    """
+
+    by_creation: list[CreationKey] = field(default_factory=list)
+    pending: list[ExpirationKey] = field(default_factory=list)
+    irregular: int = 0
 
 
 @dataclass
 class InMemoryAssignmentRepository(AssignmentRepository):
+    """
+    Assignments in a dict by user and id, with sorted indexes per user for the lists,
+    the pages and the pending assignments (see `UserIndex`).
+
+    The counts and the next pending assignment are read in O(log n).  The assignments
+    returned are copies, unless `copy_on_read` is false (e.g. for load simulations,
+    where the callers don't modify them).
+    """
+
     assignments: dict[str, dict[str, Assignment]] = field(
         default_factory=lambda: defaultdict(dict)
     )
     expiration_delay: timedelta = timedelta(hours=1)
+    copy_on_read: bool = True
+    _indexes: dict[str, UserIndex] = field(
+        default_factory=lambda: defaultdict(UserIndex), init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        for user_assignments in self.assignments.values():
+            for assignment in user_assignments.values():
+                self._index(assignment)
 
     def _get_assignment(self, user_id: str, id: str) -> Assignment:
         """Return a reference to the object."""
@@ -24,9 +77,12 @@ class InMemoryAssignmentRepository(AssignmentRepository):
             raise AssignmentNotFound(user_id=user_id, assignment_id=id)
         return self.assignments[user_id][id]
 
+    def _read(self, assignment: Assignment) -> Assignment:
+        return assignment.model_copy() if self.copy_on_read else assignment
+
     def get_assignment(self, user_id: str, id: str) -> Assignment:
-        """Return a copy of the object."""
-        return self._get_assignment(user_id, id).model_copy()
+        """Return a copy of the object, if `copy_on_read`."""
+        return self._read(self._get_assignment(user_id, id))
 
     def create_assignment(
         self,
@@ -36,6 +92,8 @@ class InMemoryAssignmentRepository(AssignmentRepository):
         survey_title: str,
         created_at: datetime,
     ) -> None:
+        if id in self.assignments[user_id]:
+            return
         assignment = Assignment(
             id=id,
             title=survey_title,
@@ -45,22 +103,61 @@ class InMemoryAssignmentRepository(AssignmentRepository):
             expired_at=created_at + self.expiration_delay,
         )
         self.assignments[user_id][id] = assignment
+        self._index(assignment)
+
+    def create_assignments(self, creations: list[AssignmentCreation]) -> None:
+        for creation in creations:
+            self.create_assignment(
+                user_id=creation.user_id,
+                id=creation.id,
+                survey_id=creation.survey_id,
+                survey_title=creation.survey_title,
+                created_at=creation.created_at,
+            )
 
     def list_assignments(
         self, user_id: str, limit: int | None = None
     ) -> List[Assignment]:
-        assignments = [
-            assignment.model_copy()
-            for assignment in self.assignments[user_id].values()
-            if assignment.user_id == user_id
+        return [
+            self._read(assignment)
+            for assignment in self._list_by_creation(user_id, limit=limit)
         ]
-        assignments = sorted(assignments, key=lambda x: x.created_at, reverse=True)
-        if limit is not None:
-            assignments = assignments[:limit]
-        return assignments
+
+    def list_assignment_summaries(
+        self, user_id: str, limit: int | None = None
+    ) -> list[AssignmentSummary]:
+        return [
+            self._summarize(assignment)
+            for assignment in self._list_by_creation(user_id, limit=limit)
+        ]
+
+    def list_assignment_summaries_page(
+        self, user_id: str, page_size: int, cursor: str | None = None
+    ) -> Page[AssignmentSummary]:
+        keys = self._user_index(user_id).by_creation
+        end = len(keys)
+        if cursor is not None:
+            position = decode_cursor(cursor, {"created_at", "id"})
+            after = (
+                decode_cursor_datetime(cursor, position["created_at"]),
+                position["id"],
+            )
+            try:
+                end = bisect.bisect_left(keys, after)
+            except TypeError:  # naive and aware datetimes
+                raise InvalidCursor(cursor=cursor)
+        user_assignments = self.assignments.get(user_id, {})
+        return make_page(
+            [
+                self._summarize(user_assignments[id])
+                for _, id in reversed(keys[max(end - page_size - 1, 0) : end])
+            ],
+            page_size,
+            lambda s: dict(created_at=s.created_at.isoformat(), id=s.id),
+        )
 
     def count_assignments(self, user_id: str) -> int:
-        return len(self.assignments[user_id])
+        return len(self._user_index(user_id).by_creation)
 
     def notify_user(self, user_id: str, assignment_id: str, when: datetime) -> None:
         assignment = self._get_assignment(user_id, assignment_id)
@@ -80,32 +177,100 @@ class InMemoryAssignmentRepository(AssignmentRepository):
         assignment = self._get_assignment(user_id, id)
         if when > assignment.expired_at:
             raise SubmissionTooLate(user_id=user_id, assignment_id=id)
+        self._unindex(assignment)
         assignment.submitted_at = when
         assignment.answers = answers
+        self._index(assignment)
 
     def list_pending_assignments(
         self, user_id: str, ref_time: datetime
     ) -> List[Assignment]:
-        assignments = [
-            assignment.model_copy()
-            for assignment in self.assignments[user_id].values()
-            if assignment.user_id == user_id
-            and assignment.expired_at is not None
-            and assignment.expired_at > ref_time
-            and assignment.submitted_at is None
-        ]
-        return sorted(assignments, key=lambda x: x.created_at, reverse=True)
+        user_assignments = self.assignments.get(user_id, {})
+        open_keys = sorted(
+            (
+                (created_at, id)
+                for _, created_at, id in self._open_keys(user_id, ref_time)
+            ),
+            reverse=True,
+        )
+        return [self._read(user_assignments[id]) for _, id in open_keys]
 
     def get_next_pending_assignment(
         self, user_id: str, ref_time: datetime
     ) -> Assignment | None:
-        pending_assignments = self.list_pending_assignments(user_id, ref_time=ref_time)
-        if pending_assignments:
-            return pending_assignments[-1]
-        return None
+        index = self._user_index(user_id)
+        start = self._open_start(index, ref_time)
+        if start == len(index.pending):
+            return None
+        if index.irregular:
+            _, _, id = min(index.pending[start:], key=lambda key: key[1:])
+        else:
+            _, _, id = index.pending[start]
+        return self._read(self.assignments[user_id][id])
 
     def count_non_answered_assignments(self, user_id: str) -> int:
-        return sum(
-            not bool(assignment.submitted_at)
-            for assignment in self.assignments[user_id].values()
+        return len(self._user_index(user_id).pending)
+
+    def get_assignment_stats(self, user_id: str, ref_time: datetime) -> AssignmentStats:
+        index = self._user_index(user_id)
+        next_pending = self.get_next_pending_assignment(user_id, ref_time)
+        return AssignmentStats(
+            total=len(index.by_creation),
+            submitted=len(index.by_creation) - len(index.pending),
+            last_created_at=index.by_creation[-1][0] if index.by_creation else None,
+            next_pending_id=next_pending.id if next_pending else None,
+            next_pending_expired_at=next_pending.expired_at if next_pending else None,
+        )
+
+    def _user_index(self, user_id: str) -> UserIndex:
+        """Don't add an empty index for unknown users."""
+        return self._indexes.get(user_id) or UserIndex()
+
+    def _list_by_creation(self, user_id: str, limit: int | None) -> List[Assignment]:
+        """The assignments of the user, most recent first."""
+        keys = self._user_index(user_id).by_creation
+        if limit is not None:
+            keys = keys[len(keys) - limit :] if limit > 0 else []
+        user_assignments = self.assignments.get(user_id, {})
+        return [user_assignments[id] for _, id in reversed(keys)]
+
+    @staticmethod
+    def _open_start(index: UserIndex, ref_time: datetime) -> int:
+        """Position of the first pending assignment not expired at `ref_time`."""
+        return bisect.bisect_right(index.pending, ref_time, key=lambda key: key[0])
+
+    def _open_keys(self, user_id: str, ref_time: datetime) -> list[ExpirationKey]:
+        index = self._user_index(user_id)
+        return index.pending[self._open_start(index, ref_time) :]
+
+    def _index(self, assignment: Assignment) -> None:
+        index = self._indexes[assignment.user_id]
+        bisect.insort(index.by_creation, (assignment.created_at, assignment.id))
+        if assignment.submitted_at is None:
+            bisect.insort(
+                index.pending,
+                (assignment.expired_at, assignment.created_at, assignment.id),
+            )
+            index.irregular += self._is_irregular(assignment)
+
+    def _unindex(self, assignment: Assignment) -> None:
+        index = self._indexes[assignment.user_id]
+        by_creation = (assignment.created_at, assignment.id)
+        del index.by_creation[bisect.bisect_left(index.by_creation, by_creation)]
+        if assignment.submitted_at is None:
+            pending = (assignment.expired_at, assignment.created_at, assignment.id)
+            del index.pending[bisect.bisect_left(index.pending, pending)]
+            index.irregular -= self._is_irregular(assignment)
+
+    def _is_irregular(self, assignment: Assignment) -> bool:
+        return assignment.expired_at != assignment.created_at + self.expiration_delay
+
+    @staticmethod
+    def _summarize(assignment: Assignment) -> AssignmentSummary:
+        return AssignmentSummary(
+            id=assignment.id,
+            title=assignment.title,
+            created_at=assignment.created_at,
+            submitted_at=assignment.submitted_at,
+            last_opened_at=max(assignment.opened_at, default=None),
         )
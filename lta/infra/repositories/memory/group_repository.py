@@ -17,6 +17,9 @@ class InMemoryGroupRepository(GroupRepository):
             raise GroupNotFound(group_id=id)
         return self.groups[id]
 
+    def get_groups(self, ids: list[str]) -> list[Group]:
+        return [self.groups[id] for id in dict.fromkeys(ids) if id in self.groups]
+
     def create_group(self, id: str, name: str, created_at: datetime) -> None:
         if id in self.groups:
             raise ValueError(f"Group with id {id} already exists.")
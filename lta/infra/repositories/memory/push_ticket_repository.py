@@ -0,0 +1,39 @@
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from lta.domain.push_ticket_repository import PushTicket, PushTicketRepository
+
+
+@dataclass
+class InMemoryPushTicketRepository(PushTicketRepository):
+    tickets: dict[str, PushTicket] = field(default_factory=dict)
+
+    def add_tickets(self, tickets: list[PushTicket]) -> None:
+        for ticket in tickets:
+            self.tickets[ticket.id] = ticket
+
+    def list_tickets(
+        self,
+        created_before: datetime,
+        limit: int,
+        after: PushTicket | None = None,
+    ) -> list[PushTicket]:
+        tickets = sorted(
+            (
+                ticket
+                for ticket in self.tickets.values()
+                if ticket.created_at < created_before
+            ),
+            key=lambda ticket: (ticket.created_at, ticket.id),
+        )
+        if after is not None:
+            tickets = [
+                ticket
+                for ticket in tickets
+                if (ticket.created_at, ticket.id) > (after.created_at, after.id)
+            ]
+        return tickets[:limit]
+
+    def delete_tickets(self, ids: list[str]) -> None:
+        for id in ids:
+            self.tickets.pop(id, None)
@@ -1,8 +1,10 @@
+import bisect
 from dataclasses import dataclass, field
 from datetime import datetime
 
 from pydantic import EmailStr
 
+from lta.domain.pagination import Page, decode_cursor, make_page
 from lta.domain.user import Device, DeviceOS, User, UserNotificationInfo
 from lta.domain.user_repository import UserNotFound, UserRepository
 
@@ -10,10 +12,25 @@ from lta.domain.user_repository import UserNotFound, UserRepository
 @dataclass
 class InMemoryUserRepository(UserRepository):
     users: dict[str, User] = field(default_factory=dict)
+    # The user ids, sorted for the pages.
+    _sorted_ids: list[str] = field(default_factory=list, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._sorted_ids = sorted(self.users)
 
     def list_users(self) -> list[User]:
         return list(self.users.values())
 
+    def list_users_page(self, page_size: int, cursor: str | None = None) -> Page[User]:
+        start = 0
+        if cursor is not None:
+            after = decode_cursor(cursor, {"id"})["id"]
+            start = bisect.bisect_right(self._sorted_ids, after)
+        ids = self._sorted_ids[start : start + page_size + 1]
+        return make_page(
+            [self.users[id] for id in ids], page_size, lambda u: dict(id=u.id)
+        )
+
     def get_device_registrations_from_user_id(self, id: str) -> list[Device]:
         if id not in self.users:
             raise UserNotFound(user_id=id)
@@ -24,6 +41,13 @@ class InMemoryUserRepository(UserRepository):
             raise UserNotFound(user_id=id)
         return self.users[id]
 
+    def get_users(self, ids: list[str]) -> list[User]:
+        ids = list(dict.fromkeys(ids))
+        for id in ids:
+            if id not in self.users:
+                raise UserNotFound(user_id=id)
+        return [self.users[id] for id in ids]
+
     def add_device_registration(
         self, id: str, token: str, os: DeviceOS, version: str | None, date: datetime
     ) -> None:
@@ -44,6 +68,14 @@ class InMemoryUserRepository(UserRepository):
             )
         )
 
+    def remove_device_registration(self, id: str, token: str) -> None:
+        if id not in self.users:
+            raise UserNotFound(user_id=id)
+        notification_info = self.users[id].notification_info
+        notification_info.devices = [
+            device for device in notification_info.devices if device.token != token
+        ]
+
     def create_user(
         self,
         id: str,
@@ -61,6 +93,8 @@ class InMemoryUserRepository(UserRepository):
                 phone_number=phone_number,
             ),
         )
+        if id not in self.users:
+            bisect.insort(self._sorted_ids, id)
         self.users[id] = user
 
     def exists(self, id: str) -> bool:
@@ -0,0 +1,86 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Generic, Protocol, TypeVar
+
+T = TypeVar("T")
+
+
+class Watch(Protocol):
+    @property
+    def is_active(self) -> bool: ...
+
+    def unsubscribe(self) -> None: ...
+
+
+class WatchableCollection(Protocol):
+    """What we use of a Firestore `CollectionReference`."""
+
+    id: str
+
+    def on_snapshot(self, callback: Callable[..., None]) -> Watch: ...
+
+
+@dataclass
+class CollectionReplica(Generic[T]):
+    """
+    In-process copy of a whole Firestore collection, kept fresh by a snapshot listener.
+
+    The replica is `live` once the first snapshot has been received, and as long as the
+    listener is running.  Callers are expected to fall back to direct reads when it is
+    not (before `start`, while starting, or after the listener stopped).
+
+    Documents are converted with `parse` when a snapshot is received.  If a document
+    can't be parsed, the replica stops being live until the next snapshot, so that
+    direct reads report the error.  The items are shared between callers and must not
+    be mutated.
+    """
+
+    collection: WatchableCollection
+    parse: Callable[[dict[str, Any]], T]
+    _items: dict[str, T] = field(default_factory=dict, init=False, repr=False)
+    _ready: threading.Event = field(default_factory=threading.Event, init=False)
+    _watch: Watch | None = field(default=None, init=False, repr=False)
+
+    def start(self) -> None:
+        if self._watch is None:
+            self._watch = self.collection.on_snapshot(self._on_snapshot)
+
+    def stop(self) -> None:
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+        self._ready.clear()
+
+    def wait_ready(self, timeout: float) -> bool:
+        """Wait for the first snapshot, and return whether the replica is live."""
+        self._ready.wait(timeout)
+        return self.live
+
+    @property
+    def live(self) -> bool:
+        return (
+            self._ready.is_set() and self._watch is not None and self._watch.is_active
+        )
+
+    def get(self, id: str) -> T | None:
+        return self._items.get(id)
+
+    def values(self) -> list[T]:
+        return list(self._items.values())
+
+    def _on_snapshot(self, docs: list[Any], changes: Any, read_time: Any) -> None:
+        try:
+            items = {doc.id: self.parse(doc.to_dict()) for doc in docs}
+        except Exception as e:
+            logging.error(
+                "Invalid document in replicated collection",
+                extra=dict(
+                    json_fields=dict(collection=self.collection.id, error=str(e))
+                ),
+            )
+            self._ready.clear()
+            return
+        # replaced at once: readers see either the previous snapshot or this one
+        self._items = items
+        self._ready.set()
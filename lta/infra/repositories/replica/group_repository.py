@@ -0,0 +1,56 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from lta.domain.group import Group
+from lta.domain.group_repository import GroupNotFound, GroupRepository
+from lta.infra.repositories.replica.collection import CollectionReplica
+
+
+@dataclass
+class ReplicatedGroupRepository(GroupRepository):
+    """
+    Serve the reads from `replica` when it is live, and from `repository` otherwise.
+    Writes go to `repository`, and come back through the replica listener.
+    """
+
+    repository: GroupRepository
+    replica: CollectionReplica[Group]
+
+    def list_groups(self) -> list[Group]:
+        if not self.replica.live:
+            return self.repository.list_groups()
+        return self.replica.values()
+
+    def get_group(self, id: str) -> Group:
+        if not self.replica.live:
+            return self.repository.get_group(id)
+        group = self.replica.get(id)
+        if group is None:
+            raise GroupNotFound(group_id=id)
+        return group
+
+    def get_groups(self, ids: list[str]) -> list[Group]:
+        if not self.replica.live:
+            return self.repository.get_groups(ids)
+        groups = (self.replica.get(id) for id in dict.fromkeys(ids))
+        return [group for group in groups if group is not None]
+
+    def create_group(self, id: str, name: str, created_at: datetime) -> None:
+        self.repository.create_group(id, name, created_at)
+
+    def remove_group(self, id: str) -> None:
+        self.repository.remove_group(id)
+
+    def exists(self, id: str) -> bool:
+        if not self.replica.live:
+            return self.repository.exists(id)
+        return self.replica.get(id) is not None
+
+    def add_user_to_group(self, group_id: str, user_id: str) -> None:
+        self.repository.add_user_to_group(group_id, user_id)
+
+    def remove_user_from_group(self, group_id: str, user_id: str) -> None:
+        self.repository.remove_user_from_group(group_id, user_id)
+
+    def set_users(self, group_id: str, user_ids: list[str]) -> None:
+        self.repository.set_users(group_id, user_ids)
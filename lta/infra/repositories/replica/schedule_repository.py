@@ -0,0 +1,44 @@
+from dataclasses import dataclass
+
+from lta.domain.schedule import Schedule
+from lta.domain.schedule_repository import (
+    ScheduleCreation,
+    ScheduleNotFound,
+    ScheduleRepository,
+)
+from lta.infra.repositories.replica.collection import CollectionReplica
+
+
+@dataclass
+class ReplicatedScheduleRepository(ScheduleRepository):
+    """
+    Serve the reads from `replica` when it is live, and from `repository` otherwise.
+    Writes go to `repository`, and come back through the replica listener.
+    """
+
+    repository: ScheduleRepository
+    replica: CollectionReplica[Schedule]
+
+    def get_schedule(self, id: str) -> Schedule:
+        if not self.replica.live:
+            return self.repository.get_schedule(id)
+        schedule = self.replica.get(id)
+        if schedule is None:
+            raise ScheduleNotFound(schedule_id=id)
+        return schedule
+
+    def create_schedule(self, id: str, schedule: ScheduleCreation) -> None:
+        self.repository.create_schedule(id, schedule)
+
+    def delete_schedule(self, id: str) -> None:
+        self.repository.delete_schedule(id)
+
+    def list_schedules(self) -> list[Schedule]:
+        if not self.replica.live:
+            return self.repository.list_schedules()
+        return self.replica.values()
+
+    def list_active_schedules(self) -> list[Schedule]:
+        if not self.replica.live:
+            return self.repository.list_active_schedules()
+        return [schedule for schedule in self.replica.values() if schedule.active]
@@ -0,0 +1,37 @@
+from dataclasses import dataclass
+
+from lta.domain.survey import Survey
+from lta.domain.survey_repository import (
+    TEST_SURVEY_ID,
+    SurveyCreation,
+    SurveyNotFound,
+    SurveyRepository,
+)
+from lta.infra.repositories.replica.collection import CollectionReplica
+
+
+@dataclass
+class ReplicatedSurveyRepository(SurveyRepository):
+    """
+    Serve the reads from `replica` when it is live, and from `repository` otherwise.
+    Writes go to `repository`, and come back through the replica listener.
+    """
+
+    repository: SurveyRepository
+    replica: CollectionReplica[Survey]
+
+    def get_survey(self, id: str) -> Survey:
+        if id == TEST_SURVEY_ID or not self.replica.live:
+            return self.repository.get_survey(id)
+        survey = self.replica.get(id)
+        if survey is None:
+            raise SurveyNotFound(survey_id=id)
+        return survey
+
+    def create_survey(self, id: str, survey: SurveyCreation) -> None:
+        self.repository.create_survey(id, survey)
+
+    def list_surveys(self) -> list[Survey]:
+        if not self.replica.live:
+            return self.repository.list_surveys()
+        return self.replica.values()
@@ -0,0 +1,290 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+
+from lta.domain.assignment import (
+    AnswerType,
+    Assignment,
+    AssignmentStats,
+    AssignmentSummary,
+)
+from lta.domain.assignment_repository import (
+    AssignmentCreation,
+    AssignmentNotFound,
+    AssignmentRepository,
+    SubmissionTooLate,
+)
+from lta.domain.pagination import Page, decode_cursor, decode_cursor_datetime, make_page
+from lta.infra.sqlite import SqliteConnections, to_timestamp
+
+# The answers are kept out of `data`, so that the list views don't parse them.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS assignments (
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expired_at REAL NOT NULL,
+    submitted_at REAL,
+    data TEXT NOT NULL,
+    answers TEXT,
+    PRIMARY KEY (user_id, id)
+);
+CREATE INDEX IF NOT EXISTS assignments_user_created_at
+    ON assignments (user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS assignments_user_pending
+    ON assignments (user_id, created_at) WHERE submitted_at IS NULL;
+"""
+
+answers_adapter = TypeAdapter(list[AnswerType])
+
+
+@dataclass
+class SqliteAssignmentRepository(AssignmentRepository):
+    """
+    The assignments are stored as JSON documents, with the columns needed by the
+    queries alongside.  The counts and the next pending assignment are read from the
+    indexes, so the stats need no rebuild.
+    """
+
+    connections: SqliteConnections
+    expiration_delay: timedelta = timedelta(hours=1)
+
+    def __post_init__(self) -> None:
+        self.connections.connection().executescript(SCHEMA)
+
+    def get_assignment(self, user_id: str, id: str) -> Assignment:
+        row = (
+            self.connections.connection()
+            .execute(
+                "SELECT data, answers FROM assignments WHERE user_id = ? AND id = ?",
+                (user_id, id),
+            )
+            .fetchone()
+        )
+        if row is None:
+            raise AssignmentNotFound(user_id=user_id, assignment_id=id)
+        return self._load(*row)
+
+    def create_assignment(
+        self,
+        user_id: str,
+        id: str,
+        survey_id: str,
+        survey_title: str,
+        created_at: datetime,
+    ) -> None:
+        self.create_assignments(
+            [
+                AssignmentCreation(
+                    user_id=user_id,
+                    id=id,
+                    survey_id=survey_id,
+                    survey_title=survey_title,
+                    created_at=created_at,
+                )
+            ]
+        )
+
+    def create_assignments(self, creations: list[AssignmentCreation]) -> None:
+        assignments = [
+            Assignment(
+                id=creation.id,
+                title=creation.survey_title,
+                user_id=creation.user_id,
+                survey_id=creation.survey_id,
+                created_at=creation.created_at,
+                expired_at=creation.created_at + self.expiration_delay,
+            )
+            for creation in creations
+        ]
+        with self.connections.transaction() as connection:
+            connection.executemany(
+                "INSERT OR IGNORE INTO assignments "
+                "(user_id, id, created_at, expired_at, submitted_at, data, answers) "
+                "VALUES (?, ?, ?, ?, NULL, ?, NULL)",
+                [
+                    (
+                        assignment.user_id,
+                        assignment.id,
+                        to_timestamp(assignment.created_at),
+                        to_timestamp(assignment.expired_at),
+                        assignment.model_dump_json(exclude={"answers"}),
+                    )
+                    for assignment in assignments
+                ],
+            )
+
+    def list_assignments(
+        self, user_id: str, limit: int | None = None
+    ) -> list[Assignment]:
+        rows = self.connections.connection().execute(
+            "SELECT data, answers FROM assignments WHERE user_id = ? "
+            "ORDER BY created_at DESC, id DESC LIMIT ?",
+            (user_id, -1 if limit is None else limit),
+        )
+        return [self._load(data, answers) for data, answers in rows]
+
+    def list_assignment_summaries(
+        self, user_id: str, limit: int | None = None
+    ) -> list[AssignmentSummary]:
+        rows = self.connections.connection().execute(
+            "SELECT data FROM assignments WHERE user_id = ? "
+            "ORDER BY created_at DESC, id DESC LIMIT ?",
+            (user_id, -1 if limit is None else limit),
+        )
+        return [self._load_summary(data) for data, in rows]
+
+    def list_assignment_summaries_page(
+        self, user_id: str, page_size: int, cursor: str | None = None
+    ) -> Page[AssignmentSummary]:
+        if cursor is None:
+            rows = self.connections.connection().execute(
+                "SELECT data FROM assignments WHERE user_id = ? "
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                (user_id, page_size + 1),
+            )
+        else:
+            position = decode_cursor(cursor, {"created_at", "id"})
+            created_at = to_timestamp(
+                decode_cursor_datetime(cursor, position["created_at"])
+            )
+            rows = self.connections.connection().execute(
+                "SELECT data FROM assignments WHERE user_id = ? "
+                "AND (created_at < ? OR (created_at = ? AND id < ?)) "
+                "ORDER BY created_at DESC, id DESC LIMIT ?",
+                (user_id, created_at, created_at, position["id"], page_size + 1),
+            )
+        return make_page(
+            [self._load_summary(data) for data, in rows],
+            page_size,
+            lambda s: dict(created_at=s.created_at.isoformat(), id=s.id),
+        )
+
+    def count_assignments(self, user_id: str) -> int:
+        (count,) = (
+            self.connections.connection()
+            .execute("SELECT COUNT(*) FROM assignments WHERE user_id = ?", (user_id,))
+            .fetchone()
+        )
+        return int(count)
+
+    def notify_user(self, user_id: str, assignment_id: str, when: datetime) -> None:
+        with self.connections.transaction():
+            assignment = self.get_assignment(user_id, assignment_id)
+            assignment.notified_at.append(when)
+            self._update(assignment)
+
+    def open_assignment(self, user_id: str, assignment_id: str, when: datetime) -> None:
+        with self.connections.transaction():
+            assignment = self.get_assignment(user_id, assignment_id)
+            assignment.opened_at.append(when)
+            self._update(assignment)
+
+    def submit_assignment(
+        self, user_id: str, id: str, when: datetime, answers: list[AnswerType]
+    ) -> None:
+        with self.connections.transaction():
+            assignment = self.get_assignment(user_id, id)
+            if when > assignment.expired_at:
+                raise SubmissionTooLate(user_id=user_id, assignment_id=id)
+            assignment.submitted_at = when
+            assignment.answers = answers
+            self._update(assignment)
+
+    def list_pending_assignments(
+        self, user_id: str, ref_time: datetime
+    ) -> list[Assignment]:
+        rows = self.connections.connection().execute(
+            "SELECT data, answers FROM assignments "
+            "WHERE user_id = ? AND submitted_at IS NULL AND expired_at > ? "
+            "ORDER BY created_at DESC, id DESC",
+            (user_id, to_timestamp(ref_time)),
+        )
+        return [self._load(data, answers) for data, answers in rows]
+
+    def get_next_pending_assignment(
+        self, user_id: str, ref_time: datetime
+    ) -> Assignment | None:
+        row = (
+            self.connections.connection()
+            .execute(
+                "SELECT data, answers FROM assignments "
+                "WHERE user_id = ? AND submitted_at IS NULL AND expired_at > ? "
+                "ORDER BY created_at, id LIMIT 1",
+                (user_id, to_timestamp(ref_time)),
+            )
+            .fetchone()
+        )
+        return self._load(*row) if row is not None else None
+
+    def count_non_answered_assignments(self, user_id: str) -> int:
+        (count,) = (
+            self.connections.connection()
+            .execute(
+                "SELECT COUNT(*) FROM assignments "
+                "WHERE user_id = ? AND submitted_at IS NULL",
+                (user_id,),
+            )
+            .fetchone()
+        )
+        return int(count)
+
+    def get_assignment_stats(self, user_id: str, ref_time: datetime) -> AssignmentStats:
+        total, submitted = (
+            self.connections.connection()
+            .execute(
+                "SELECT COUNT(*), COUNT(submitted_at) FROM assignments "
+                "WHERE user_id = ?",
+                (user_id,),
+            )
+            .fetchone()
+        )
+        last = self.list_assignment_summaries(user_id, limit=1)
+        next_pending = self.get_next_pending_assignment(user_id, ref_time)
+        return AssignmentStats(
+            total=total,
+            submitted=submitted,
+            last_created_at=last[0].created_at if last else None,
+            next_pending_id=next_pending.id if next_pending else None,
+            next_pending_expired_at=next_pending.expired_at if next_pending else None,
+        )
+
+    def _update(self, assignment: Assignment) -> None:
+        self.connections.connection().execute(
+            "UPDATE assignments SET submitted_at = ?, data = ?, answers = ? "
+            "WHERE user_id = ? AND id = ?",
+            (
+                (
+                    to_timestamp(assignment.submitted_at)
+                    if assignment.submitted_at is not None
+                    else None
+                ),
+                assignment.model_dump_json(exclude={"answers"}),
+                (
+                    answers_adapter.dump_json(assignment.answers).decode()
+                    if assignment.answers is not None
+                    else None
+                ),
+                assignment.user_id,
+                assignment.id,
+            ),
+        )
+
+    @staticmethod
+    def _load(data: str, answers: str | None) -> Assignment:
+        assignment = Assignment.model_validate_json(data)
+        if answers is not None:
+            assignment.answers = answers_adapter.validate_json(answers)
+        return assignment
+
+    @staticmethod
+    def _load_summary(data: str) -> AssignmentSummary:
+        assignment = Assignment.model_validate_json(data)
+        return AssignmentSummary(
+            id=assignment.id,
+            title=assignment.title,
+            created_at=assignment.created_at,
+            submitted_at=assignment.submitted_at,
+            last_opened_at=max(assignment.opened_at, default=None),
+        )
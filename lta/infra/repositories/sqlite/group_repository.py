@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from lta.domain.group import Group
+from lta.domain.group_repository import GroupNotFound, GroupRepository
+from lta.infra.sqlite import SqliteConnections
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS groups (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class SqliteGroupRepository(GroupRepository):
+    connections: SqliteConnections
+
+    def __post_init__(self) -> None:
+        self.connections.connection().executescript(SCHEMA)
+
+    def list_groups(self) -> list[Group]:
+        rows = self.connections.connection().execute(
+            "SELECT data FROM groups ORDER BY rowid"
+        )
+        return [Group.model_validate_json(data) for data, in rows]
+
+    def get_group(self, id: str) -> Group:
+        row = (
+            self.connections.connection()
+            .execute("SELECT data FROM groups WHERE id = ?", (id,))
+            .fetchone()
+        )
+        if row is None:
+            raise GroupNotFound(group_id=id)
+        return Group.model_validate_json(row[0])
+
+    def get_groups(self, ids: list[str]) -> list[Group]:
+        groups: list[Group] = []
+        for id in dict.fromkeys(ids):
+            row = (
+                self.connections.connection()
+                .execute("SELECT data FROM groups WHERE id = ?", (id,))
+                .fetchone()
+            )
+            if row is not None:
+                groups.append(Group.model_validate_json(row[0]))
+        return groups
+
+    def create_group(self, id: str, name: str, created_at: datetime) -> None:
+        with self.connections.transaction():
+            if self.exists(id):
+                raise ValueError(f"Group with id {id} already exists.")
+            self._save(Group(id=id, name=name, user_ids=[]))
+
+    def remove_group(self, id: str) -> None:
+        cursor = self.connections.connection().execute(
+            "DELETE FROM groups WHERE id = ?", (id,)
+        )
+        if cursor.rowcount == 0:
+            raise GroupNotFound(group_id=id)
+
+    def exists(self, id: str) -> bool:
+        row = (
+            self.connections.connection()
+            .execute("SELECT 1 FROM groups WHERE id = ?", (id,))
+            .fetchone()
+        )
+        return row is not None
+
+    def add_user_to_group(self, group_id: str, user_id: str) -> None:
+        with self.connections.transaction():
+            group = self.get_group(group_id)
+            if user_id not in group.user_ids:
+                group.user_ids.append(user_id)
+                self._save(group)
+
+    def remove_user_from_group(self, group_id: str, user_id: str) -> None:
+        with self.connections.transaction():
+            group = self.get_group(group_id)
+            if user_id in group.user_ids:
+                group.user_ids.remove(user_id)
+                self._save(group)
+
+    def set_users(self, group_id: str, user_ids: list[str]) -> None:
+        with self.connections.transaction():
+            group = self.get_group(group_id)
+            group.user_ids = user_ids
+            self._save(group)
+
+    def _save(self, group: Group) -> None:
+        self.connections.connection().execute(
+            "INSERT INTO groups (id, data) VALUES (?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET data = excluded.data",
+            (group.id, group.model_dump_json()),
+        )
@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from lta.domain.push_ticket_repository import PushTicket, PushTicketRepository
+from lta.infra.sqlite import SqliteConnections, to_timestamp
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS push_tickets (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS push_tickets_created_at ON push_tickets (created_at, id);
+"""
+
+
+@dataclass
+class SqlitePushTicketRepository(PushTicketRepository):
+    connections: SqliteConnections
+
+    def __post_init__(self) -> None:
+        self.connections.connection().executescript(SCHEMA)
+
+    def add_tickets(self, tickets: list[PushTicket]) -> None:
+        with self.connections.transaction() as connection:
+            connection.executemany(
+                "INSERT INTO push_tickets (id, created_at, data) VALUES (?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET "
+                "created_at = excluded.created_at, data = excluded.data",
+                [
+                    (
+                        ticket.id,
+                        to_timestamp(ticket.created_at),
+                        ticket.model_dump_json(),
+                    )
+                    for ticket in tickets
+                ],
+            )
+
+    def list_tickets(
+        self,
+        created_before: datetime,
+        limit: int,
+        after: PushTicket | None = None,
+    ) -> list[PushTicket]:
+        if after is None:
+            rows = self.connections.connection().execute(
+                "SELECT data FROM push_tickets WHERE created_at < ? "
+                "ORDER BY created_at, id LIMIT ?",
+                (to_timestamp(created_before), limit),
+            )
+        else:
+            after_created_at = to_timestamp(after.created_at)
+            rows = self.connections.connection().execute(
+                "SELECT data FROM push_tickets WHERE created_at < ? "
+                "AND (created_at > ? OR (created_at = ? AND id > ?)) "
+                "ORDER BY created_at, id LIMIT ?",
+                (
+                    to_timestamp(created_before),
+                    after_created_at,
+                    after_created_at,
+                    after.id,
+                    limit,
+                ),
+            )
+        return [PushTicket.model_validate_json(data) for data, in rows]
+
+    def delete_tickets(self, ids: list[str]) -> None:
+        with self.connections.transaction() as connection:
+            connection.executemany(
+                "DELETE FROM push_tickets WHERE id = ?", [(id,) for id in ids]
+            )
@@ -0,0 +1,71 @@
+from dataclasses import dataclass
+
+from lta.domain.schedule import Schedule
+from lta.domain.schedule_repository import (
+    ScheduleCreation,
+    ScheduleNotFound,
+    ScheduleRepository,
+)
+from lta.infra.sqlite import SqliteConnections
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedules (
+    id TEXT PRIMARY KEY,
+    active INTEGER NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS schedules_active ON schedules (active);
+"""
+
+
+@dataclass
+class SqliteScheduleRepository(ScheduleRepository):
+    connections: SqliteConnections
+
+    def __post_init__(self) -> None:
+        self.connections.connection().executescript(SCHEMA)
+
+    def get_schedule(self, id: str) -> Schedule:
+        row = (
+            self.connections.connection()
+            .execute("SELECT data FROM schedules WHERE id = ?", (id,))
+            .fetchone()
+        )
+        if row is None:
+            raise ScheduleNotFound(schedule_id=id)
+        return Schedule.model_validate_json(row[0])
+
+    def create_schedule(self, id: str, schedule: ScheduleCreation) -> None:
+        stored_schedule = Schedule(
+            id=id,
+            active=schedule.active,
+            survey_id=schedule.survey_id,
+            days=schedule.days,
+            time_range=schedule.time_range,
+            user_ids=schedule.user_ids,
+            group_ids=schedule.group_ids,
+            same_time_for_all_users=schedule.same_time_for_all_users,
+        )
+        self.connections.connection().execute(
+            "INSERT INTO schedules (id, active, data) VALUES (?, ?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET active = excluded.active, "
+            "data = excluded.data",
+            (id, stored_schedule.active, stored_schedule.model_dump_json()),
+        )
+
+    def delete_schedule(self, id: str) -> None:
+        self.connections.connection().execute(
+            "DELETE FROM schedules WHERE id = ?", (id,)
+        )
+
+    def list_schedules(self) -> list[Schedule]:
+        rows = self.connections.connection().execute(
+            "SELECT data FROM schedules ORDER BY rowid"
+        )
+        return [Schedule.model_validate_json(data) for data, in rows]
+
+    def list_active_schedules(self) -> list[Schedule]:
+        rows = self.connections.connection().execute(
+            "SELECT data FROM schedules WHERE active ORDER BY rowid"
+        )
+        return [Schedule.model_validate_json(data) for data, in rows]
@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+
+from lta.domain.survey import Survey
+from lta.domain.survey_repository import (
+    TEST_SURVEY_ID,
+    SurveyCreation,
+    SurveyNotFound,
+    SurveyRepository,
+)
+from lta.infra.sqlite import SqliteConnections
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS surveys (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+
+@dataclass
+class SqliteSurveyRepository(SurveyRepository):
+    connections: SqliteConnections
+
+    def __post_init__(self) -> None:
+        self.connections.connection().executescript(SCHEMA)
+
+    def get_survey(self, id: str) -> Survey:
+        if id == TEST_SURVEY_ID:
+            return self.get_test_survey()
+
+        row = (
+            self.connections.connection()
+            .execute("SELECT data FROM surveys WHERE id = ?", (id,))
+            .fetchone()
+        )
+        if row is None:
+            raise SurveyNotFound(survey_id=id)
+        return Survey.model_validate_json(row[0])
+
+    def create_survey(self, id: str, survey: SurveyCreation) -> None:
+        stored_survey = Survey(
+            id=id,
+            title=survey.title,
+            welcome_message=survey.welcome_message,
+            submit_message=survey.submit_message,
+            questions=survey.questions,
+            notifications=survey.notifications,
+        )
+        self.connections.connection().execute(
+            "INSERT INTO surveys (id, data) VALUES (?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET data = excluded.data",
+            (id, stored_survey.model_dump_json()),
+        )
+
+    def list_surveys(self) -> list[Survey]:
+        rows = self.connections.connection().execute(
+            "SELECT data FROM surveys ORDER BY rowid"
+        )
+        return [Survey.model_validate_json(data) for data, in rows]
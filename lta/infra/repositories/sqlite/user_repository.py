@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from datetime import datetime
+
+from pydantic import EmailStr
+
+from lta.domain.pagination import Page, decode_cursor, make_page
+from lta.domain.user import Device, DeviceOS, User, UserNotificationInfo
+from lta.domain.user_repository import UserNotFound, UserRepository
+from lta.infra.sqlite import SqliteConnections
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+# Maximum number of parameters of a single `IN (...)` query.
+MAX_QUERY_PARAMETERS = 500
+
+
+@dataclass
+class SqliteUserRepository(UserRepository):
+    """The users are stored as JSON documents, by id."""
+
+    connections: SqliteConnections
+
+    def __post_init__(self) -> None:
+        self.connections.connection().executescript(SCHEMA)
+
+    def list_users(self) -> list[User]:
+        rows = self.connections.connection().execute(
+            "SELECT data FROM users ORDER BY rowid"
+        )
+        return [User.model_validate_json(data) for data, in rows]
+
+    def list_users_page(self, page_size: int, cursor: str | None = None) -> Page[User]:
+        after = decode_cursor(cursor, {"id"})["id"] if cursor is not None else ""
+        rows = self.connections.connection().execute(
+            "SELECT data FROM users WHERE id > ? ORDER BY id LIMIT ?",
+            (after, page_size + 1),
+        )
+        users = [User.model_validate_json(data) for data, in rows]
+        return make_page(users, page_size, lambda user: dict(id=user.id))
+
+    def get_device_registrations_from_user_id(self, id: str) -> list[Device]:
+        return self.get_user(id).notification_info.devices
+
+    def get_user(self, id: str) -> User:
+        row = (
+            self.connections.connection()
+            .execute("SELECT data FROM users WHERE id = ?", (id,))
+            .fetchone()
+        )
+        if row is None:
+            raise UserNotFound(user_id=id)
+        return User.model_validate_json(row[0])
+
+    def get_users(self, ids: list[str]) -> list[User]:
+        ids = list(dict.fromkeys(ids))
+        users: dict[str, User] = {}
+        for i in range(0, len(ids), MAX_QUERY_PARAMETERS):
+            chunk = ids[i : i + MAX_QUERY_PARAMETERS]
+            rows = self.connections.connection().execute(
+                f"SELECT data FROM users WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            for (data,) in rows:
+                user = User.model_validate_json(data)
+                users[user.id] = user
+        for id in ids:
+            if id not in users:
+                raise UserNotFound(user_id=id)
+        return [users[id] for id in ids]
+
+    def add_device_registration(
+        self, id: str, token: str, os: DeviceOS, version: str | None, date: datetime
+    ) -> None:
+        with self.connections.transaction():
+            user = self.get_user(id)
+            for device in user.notification_info.devices:
+                if device.token == token:
+                    device.add_connection_time(date)
+                    break
+            else:
+                user.notification_info.devices.append(
+                    Device(token=token, os=os, version=version, connections=[date])
+                )
+            self._save(user)
+
+    def remove_device_registration(self, id: str, token: str) -> None:
+        with self.connections.transaction():
+            user = self.get_user(id)
+            devices = user.notification_info.devices
+            user.notification_info.devices = [d for d in devices if d.token != token]
+            self._save(user)
+
+    def create_user(
+        self,
+        id: str,
+        email_address: EmailStr,
+        created_at: datetime,
+        notification_email: EmailStr | None = None,
+        phone_number: str | None = None,
+    ) -> None:
+        self._save(
+            User(
+                id=id,
+                email_address=email_address,
+                created_at=created_at,
+                notification_info=UserNotificationInfo(
+                    email_address=notification_email,
+                    phone_number=phone_number,
+                ),
+            )
+        )
+
+    def exists(self, id: str) -> bool:
+        row = (
+            self.connections.connection()
+            .execute("SELECT 1 FROM users WHERE id = ?", (id,))
+            .fetchone()
+        )
+        return row is not None
+
+    def _save(self, user: User) -> None:
+        self.connections.connection().execute(
+            "INSERT INTO users (id, data) VALUES (?, ?) "
+            "ON CONFLICT (id) DO UPDATE SET data = excluded.data",
+            (user.id, user.model_dump_json()),
+        )
@@ -0,0 +1,81 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+
+from lta.domain.assignment import (
+    AnswerType,
+    Assignment,
+    AssignmentStats,
+    AssignmentSummary,
+)
+from lta.domain.assignment_repository import (
+    AssignmentRepository,
+    AsyncAssignmentRepository,
+)
+from lta.domain.pagination import Page
+
+
+@dataclass
+class ThreadedAssignmentRepository(AsyncAssignmentRepository):
+    """
+    Async repository running the calls of a blocking `AssignmentRepository` in a
+    worker thread, so that they don't block the event loop.
+    """
+
+    repository: AssignmentRepository
+
+    async def get_assignment(self, user_id: str, id: str) -> Assignment:
+        return await asyncio.to_thread(self.repository.get_assignment, user_id, id)
+
+    async def list_assignments(
+        self, user_id: str, limit: int | None = None
+    ) -> list[Assignment]:
+        return await asyncio.to_thread(
+            self.repository.list_assignments, user_id, limit=limit
+        )
+
+    async def list_assignment_summaries(
+        self, user_id: str, limit: int | None = None
+    ) -> list[AssignmentSummary]:
+        return await asyncio.to_thread(
+            self.repository.list_assignment_summaries, user_id, limit=limit
+        )
+
+    async def list_assignment_summaries_page(
+        self, user_id: str, page_size: int, cursor: str | None = None
+    ) -> Page[AssignmentSummary]:
+        return await asyncio.to_thread(
+            self.repository.list_assignment_summaries_page, user_id, page_size, cursor
+        )
+
+    async def count_assignments(self, user_id: str) -> int:
+        return await asyncio.to_thread(self.repository.count_assignments, user_id)
+
+    async def count_non_answered_assignments(self, user_id: str) -> int:
+        return await asyncio.to_thread(
+            self.repository.count_non_answered_assignments, user_id
+        )
+
+    async def get_assignment_stats(
+        self, user_id: str, ref_time: datetime
+    ) -> AssignmentStats:
+        return await asyncio.to_thread(
+            self.repository.get_assignment_stats, user_id, ref_time
+        )
+
+    async def get_next_pending_assignment(
+        self, user_id: str, ref_time: datetime
+    ) -> Assignment | None:
+        return await asyncio.to_thread(
+            self.repository.get_next_pending_assignment, user_id, ref_time
+        )
+
+    async def open_assignment(self, user_id: str, id: str, when: datetime) -> None:
+        await asyncio.to_thread(self.repository.open_assignment, user_id, id, when)
+
+    async def submit_assignment(
+        self, user_id: str, id: str, when: datetime, answers: list[AnswerType]
+    ) -> None:
+        await asyncio.to_thread(
+            self.repository.submit_assignment, user_id, id, when, answers
+        )
@@ -0,0 +1,18 @@
+import asyncio
+from dataclasses import dataclass
+
+from lta.domain.group import Group
+from lta.domain.group_repository import AsyncGroupRepository, GroupRepository
+
+
+@dataclass
+class ThreadedGroupRepository(AsyncGroupRepository):
+    """
+    Async repository running the calls of a blocking `GroupRepository` in a worker
+    thread, so that they don't block the event loop.
+    """
+
+    repository: GroupRepository
+
+    async def list_groups(self) -> list[Group]:
+        return await asyncio.to_thread(self.repository.list_groups)
@@ -0,0 +1,32 @@
+import asyncio
+from dataclasses import dataclass
+
+from lta.domain.pagination import Page
+from lta.domain.user import User
+from lta.domain.user_repository import AsyncUserRepository, UserRepository
+
+
+@dataclass
+class ThreadedUserRepository(AsyncUserRepository):
+    """
+    Async repository running the calls of a blocking `UserRepository` in a worker
+    thread, so that they don't block the event loop.
+    """
+
+    repository: UserRepository
+
+    async def list_users(self) -> list[User]:
+        return await asyncio.to_thread(self.repository.list_users)
+
+    async def list_users_page(
+        self, page_size: int, cursor: str | None = None
+    ) -> Page[User]:
+        return await asyncio.to_thread(
+            self.repository.list_users_page, page_size, cursor
+        )
+
+    async def get_user(self, id: str) -> User:
+        return await asyncio.to_thread(self.repository.get_user, id)
+
+    async def get_users(self, ids: list[str]) -> list[User]:
+        return await asyncio.to_thread(self.repository.get_users, ids)
@@ -0,0 +1,144 @@
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable
+
+from lta.domain.scheduler.notification_pulisher import (
+    NotificationPublisher,
+    NotificationType,
+)
+from lta.domain.survey import SurveyNotificationInfo
+from lta.domain.user import UserNotificationInfo
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitOpen(Exception):
+    publisher: str
+
+    def __str__(self) -> str:
+        return f"circuit open for {self.publisher}"
+
+
+@dataclass
+class CircuitBreakerNotificationPublisher(NotificationPublisher):
+    """
+    Wrap a publisher, and stop calling it while it is unhealthy.
+
+    The outcome of the last `window_size` calls is kept.  A call fails if it raises
+    (slow providers fail on their HTTP timeouts); returning False (nothing to send, or
+    a message rejected by the provider) is not a failure.  Once at least `min_calls`
+    calls are known, the circuit opens when the failure rate reaches
+    `failure_rate_threshold`: calls raise `CircuitOpen` right away, for
+    `cool_down_seconds`.  Then the circuit is half-open: a single trial call is let
+    through, which closes the circuit if it succeeds, and opens it again otherwise.
+    """
+
+    publisher: NotificationPublisher
+    window_size: int = 20
+    min_calls: int = 5
+    failure_rate_threshold: float = 0.5
+    cool_down_seconds: float = 30.0
+    clock: Callable[[], float] = time.monotonic
+    state: CircuitState = CircuitState.CLOSED
+    short_circuited: int = 0
+    _outcomes: deque[bool] = field(init=False, repr=False)
+    _opened_at: float = field(default=0.0, init=False, repr=False)
+    _trial_running: bool = field(default=False, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def __post_init__(self) -> None:
+        self._outcomes = deque(maxlen=self.window_size)
+
+    @property
+    def name(self) -> str:
+        return self.publisher.name
+
+    def send_notification(
+        self,
+        user_id: str,
+        assignment_id: str,
+        user_notification_info: UserNotificationInfo,
+        survey_notification_info: SurveyNotificationInfo,
+        notification_type: NotificationType,
+    ) -> bool:
+        self._before_call()
+        try:
+            sent = self.publisher.send_notification(
+                user_id=user_id,
+                assignment_id=assignment_id,
+                user_notification_info=user_notification_info,
+                survey_notification_info=survey_notification_info,
+                notification_type=notification_type,
+            )
+        except Exception:
+            self._after_call(success=False)
+            raise
+        self._after_call(success=True)
+        return sent
+
+    def _before_call(self) -> None:
+        with self._lock:
+            if self.state == CircuitState.OPEN:
+                if self.clock() - self._opened_at >= self.cool_down_seconds:
+                    self._transition(CircuitState.HALF_OPEN)
+            if self.state == CircuitState.HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return
+            if self.state == CircuitState.CLOSED:
+                return
+            self.short_circuited += 1
+            short_circuited = self.short_circuited
+        logging.info(
+            "Notification publisher short-circuited",
+            extra=dict(
+                json_fields=dict(publisher=self.name, short_circuited=short_circuited)
+            ),
+        )
+        raise CircuitOpen(self.name)
+
+    def _after_call(self, success: bool) -> None:
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self._trial_running = False
+                self._transition(CircuitState.CLOSED if success else CircuitState.OPEN)
+                self._outcomes.clear()
+                return
+            self._outcomes.append(success)
+            if (
+                self.state == CircuitState.CLOSED
+                and len(self._outcomes) >= self.min_calls
+                and self._failure_rate() >= self.failure_rate_threshold
+            ):
+                self._transition(CircuitState.OPEN)
+
+    def _failure_rate(self) -> float:
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def _transition(self, state: CircuitState) -> None:
+        """Must be called with the lock held."""
+        logging.warning(
+            "Circuit breaker state changed",
+            extra=dict(
+                json_fields=dict(
+                    publisher=self.name,
+                    previous_state=self.state.value,
+                    state=state.value,
+                    failure_rate=self._failure_rate() if self._outcomes else None,
+                    short_circuited=self.short_circuited,
+                )
+            ),
+        )
+        self.state = state
+        if state == CircuitState.OPEN:
+            self._opened_at = self.clock()
+        if state == CircuitState.CLOSED:
+            self.short_circuited = 0
@@ -1,15 +1,94 @@
 from dataclasses import dataclass
 from datetime import datetime
 
-from lta.domain.scheduler.assignment_scheduler import AssignmentScheduler
+from lta.domain.scheduler.assignment_scheduler import (
+    AssignmentBundle,
+    AssignmentScheduler,
+    SchedulingSummary,
+)
 from lta.domain.scheduler.assignment_service import AssignmentService
+from lta.infra.scheduler.direct.timer_engine import Timer, TimerEngine
+
+CREATE_ASSIGNMENT = "create_assignment"
+CREATE_ASSIGNMENTS = "create_assignments"
 
 
 @dataclass
 class DirectAssignmentScheduler(AssignmentScheduler):
+    """
+    Create the assignments in process: at their time if a `timer_engine` is given,
+    right away otherwise.
+    """
+
     assignment_service: AssignmentService
+    timer_engine: TimerEngine | None = None
+
+    def __post_init__(self) -> None:
+        if self.timer_engine is not None:
+            self.timer_engine.handlers[CREATE_ASSIGNMENT] = self._create_assignment
+            self.timer_engine.handlers[CREATE_ASSIGNMENTS] = self._create_assignments
 
     def schedule_assignment(self, user_id: str, survey_id: str, when: datetime) -> None:
+        if self.timer_engine is None:
+            self.assignment_service.create_assignment(
+                user_id=user_id, survey_id=survey_id, ref_time=when
+            )
+        else:
+            self.timer_engine.schedule(
+                f"assignment-{user_id}-{survey_id}-{when.isoformat()}",
+                when,
+                CREATE_ASSIGNMENT,
+                dict(user_id=user_id, survey_id=survey_id),
+            )
+
+    def schedule_assignment_bundles(
+        self, bundles: list[AssignmentBundle]
+    ) -> SchedulingSummary:
+        summary = SchedulingSummary()
+        for bundle in bundles:
+            try:
+                self._schedule_bundle(bundle)
+            except Exception as e:
+                for request in bundle.to_requests():
+                    summary.add_error(request, e)
+            else:
+                summary.scheduled += len(bundle.user_ids)
+        return summary
+
+    def _schedule_bundle(self, bundle: AssignmentBundle) -> None:
+        if not bundle.user_ids:
+            return
+
+        if self.timer_engine is None:
+            self.assignment_service.create_assignments(
+                user_ids=bundle.user_ids,
+                survey_id=bundle.survey_id,
+                ref_time=bundle.when,
+            )
+        else:
+            self.timer_engine.schedule(
+                f"bundle-{bundle.survey_id}-{bundle.when.isoformat()}-"
+                f"{bundle.user_ids[0]}",
+                bundle.when,
+                CREATE_ASSIGNMENTS,
+                dict(user_ids=bundle.user_ids, survey_id=bundle.survey_id),
+            )
+
+    # The timer keys identify the assignments: a timer run again after a crash, or
+    # from the store, doesn't create them twice.
+
+    def _create_assignment(self, timer: Timer) -> None:
         self.assignment_service.create_assignment(
-            user_id=user_id, survey_id=survey_id, ref_time=when
+            user_id=timer.payload["user_id"],
+            survey_id=timer.payload["survey_id"],
+            ref_time=timer.when,
+            idempotency_key=timer.key,
+        )
+
+    def _create_assignments(self, timer: Timer) -> None:
+        self.assignment_service.create_assignments(
+            user_ids=timer.payload["user_ids"],
+            survey_id=timer.payload["survey_id"],
+            ref_time=timer.when,
+            idempotency_key=timer.key,
         )
@@ -5,12 +5,25 @@ from lta.domain.scheduler.notification_pulisher import NotificationType
 from lta.domain.scheduler.notification_scheduler import NotificationScheduler
 from lta.domain.scheduler.notification_service import NotificationService
 from lta.domain.user_repository import UserRepository
+from lta.infra.scheduler.direct.timer_engine import Timer, TimerEngine
+
+NOTIFY_USER = "notify_user"
 
 
 @dataclass
 class DirectNotificationScheduler(NotificationScheduler):
+    """
+    Send the notifications in process: at their time if a `timer_engine` is given,
+    right away otherwise.
+    """
+
     user_repository: UserRepository
     notification_service: NotificationService
+    timer_engine: TimerEngine | None = None
+
+    def __post_init__(self) -> None:
+        if self.timer_engine is not None:
+            self.timer_engine.handlers[NOTIFY_USER] = self._notify_user
 
     def schedule_initial_notification(
         self,
@@ -18,7 +31,8 @@ class DirectNotificationScheduler(NotificationScheduler):
         assignment_id: str,
         when: datetime | None = None,
     ) -> None:
-        self.notification_service.notify_user(
+        self._schedule_notification(
+            key=f"initial-{user_id}-{assignment_id}",
             user_id=user_id,
             assignment_id=assignment_id,
             notification_type=NotificationType.INITIAL,
@@ -30,10 +44,65 @@ class DirectNotificationScheduler(NotificationScheduler):
         user_id: str,
         assignment_id: str,
         when: datetime,
+        reminder_index: int = 0,
     ) -> None:
-        self.notification_service.notify_user(
+        self._schedule_notification(
+            key=self._make_reminder_key(user_id, assignment_id, reminder_index),
             user_id=user_id,
             assignment_id=assignment_id,
             notification_type=NotificationType.REMINDER,
             when=when,
         )
+
+    def cancel_reminders(
+        self, user_id: str, assignment_id: str, reminder_count: int
+    ) -> None:
+        if self.timer_engine is None:
+            return
+        for reminder_index in range(reminder_count):
+            self.timer_engine.cancel(
+                self._make_reminder_key(user_id, assignment_id, reminder_index)
+            )
+
+    def _schedule_notification(
+        self,
+        key: str,
+        user_id: str,
+        assignment_id: str,
+        notification_type: NotificationType,
+        when: datetime | None,
+    ) -> None:
+        if self.timer_engine is None:
+            self.notification_service.notify_user(
+                user_id=user_id,
+                assignment_id=assignment_id,
+                notification_type=notification_type,
+                when=when,
+            )
+        else:
+            self.timer_engine.schedule(
+                key,
+                when or self.timer_engine.clock(),
+                NOTIFY_USER,
+                dict(
+                    user_id=user_id,
+                    assignment_id=assignment_id,
+                    notification_type=notification_type.value,
+                    when=when.isoformat() if when else None,
+                ),
+            )
+
+    def _notify_user(self, timer: Timer) -> None:
+        when = timer.payload["when"]
+        self.notification_service.notify_user(
+            user_id=timer.payload["user_id"],
+            assignment_id=timer.payload["assignment_id"],
+            notification_type=NotificationType(timer.payload["notification_type"]),
+            when=datetime.fromisoformat(when) if when else None,
+        )
+
+    @staticmethod
+    def _make_reminder_key(
+        user_id: str, assignment_id: str, reminder_index: int
+    ) -> str:
+        return f"reminder-{user_id}-{assignment_id}-{reminder_index}"
@@ -0,0 +1,275 @@
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+
+class TimerQueueFull(Exception):
+    pass
+
+
+class TimerEngineStopped(Exception):
+    pass
+
+
+@dataclass(order=True)
+class Timer:
+    """A call to the handler of `kind` with `payload`, which must be JSON-serializable."""
+
+    when: datetime
+    seq: int
+    key: str = field(compare=False)
+    kind: str = field(compare=False)
+    payload: dict[str, Any] = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+TimerHandler = Callable[[Timer], None]
+
+
+@dataclass
+class TimerStore:
+    """
+    The pending timers, kept in a JSON file between two runs of the engine.
+
+    `save` adds the timers to the ones already stored (e.g. by another process), and
+    `load` returns the stored timers and removes them.
+    """
+
+    path: Path
+
+    def save(self, timers: list[Timer]) -> None:
+        stored = {timer["key"]: timer for timer in self._read()}
+        for timer in timers:
+            stored[timer.key] = dict(
+                key=timer.key,
+                when=timer.when.isoformat(),
+                kind=timer.kind,
+                payload=timer.payload,
+            )
+        temporary = self.path.with_name(self.path.name + ".tmp")
+        temporary.write_text(json.dumps(list(stored.values())))
+        os.replace(temporary, self.path)
+
+    def load(self) -> list[dict[str, Any]]:
+        stored = self._read()
+        self.path.unlink(missing_ok=True)
+        return stored
+
+    def _read(self) -> list[dict[str, Any]]:
+        if not self.path.exists():
+            return []
+        stored: list[dict[str, Any]] = json.loads(self.path.read_text())
+        return stored
+
+
+@dataclass
+class TimerStats:
+    pending: int = 0
+    fired: int = 0
+    failed: int = 0
+    max_lag_seconds: float = 0.0
+    total_lag_seconds: float = 0.0
+
+    @property
+    def mean_lag_seconds(self) -> float:
+        return self.total_lag_seconds / self.fired if self.fired else 0.0
+
+
+def utc_now() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
+@dataclass
+class TimerEngine:
+    """
+    Run timers at a given time, with the handler registered for their kind, in a pool
+    of `max_workers` threads.
+
+    The timers are kept in a heap, and a dispatcher thread hands the due ones to the
+    pool.  At most `max_pending` timers can wait: `schedule` raises `TimerQueueFull`
+    beyond, and `TimerEngineStopped` while the engine is not running.  A timer is
+    identified by a key, which can be used to cancel it; scheduling a key again
+    replaces the pending timer.
+
+    On `stop`, the timers not due yet are saved in the `store`, and scheduled again by
+    the next `start`.
+
+    The lag between the scheduled time and the actual start of each callback is
+    logged, and summed up in `stats`.
+    """
+
+    max_workers: int = 4
+    max_pending: int = 100_000
+    store: TimerStore | None = None
+    clock: Callable[[], datetime] = utc_now
+    handlers: dict[str, TimerHandler] = field(default_factory=dict, repr=False)
+    _heap: list[Timer] = field(default_factory=list, init=False, repr=False)
+    _timers: dict[str, Timer] = field(default_factory=dict, init=False, repr=False)
+    _seq: Iterator[int] = field(default_factory=itertools.count, init=False, repr=False)
+    _condition: threading.Condition = field(
+        default_factory=threading.Condition, init=False, repr=False
+    )
+    _stats: TimerStats = field(default_factory=TimerStats, init=False, repr=False)
+    _executor: ThreadPoolExecutor | None = field(default=None, init=False, repr=False)
+    _dispatcher: threading.Thread | None = field(default=None, init=False, repr=False)
+    _stopping: bool = field(default=False, init=False, repr=False)
+
+    def start(self) -> None:
+        with self._condition:
+            if self._dispatcher is not None:
+                return
+            self._stopping = False
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="timer"
+            )
+            self._dispatcher = threading.Thread(
+                target=self._dispatch, name="timer-dispatcher", daemon=True
+            )
+            self._dispatcher.start()
+        if self.store is not None:
+            for stored in self.store.load():
+                try:
+                    self.schedule(
+                        stored["key"],
+                        datetime.fromisoformat(stored["when"]),
+                        stored["kind"],
+                        stored["payload"],
+                    )
+                except (ValueError, TimerQueueFull) as e:
+                    logging.error(
+                        "Stored timer dropped",
+                        extra=dict(
+                            json_fields=dict(
+                                key=stored["key"], error_message=str(e) or repr(e)
+                            )
+                        ),
+                    )
+
+    def stop(self) -> list[Timer]:
+        """
+        Stop the engine, after running the due timers and waiting for the running ones.
+
+        The timers not due yet are saved in the `store` (if any), and returned.
+        """
+        with self._condition:
+            if self._dispatcher is None:
+                return []
+            self._stopping = True
+            pending = sorted(self._timers.values())
+            self._heap.clear()
+            self._timers.clear()
+            self._stats.pending = 0
+            self._condition.notify_all()
+            dispatcher, executor = self._dispatcher, self._executor
+            self._dispatcher = self._executor = None
+        dispatcher.join()
+        assert executor is not None
+        now = self.clock()
+        for timer in pending:
+            if timer.when <= now:
+                executor.submit(self._run, timer)
+        executor.shutdown(wait=True)
+        later = [timer for timer in pending if timer.when > now]
+        if self.store is not None and later:
+            self.store.save(later)
+        return later
+
+    def schedule(
+        self, key: str, when: datetime, kind: str, payload: dict[str, Any]
+    ) -> None:
+        if kind not in self.handlers:
+            raise ValueError(f"No handler for timer kind: {kind}")
+        with self._condition:
+            if self._dispatcher is None or self._stopping:
+                raise TimerEngineStopped()
+            previous = self._timers.pop(key, None)
+            if previous is not None:
+                previous.cancelled = True
+            elif len(self._timers) >= self.max_pending:
+                raise TimerQueueFull()
+            timer = Timer(
+                when=when, seq=next(self._seq), key=key, kind=kind, payload=payload
+            )
+            self._timers[key] = timer
+            heapq.heappush(self._heap, timer)
+            self._stats.pending = len(self._timers)
+            # wake the dispatcher up if the new timer is the next one
+            if self._heap[0] is timer:
+                self._condition.notify()
+
+    def cancel(self, key: str) -> bool:
+        """Return False if there is no pending timer with this key."""
+        with self._condition:
+            timer = self._timers.pop(key, None)
+            if timer is None:
+                return False
+            # the timer is left in the heap, and skipped by the dispatcher
+            timer.cancelled = True
+            self._stats.pending = len(self._timers)
+            return True
+
+    @property
+    def stats(self) -> TimerStats:
+        with self._condition:
+            return TimerStats(**vars(self._stats))
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._condition:
+                timer = self._next_due_timer()
+                if timer is None:
+                    return
+                self._timers.pop(timer.key, None)
+                self._stats.pending = len(self._timers)
+                executor = self._executor
+            assert executor is not None
+            executor.submit(self._run, timer)
+
+    def _next_due_timer(self) -> Timer | None:
+        """Wait for the next due timer, or return None when stopping."""
+        while not self._stopping:
+            while self._heap and self._heap[0].cancelled:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                self._condition.wait()
+                continue
+            delay = (self._heap[0].when - self.clock()).total_seconds()
+            if delay > 0:
+                self._condition.wait(timeout=delay)
+                continue
+            return heapq.heappop(self._heap)
+        return None
+
+    def _run(self, timer: Timer) -> None:
+        lag = max((self.clock() - timer.when).total_seconds(), 0.0)
+        with self._condition:
+            self._stats.fired += 1
+            self._stats.total_lag_seconds += lag
+            self._stats.max_lag_seconds = max(self._stats.max_lag_seconds, lag)
+        logging.info(
+            "Timer fired",
+            extra=dict(
+                json_fields=dict(
+                    key=timer.key,
+                    scheduled_at=timer.when.isoformat(),
+                    lag_ms=round(lag * 1000),
+                )
+            ),
+        )
+        try:
+            self.handlers[timer.kind](timer)
+        except Exception as e:
+            with self._condition:
+                self._stats.failed += 1
+            logging.error(
+                "Timer callback failed",
+                extra=dict(json_fields=dict(key=timer.key, error_message=str(e))),
+            )
@@ -1,34 +1,165 @@
+import dataclasses
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
 
 import requests
-from requests import HTTPError
+from requests import RequestException
 
+from lta.domain.push_ticket_repository import PushTicket, PushTicketRepository
 from lta.domain.scheduler.notification_pulisher import (
     NotificationPublisher,
     NotificationType,
 )
 from lta.domain.survey import SurveyNotificationInfo
 from lta.domain.user import UserNotificationInfo
+from lta.domain.user_repository import UserRepository
+from lta.infra.http import Timeout
+
+
+@dataclass
+class ExpoMessage:
+    to: str
+    title: str
+    body: str
+
+
+@dataclass
+class ExpoTicket:
+    """
+    The push ticket returned by Expo for a message.
+
+    `error` is the Expo error code (e.g. `DeviceNotRegistered`) if there is one.
+    `request_failed` is set if there is no ticket because the request failed.
+    """
+
+    device_token: str
+    ok: bool
+    id: str | None = None
+    message: str | None = None
+    error: str | None = None
+    request_failed: bool = False
+
+
+@dataclass
+class ExpoReceipt:
+    """The delivery receipt of a push ticket, as returned by Expo."""
+
+    ok: bool
+    message: str | None = None
+    error: str | None = None
+
+
+DEVICE_NOT_REGISTERED = "DeviceNotRegistered"
+
+
+class ExpoUnavailable(Exception):
+    pass
 
 
 @dataclass
 class ExpoAPI:
-    def send_notification(self, device_token: str, title: str, body: str) -> None:
-        response = requests.post(
-            url="https://exp.host/--/api/v2/push/send",
-            json={
-                "to": device_token,
-                "title": title,
-                "body": body,
-            },
-        )
-        response.raise_for_status()
+    """
+    Client of the Expo push API.
+
+    Messages are sent in batches of `batch_size` (at most 100 for Expo), and receipts
+    are read in batches of `receipts_batch_size` (at most 1000), through `session`,
+    which should be long-lived so that connections are reused.
+    """
+
+    url: str = "https://exp.host/--/api/v2/push/send"
+    receipts_url: str = "https://exp.host/--/api/v2/push/getReceipts"
+    batch_size: int = 100
+    receipts_batch_size: int = 1000
+    session: requests.Session = field(default_factory=requests.Session)
+    timeout: Timeout = (5.0, 10.0)
+
+    def send_notifications(self, messages: list[ExpoMessage]) -> list[ExpoTicket]:
+        """
+        Send all the messages, and return one ticket per message, in the same order.
+
+        A batch whose request fails doesn't stop the others: all its messages get an
+        error ticket.
+        """
+        tickets: list[ExpoTicket] = []
+        for i in range(0, len(messages), self.batch_size):
+            tickets.extend(self._send_batch(messages[i : i + self.batch_size]))
+        return tickets
+
+    def _send_batch(self, messages: list[ExpoMessage]) -> list[ExpoTicket]:
+        try:
+            response = self.session.post(
+                url=self.url,
+                json=[dataclasses.asdict(message) for message in messages],
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            data = response.json()["data"]
+        except (RequestException, ValueError, KeyError) as e:
+            return [
+                ExpoTicket(
+                    device_token=message.to,
+                    ok=False,
+                    message=str(e),
+                    error=type(e).__name__,
+                    request_failed=True,
+                )
+                for message in messages
+            ]
+
+        tickets = []
+        for index, message in enumerate(messages):
+            ticket = data[index] if index < len(data) else {}
+            tickets.append(
+                ExpoTicket(
+                    device_token=message.to,
+                    ok=ticket.get("status") == "ok",
+                    id=ticket.get("id"),
+                    message=ticket.get("message") if ticket else "No ticket returned",
+                    error=ticket.get("details", {}).get("error"),
+                )
+            )
+        return tickets
+
+    def get_receipts(self, ticket_ids: list[str]) -> dict[str, ExpoReceipt]:
+        """
+        Return the receipts of the tickets, by ticket id.  A ticket without receipt
+        (not available yet, or expired) is missing from the result.
+        """
+        receipts: dict[str, ExpoReceipt] = {}
+        for i in range(0, len(ticket_ids), self.receipts_batch_size):
+            response = self.session.post(
+                url=self.receipts_url,
+                json=dict(ids=ticket_ids[i : i + self.receipts_batch_size]),
+                timeout=self.timeout,
+            )
+            response.raise_for_status()
+            for id, receipt in response.json()["data"].items():
+                receipts[id] = ExpoReceipt(
+                    ok=receipt.get("status") == "ok",
+                    message=receipt.get("message"),
+                    error=receipt.get("details", {}).get("error"),
+                )
+        return receipts
 
 
 @dataclass
 class ExpoNotificationPublisher(NotificationPublisher):
+    """
+    If `ticket_repository` is set, the tickets of the notifications accepted by Expo
+    are stored, for their receipts to be checked later (see `ExpoReceiptChecker`).
+
+    If `user_repository` is set, a device that Expo reports as not registered is
+    removed from the user.
+
+    Storing the tickets and removing the devices happen once Expo has accepted the
+    notifications: their errors are only logged, so that the notification is not
+    retried (and sent twice).
+    """
+
     expo_api: ExpoAPI
+    ticket_repository: PushTicketRepository | None = None
+    user_repository: UserRepository | None = None
     null_device_token = "__null__"
 
     def send_notification(
@@ -50,31 +181,32 @@ class ExpoNotificationPublisher(NotificationPublisher):
             title = notification_set.reminder_notification.title
             body = notification_set.reminder_notification.message
 
-        devices = user_notification_info.devices
+        tokens = [
+            device.token
+            for device in user_notification_info.devices
+            if device.token != self.null_device_token
+        ]
+        tickets = self.send_push_notifications(tokens, title=title, body=body)
+        self._store_tickets(user_id, tickets)
         success = False
-        for device in devices:
-            if device.token == self.null_device_token:
-                continue
-            try:
-                self.send_push_notification(
-                    device_token=device.token,
-                    title=title,
-                    body=body,
-                )
-            except HTTPError as e:
+        for ticket in tickets:
+            if not ticket.ok:
                 logging.error(
                     "Error when sending Expo notification",
                     extra=dict(
                         json_fields=dict(
                             user_id=user_id,
                             assignment_id=assignment_id,
-                            device_token=device.token,
+                            device_token=ticket.device_token,
                             notification_title=title,
                             notification_message=body,
-                            error_message=str(e),
+                            error_message=ticket.message,
+                            error_code=ticket.error,
                         )
                     ),
                 )
+                if ticket.error == DEVICE_NOT_REGISTERED:
+                    self._remove_device(user_id, ticket.device_token)
             else:
                 logging.info(
                     "Expo notification sent successfully",
@@ -82,18 +214,65 @@ class ExpoNotificationPublisher(NotificationPublisher):
                         json_fields=dict(
                             user_id=user_id,
                             assignment_id=assignment_id,
-                            device_token=device.token,
+                            device_token=ticket.device_token,
                             notification_title=title,
                             notification_message=body,
+                            ticket_id=ticket.id,
                         )
                     ),
                 )
                 success = True
+        if tickets and all(ticket.request_failed for ticket in tickets):
+            raise ExpoUnavailable(tickets[0].message or "")
         return success
 
-    def send_push_notification(self, device_token: str, title: str, body: str) -> None:
-        self.expo_api.send_notification(
-            device_token=device_token,
-            title=title,
-            body=body,
+    def send_push_notifications(
+        self, device_tokens: list[str], title: str, body: str
+    ) -> list[ExpoTicket]:
+        """Send the same notification to all the devices, in as few requests as possible."""
+        return self.expo_api.send_notifications(
+            [ExpoMessage(to=token, title=title, body=body) for token in device_tokens]
+        )
+
+    def _store_tickets(self, user_id: str, tickets: list[ExpoTicket]) -> None:
+        if self.ticket_repository is None:
+            return
+        now = datetime.now(tz=timezone.utc)
+        try:
+            self.ticket_repository.add_tickets(
+                [
+                    PushTicket(
+                        id=ticket.id,
+                        user_id=user_id,
+                        device_token=ticket.device_token,
+                        created_at=now,
+                    )
+                    for ticket in tickets
+                    if ticket.ok and ticket.id is not None
+                ]
+            )
+        except Exception as e:
+            logging.error(
+                "Error when storing Expo push tickets",
+                extra=dict(json_fields=dict(user_id=user_id, error_message=str(e))),
+            )
+
+    def _remove_device(self, user_id: str, device_token: str) -> None:
+        if self.user_repository is None:
+            return
+        try:
+            self.user_repository.remove_device_registration(user_id, device_token)
+        except Exception as e:
+            logging.error(
+                "Error when removing unregistered Expo device",
+                extra=dict(
+                    json_fields=dict(
+                        user_id=user_id, device_token=device_token, error_message=str(e)
+                    )
+                ),
+            )
+            return
+        logging.info(
+            "Unregistered Expo device removed",
+            extra=dict(json_fields=dict(user_id=user_id, device_token=device_token)),
         )
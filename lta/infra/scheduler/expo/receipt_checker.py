@@ -0,0 +1,89 @@
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from lta.domain.push_ticket_repository import PushTicket, PushTicketRepository
+from lta.domain.user_repository import UserNotFound, UserRepository
+from lta.infra.scheduler.expo.notification_publisher import (
+    DEVICE_NOT_REGISTERED,
+    ExpoAPI,
+)
+
+
+@dataclass
+class ReceiptCheckSummary:
+    checked: int = 0
+    pending: int = 0
+    errors: int = 0
+    removed_devices: int = 0
+
+
+@dataclass
+class ExpoReceiptChecker:
+    """
+    Read the receipts of the stored push tickets, and remove the devices that Expo
+    reports as not registered, so that no notification is sent to them anymore.
+
+    Expo makes receipts available about 15 minutes after the notification, and keeps
+    them for a day: tickets younger than `min_age` are not checked, and tickets older
+    than `max_age` without receipt are dropped.
+    """
+
+    expo_api: ExpoAPI
+    ticket_repository: PushTicketRepository
+    user_repository: UserRepository
+    min_age: timedelta = timedelta(minutes=15)
+    max_age: timedelta = timedelta(hours=24)
+    batch_size: int = 1000
+
+    def check_receipts(self, ref_time: datetime) -> ReceiptCheckSummary:
+        summary = ReceiptCheckSummary()
+        after: PushTicket | None = None
+        while True:
+            tickets = self.ticket_repository.list_tickets(
+                created_before=ref_time - self.min_age,
+                limit=self.batch_size,
+                after=after,
+            )
+            if not tickets:
+                return summary
+            after = tickets[-1]
+
+            receipts = self.expo_api.get_receipts([ticket.id for ticket in tickets])
+            done = []
+            for ticket in tickets:
+                receipt = receipts.get(ticket.id)
+                if receipt is None:
+                    if ticket.created_at < ref_time - self.max_age:
+                        done.append(ticket.id)
+                    else:
+                        summary.pending += 1
+                    continue
+
+                done.append(ticket.id)
+                summary.checked += 1
+                if receipt.ok:
+                    continue
+                summary.errors += 1
+                logging.error(
+                    "Expo push receipt with error",
+                    extra=dict(
+                        json_fields=dict(
+                            user_id=ticket.user_id,
+                            device_token=ticket.device_token,
+                            ticket_id=ticket.id,
+                            error_message=receipt.message,
+                            error_code=receipt.error,
+                        )
+                    ),
+                )
+                if receipt.error == DEVICE_NOT_REGISTERED:
+                    try:
+                        self.user_repository.remove_device_registration(
+                            ticket.user_id, ticket.device_token
+                        )
+                    except UserNotFound:
+                        pass
+                    else:
+                        summary.removed_devices += 1
+            self.ticket_repository.delete_tickets(done)
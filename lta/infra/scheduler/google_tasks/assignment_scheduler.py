@@ -1,17 +1,91 @@
+import hashlib
 from dataclasses import dataclass
 from datetime import datetime
 
-from lta.domain.scheduler.assignment_scheduler import AssignmentScheduler
-from lta.infra.tasks_api import CloudTasksAPI
+from lta.domain.scheduler.assignment_scheduler import (
+    AssignmentBundle,
+    AssignmentRequest,
+    AssignmentScheduler,
+    SchedulingSummary,
+)
+from lta.infra.tasks_api import CloudTasksAPI, TaskSpec
 
 
 @dataclass
 class CloudTasksAssignmentScheduler(AssignmentScheduler):
+    """
+    If `bundle_tasks_api` is set, a bundle is scheduled as one task per chunk of
+    `bundle_size` users, sent to the bundle endpoint, instead of one task per user.
+    """
+
     tasks_api: CloudTasksAPI
+    bundle_tasks_api: CloudTasksAPI | None = None
+    bundle_size: int = 250
 
     def schedule_assignment(self, user_id: str, survey_id: str, when: datetime) -> None:
-        self.tasks_api.create_task(
-            payload=dict(user_id=user_id, survey_id=survey_id),
-            when=when,
-            task_id=CloudTasksAPI.generate_task_id(user_id, survey_id, when),
+        self.tasks_api.create_task_with_retry(
+            self._make_task_spec(AssignmentRequest(user_id, survey_id, when))
+        )
+
+    def schedule_assignments(
+        self, requests: list[AssignmentRequest]
+    ) -> SchedulingSummary:
+        summary = SchedulingSummary()
+        results = self.tasks_api.create_tasks(
+            self._make_task_spec(request) for request in requests
+        )
+        for request, result in zip(requests, results):
+            if result.error is not None:
+                summary.add_error(request, result.error)
+            else:
+                summary.add_success()
+        return summary
+
+    def schedule_assignment_bundles(
+        self, bundles: list[AssignmentBundle]
+    ) -> SchedulingSummary:
+        if self.bundle_tasks_api is None:
+            return super().schedule_assignment_bundles(bundles)
+
+        chunks = [
+            AssignmentBundle(
+                user_ids=bundle.user_ids[i : i + self.bundle_size],
+                survey_id=bundle.survey_id,
+                when=bundle.when,
+            )
+            for bundle in bundles
+            for i in range(0, len(bundle.user_ids), self.bundle_size)
+        ]
+        summary = SchedulingSummary()
+        results = self.bundle_tasks_api.create_tasks(
+            self._make_bundle_task_spec(chunk) for chunk in chunks
+        )
+        for chunk, result in zip(chunks, results):
+            for request in chunk.to_requests():
+                if result.error is not None:
+                    summary.add_error(request, result.error)
+                else:
+                    summary.add_success()
+        return summary
+
+    @staticmethod
+    def _make_task_spec(request: AssignmentRequest) -> TaskSpec:
+        return TaskSpec(
+            payload=dict(user_id=request.user_id, survey_id=request.survey_id),
+            when=request.when,
+            task_id=CloudTasksAPI.generate_task_id(
+                request.user_id, request.survey_id, request.when
+            ),
+        )
+
+    @staticmethod
+    def _make_bundle_task_spec(bundle: AssignmentBundle) -> TaskSpec:
+        # the digest of the user ids keeps the task id deterministic
+        digest = hashlib.sha1(",".join(bundle.user_ids).encode()).hexdigest()[:16]
+        return TaskSpec(
+            payload=dict(user_ids=bundle.user_ids, survey_id=bundle.survey_id),
+            when=bundle.when,
+            task_id=CloudTasksAPI.generate_task_id(
+                bundle.survey_id, bundle.when, "bundle", digest
+            ),
         )
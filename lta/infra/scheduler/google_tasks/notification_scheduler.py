@@ -1,9 +1,17 @@
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from typing import Any
 
 from lta.domain.scheduler.notification_pulisher import NotificationType
-from lta.domain.scheduler.notification_scheduler import NotificationScheduler
-from lta.infra.tasks_api import CloudTasksAPI
+from lta.domain.scheduler.notification_scheduler import (
+    NotificationRequest,
+    NotificationScheduler,
+    NotificationSchedulingFailed,
+    log_notification_scheduling_error,
+)
+from lta.infra.tasks_api import CloudTasksAPI, TaskCreationResult, TaskSpec
+
+EARLIEST = datetime.min.replace(tzinfo=timezone.utc)
 
 
 @dataclass
@@ -28,13 +36,40 @@ class CloudTasksNotificationScheduler(NotificationScheduler):
         user_id: str,
         assignment_id: str,
         when: datetime,
+        reminder_index: int = 0,
     ) -> None:
         self._schedule_notification(
             user_id=user_id,
             assignment_id=assignment_id,
             notification_type=NotificationType.REMINDER,
             when=when,
+            reminder_index=reminder_index,
+        )
+
+    def cancel_reminders(
+        self, user_id: str, assignment_id: str, reminder_count: int
+    ) -> None:
+        """
+        Delete the reminder tasks.  The tasks that already ran (or were never created)
+        are ignored.
+        """
+        for reminder_index in range(reminder_count):
+            self.tasks_api.delete_task(
+                self._make_reminder_task_id(user_id, assignment_id, reminder_index)
+            )
+
+    def schedule_notifications(self, requests: list[NotificationRequest]) -> None:
+        results = self.tasks_api.create_tasks(
+            self._make_task_spec(
+                user_id=request.user_id,
+                assignment_id=request.assignment_id,
+                notification_type=request.notification_type,
+                when=request.when,
+                reminder_index=request.reminder_index,
+            )
+            for request in requests
         )
+        raise_scheduling_errors(requests, results)
 
     def _schedule_notification(
         self,
@@ -42,17 +77,106 @@ class CloudTasksNotificationScheduler(NotificationScheduler):
         assignment_id: str,
         notification_type: NotificationType,
         when: datetime | None,
+        reminder_index: int = 0,
     ) -> None:
-        self.tasks_api.create_task(
-            payload=dict(
+        self.tasks_api.create_task_with_retry(
+            self._make_task_spec(
                 user_id=user_id,
                 assignment_id=assignment_id,
-                notification_type=notification_type.value,
-            ),
+                notification_type=notification_type,
+                when=when,
+                reminder_index=reminder_index,
+            )
+        )
+
+    @classmethod
+    def _make_task_spec(
+        cls,
+        user_id: str,
+        assignment_id: str,
+        notification_type: NotificationType,
+        when: datetime | None,
+        reminder_index: int = 0,
+        next_reminders: list[NotificationRequest] | None = None,
+    ) -> TaskSpec:
+        payload: dict[str, Any] = dict(
+            user_id=user_id,
+            assignment_id=assignment_id,
+            notification_type=notification_type.value,
+        )
+        if next_reminders:
+            payload["next_reminders"] = [
+                dict(
+                    when=request.when.isoformat(),
+                    reminder_index=request.reminder_index,
+                )
+                for request in next_reminders
+                if request.when is not None
+            ]
+        return TaskSpec(
+            payload=payload,
             when=when,
-            task_id=CloudTasksAPI.generate_task_id(
-                user_id,
-                when if when is not None else datetime.now(tz=timezone.utc),
-                "now",
+            task_id=(
+                cls._make_reminder_task_id(user_id, assignment_id, reminder_index)
+                if notification_type == NotificationType.REMINDER
+                else CloudTasksAPI.generate_task_id(
+                    user_id, assignment_id, notification_type.value
+                )
             ),
         )
+
+    @staticmethod
+    def _make_reminder_task_id(
+        user_id: str, assignment_id: str, reminder_index: int
+    ) -> str:
+        return CloudTasksAPI.generate_task_id(
+            user_id, assignment_id, "reminder", reminder_index
+        )
+
+
+def raise_scheduling_errors(
+    requests: list[NotificationRequest], results: list[TaskCreationResult]
+) -> None:
+    errors: list[tuple[NotificationRequest, BaseException]] = []
+    for request, result in zip(requests, results):
+        if result.error is not None:
+            log_notification_scheduling_error(request, result.error)
+            errors.append((request, result.error))
+    if errors:
+        raise NotificationSchedulingFailed(errors)
+
+
+@dataclass
+class ChainedCloudTasksNotificationScheduler(CloudTasksNotificationScheduler):
+    """
+    Create a single task per assignment, for its first notification: the following
+    reminders are passed in the task payload, and the `notify-user` endpoint schedules
+    the next one (see `AssignmentService.continue_notifications`), unless the
+    assignment is submitted or expired by then.
+    """
+
+    def schedule_notifications(self, requests: list[NotificationRequest]) -> None:
+        chains: dict[tuple[str, str], list[NotificationRequest]] = {}
+        for request in requests:
+            chains.setdefault((request.user_id, request.assignment_id), []).append(
+                request
+            )
+        heads = []
+        specs = []
+        for chain in chains.values():
+            # a notification without time is sent right away
+            chain.sort(key=lambda request: request.when or EARLIEST)
+            head, *next_reminders = chain
+            heads.append(head)
+            specs.append(
+                self._make_task_spec(
+                    user_id=head.user_id,
+                    assignment_id=head.assignment_id,
+                    notification_type=head.notification_type,
+                    when=head.when,
+                    reminder_index=head.reminder_index,
+                    next_reminders=next_reminders,
+                )
+            )
+        results = self.tasks_api.create_tasks(specs)
+        raise_scheduling_errors(heads, results)
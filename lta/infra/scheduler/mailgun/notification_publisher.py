@@ -1,8 +1,8 @@
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 import requests
-from requests import HTTPError
+from requests import RequestException
 
 from lta.domain.scheduler.notification_pulisher import (
     NotificationPublisher,
@@ -10,17 +10,22 @@ from lta.domain.scheduler.notification_pulisher import (
 )
 from lta.domain.survey import SurveyNotificationInfo
 from lta.domain.user import UserNotificationInfo
+from lta.infra.http import Timeout
 
 
 @dataclass
 class MailgunAPI:
+    """`session` should be long-lived, so that connections are reused."""
+
     api_key: str
     api_url: str
+    session: requests.Session = field(default_factory=requests.Session)
+    timeout: Timeout = (5.0, 10.0)
 
     def send_email(
         self, recipient_email: str, sender: str, subject: str, body: str
     ) -> None:
-        response = requests.post(
+        response = self.session.post(
             self.api_url,
             auth=("api", self.api_key),
             data={
@@ -29,10 +34,17 @@ class MailgunAPI:
                 "subject": subject,
                 "text": body,
             },
+            timeout=self.timeout,
         )
         response.raise_for_status()
 
 
+def is_rejection(error: RequestException) -> bool:
+    """Whether the request was refused (4xx), rather than Mailgun failing."""
+    response = error.response
+    return response is not None and 400 <= response.status_code < 500
+
+
 @dataclass
 class MailgunNotificationPublisher(NotificationPublisher):
     api: MailgunAPI
@@ -67,7 +79,7 @@ class MailgunNotificationPublisher(NotificationPublisher):
                 subject=notification_title,
                 body=notification_message,
             )
-        except HTTPError as e:
+        except RequestException as e:
             logging.error(
                 "Error when sending Mailgun email",
                 extra=dict(
@@ -81,6 +93,9 @@ class MailgunNotificationPublisher(NotificationPublisher):
                     )
                 ),
             )
+            if not is_rejection(e):
+                # Mailgun is unavailable, rather than refusing this email
+                raise
             return False
         else:
             logging.info(
@@ -0,0 +1,92 @@
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from lta.domain.scheduler.assignment_scheduler import (
+    AssignmentBundle,
+    AssignmentRequest,
+    AssignmentScheduler,
+    SchedulingSummary,
+)
+from lta.infra.scheduler.sqlite.task_queue import QueuedTask, SqliteTaskQueue
+
+SCHEDULE_ASSIGNMENT = "schedule-assignment"
+SCHEDULE_ASSIGNMENT_BUNDLE = "schedule-assignment-bundle"
+
+
+@dataclass
+class SqliteAssignmentScheduler(AssignmentScheduler):
+    """
+    A bundle is stored as one task per chunk of `bundle_size` users, as with
+    `CloudTasksAssignmentScheduler`.
+    """
+
+    task_queue: SqliteTaskQueue
+    bundle_size: int = 250
+
+    def schedule_assignment(self, user_id: str, survey_id: str, when: datetime) -> None:
+        self.task_queue.enqueue(
+            [self._make_task(AssignmentRequest(user_id, survey_id, when))]
+        )
+
+    def schedule_assignments(
+        self, requests: list[AssignmentRequest]
+    ) -> SchedulingSummary:
+        summary = SchedulingSummary()
+        try:
+            self.task_queue.enqueue([self._make_task(request) for request in requests])
+        except Exception as e:
+            for request in requests:
+                summary.add_error(request, e)
+        else:
+            summary.scheduled += len(requests)
+        return summary
+
+    def schedule_assignment_bundles(
+        self, bundles: list[AssignmentBundle]
+    ) -> SchedulingSummary:
+        chunks = [
+            AssignmentBundle(
+                user_ids=bundle.user_ids[i : i + self.bundle_size],
+                survey_id=bundle.survey_id,
+                when=bundle.when,
+            )
+            for bundle in bundles
+            for i in range(0, len(bundle.user_ids), self.bundle_size)
+        ]
+        summary = SchedulingSummary()
+        try:
+            self.task_queue.enqueue([self._make_bundle_task(chunk) for chunk in chunks])
+        except Exception as e:
+            for chunk in chunks:
+                for request in chunk.to_requests():
+                    summary.add_error(request, e)
+        else:
+            summary.scheduled += sum(len(chunk.user_ids) for chunk in chunks)
+        return summary
+
+    @staticmethod
+    def _make_task(request: AssignmentRequest) -> QueuedTask:
+        return QueuedTask(
+            id=(
+                f"{SCHEDULE_ASSIGNMENT}/{request.user_id}/{request.survey_id}/"
+                f"{request.when.isoformat()}"
+            ),
+            kind=SCHEDULE_ASSIGNMENT,
+            payload=dict(user_id=request.user_id, survey_id=request.survey_id),
+            scheduled_at=request.when,
+        )
+
+    @staticmethod
+    def _make_bundle_task(bundle: AssignmentBundle) -> QueuedTask:
+        # the digest of the user ids keeps the task id deterministic
+        digest = hashlib.sha1(",".join(bundle.user_ids).encode()).hexdigest()[:16]
+        return QueuedTask(
+            id=(
+                f"{SCHEDULE_ASSIGNMENT_BUNDLE}/{bundle.survey_id}/"
+                f"{bundle.when.isoformat()}/{digest}"
+            ),
+            kind=SCHEDULE_ASSIGNMENT_BUNDLE,
+            payload=dict(user_ids=bundle.user_ids, survey_id=bundle.survey_id),
+            scheduled_at=bundle.when,
+        )
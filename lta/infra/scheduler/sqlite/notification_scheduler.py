@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from lta.domain.scheduler.notification_pulisher import NotificationType
+from lta.domain.scheduler.notification_scheduler import (
+    NotificationRequest,
+    NotificationScheduler,
+)
+from lta.infra.scheduler.sqlite.task_queue import QueuedTask, SqliteTaskQueue
+
+NOTIFY_USER = "notify-user"
+
+
+@dataclass
+class SqliteNotificationScheduler(NotificationScheduler):
+    task_queue: SqliteTaskQueue
+
+    def schedule_initial_notification(
+        self,
+        user_id: str,
+        assignment_id: str,
+        when: datetime | None = None,
+    ) -> None:
+        self.schedule_notifications(
+            [
+                NotificationRequest(
+                    user_id=user_id,
+                    assignment_id=assignment_id,
+                    notification_type=NotificationType.INITIAL,
+                    when=when,
+                )
+            ]
+        )
+
+    def schedule_reminder_notification(
+        self,
+        user_id: str,
+        assignment_id: str,
+        when: datetime,
+        reminder_index: int = 0,
+    ) -> None:
+        self.schedule_notifications(
+            [
+                NotificationRequest(
+                    user_id=user_id,
+                    assignment_id=assignment_id,
+                    notification_type=NotificationType.REMINDER,
+                    when=when,
+                    reminder_index=reminder_index,
+                )
+            ]
+        )
+
+    def schedule_notifications(self, requests: list[NotificationRequest]) -> None:
+        self.task_queue.enqueue([self._make_task(request) for request in requests])
+
+    def cancel_reminders(
+        self, user_id: str, assignment_id: str, reminder_count: int
+    ) -> None:
+        self.task_queue.delete(
+            [
+                self._make_task_id(user_id, assignment_id, f"reminder-{index}")
+                for index in range(reminder_count)
+            ]
+        )
+
+    @classmethod
+    def _make_task(cls, request: NotificationRequest) -> QueuedTask:
+        if request.notification_type == NotificationType.REMINDER:
+            name = f"reminder-{request.reminder_index}"
+        else:
+            name = request.notification_type.value
+        return QueuedTask(
+            id=cls._make_task_id(request.user_id, request.assignment_id, name),
+            kind=NOTIFY_USER,
+            payload=dict(
+                user_id=request.user_id,
+                assignment_id=request.assignment_id,
+                notification_type=request.notification_type.value,
+            ),
+            scheduled_at=request.when or datetime.now(tz=timezone.utc),
+        )
+
+    @staticmethod
+    def _make_task_id(user_id: str, assignment_id: str, name: str) -> str:
+        return f"{NOTIFY_USER}/{user_id}/{assignment_id}/{name}"
@@ -0,0 +1,50 @@
+from lta.domain.scheduler.assignment_service import AssignmentService
+from lta.domain.scheduler.notification_pulisher import NotificationType
+from lta.domain.scheduler.notification_service import NotificationService
+from lta.infra.scheduler.sqlite.assignment_scheduler import (
+    SCHEDULE_ASSIGNMENT,
+    SCHEDULE_ASSIGNMENT_BUNDLE,
+)
+from lta.infra.scheduler.sqlite.notification_scheduler import NOTIFY_USER
+from lta.infra.scheduler.sqlite.task_queue import QueuedTask, TaskHandler
+
+
+def make_task_handlers(
+    assignment_service: AssignmentService,
+    notification_service: NotificationService,
+) -> dict[str, TaskHandler]:
+    """
+    The handlers of the tasks of the SQLite schedulers: they do what the scheduler
+    endpoints of the same name do.  The assignments are created at the time the task
+    was scheduled for, with the task id as idempotency key: a task run again (e.g.
+    after its lease expired) doesn't create them twice.
+    """
+
+    def schedule_assignment(task: QueuedTask) -> None:
+        assignment_service.create_assignment(
+            user_id=task.payload["user_id"],
+            survey_id=task.payload["survey_id"],
+            ref_time=task.scheduled_at,
+            idempotency_key=task.id,
+        )
+
+    def schedule_assignment_bundle(task: QueuedTask) -> None:
+        assignment_service.create_assignments(
+            user_ids=task.payload["user_ids"],
+            survey_id=task.payload["survey_id"],
+            ref_time=task.scheduled_at,
+            idempotency_key=task.id,
+        )
+
+    def notify_user(task: QueuedTask) -> None:
+        notification_service.notify_user(
+            user_id=task.payload["user_id"],
+            assignment_id=task.payload["assignment_id"],
+            notification_type=NotificationType(task.payload["notification_type"]),
+        )
+
+    return {
+        SCHEDULE_ASSIGNMENT: schedule_assignment,
+        SCHEDULE_ASSIGNMENT_BUNDLE: schedule_assignment_bundle,
+        NOTIFY_USER: notify_user,
+    }
@@ -0,0 +1,250 @@
+import json
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+from lta.infra.sqlite import SqliteConnections
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    scheduled_at REAL NOT NULL,
+    due_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_due_at ON tasks (due_at) WHERE due_at IS NOT NULL;
+"""
+
+
+@dataclass
+class QueuedTask:
+    id: str
+    kind: str
+    payload: dict[str, Any]
+    scheduled_at: datetime
+    attempts: int = 0
+
+
+TaskHandler = Callable[[QueuedTask], None]
+
+
+@dataclass
+class SqliteTaskQueue:
+    """
+    Tasks stored in a SQLite table, ordered by due time.
+
+    `claim` leases the due tasks: their due time is pushed `lease_seconds` later, so
+    that they are claimed again if they are neither completed nor failed by then (e.g.
+    after a crash).  `renew` extends the lease of tasks still waiting or running.  A failed task is retried with an exponential backoff, up to
+    `max_attempts` attempts; then it is kept with no due time, with its last error.
+
+    Task ids are deterministic: enqueuing a task which already exists does nothing.
+    """
+
+    connections: SqliteConnections
+    lease_seconds: float = 60.0
+    max_attempts: int = 5
+    initial_backoff: float = 1.0
+    max_backoff: float = 300.0
+    clock: Callable[[], float] = time.time
+
+    def __post_init__(self) -> None:
+        self.connections.connection().executescript(SCHEMA)
+
+    def enqueue(self, tasks: list[QueuedTask]) -> int:
+        """Return the number of tasks actually added."""
+        with self.connections.transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO tasks (id, kind, payload, scheduled_at, due_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        task.id,
+                        task.kind,
+                        json.dumps(task.payload),
+                        task.scheduled_at.timestamp(),
+                        task.scheduled_at.timestamp(),
+                    )
+                    for task in tasks
+                ],
+            )
+            return connection.total_changes - before
+
+    def delete(self, task_ids: list[str]) -> None:
+        with self.connections.transaction() as connection:
+            connection.executemany(
+                "DELETE FROM tasks WHERE id = ?", [(id,) for id in task_ids]
+            )
+
+    def claim(self, limit: int) -> list[QueuedTask]:
+        now = self.clock()
+        with self.connections.transaction() as connection:
+            rows = connection.execute(
+                "SELECT id, kind, payload, scheduled_at, attempts FROM tasks "
+                "WHERE due_at <= ? ORDER BY due_at LIMIT ?",
+                (now, limit),
+            ).fetchall()
+            connection.executemany(
+                "UPDATE tasks SET due_at = ?, attempts = attempts + 1 WHERE id = ?",
+                [(now + self.lease_seconds, row[0]) for row in rows],
+            )
+        return [
+            QueuedTask(
+                id=id,
+                kind=kind,
+                payload=json.loads(payload),
+                scheduled_at=datetime.fromtimestamp(scheduled_at, tz=timezone.utc),
+                attempts=attempts + 1,
+            )
+            for id, kind, payload, scheduled_at, attempts in rows
+        ]
+
+    def renew(self, tasks: list[QueuedTask]) -> None:
+        due_at = self.clock() + self.lease_seconds
+        with self.connections.transaction() as connection:
+            # only if the task was not claimed again since
+            connection.executemany(
+                "UPDATE tasks SET due_at = ? WHERE id = ? AND attempts = ?",
+                [(due_at, task.id, task.attempts) for task in tasks],
+            )
+
+    def complete(self, task_ids: list[str]) -> None:
+        self.delete(task_ids)
+
+    def fail(self, task: QueuedTask, error: BaseException) -> None:
+        if task.attempts >= self.max_attempts:
+            due_at = None
+        else:
+            backoff = self.initial_backoff * 2 ** (task.attempts - 1)
+            due_at = self.clock() + min(backoff, self.max_backoff)
+        with self.connections.transaction() as connection:
+            # only if the task was not claimed again since
+            connection.execute(
+                "UPDATE tasks SET due_at = ?, last_error = ? "
+                "WHERE id = ? AND attempts = ?",
+                (due_at, str(error) or type(error).__name__, task.id, task.attempts),
+            )
+        if due_at is None:
+            logging.error(
+                "Task abandoned after too many attempts",
+                extra=dict(
+                    json_fields=dict(
+                        task_id=task.id,
+                        kind=task.kind,
+                        attempts=task.attempts,
+                        error_message=str(error),
+                    )
+                ),
+            )
+
+
+@dataclass
+class SqliteTaskDispatcher:
+    """
+    Claim the due tasks in batches of `batch_size`, and run them with their handler
+    (by kind) in a pool of `max_workers` threads.  When no task is due, the queue is
+    polled every `poll_interval` seconds.
+
+    Each task is completed (or failed) as soon as its handler returns, and the lease of
+    the tasks of the batch not done yet is renewed every half lease.
+    """
+
+    queue: SqliteTaskQueue
+    handlers: dict[str, TaskHandler]
+    max_workers: int = 8
+    batch_size: int = 100
+    poll_interval: float = 1.0
+    _stop: threading.Event = field(default_factory=threading.Event, init=False)
+    _thread: threading.Thread | None = field(default=None, init=False)
+    _executor: ThreadPoolExecutor | None = field(default=None, init=False)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="task"
+        )
+        self._thread = threading.Thread(
+            target=self._loop, name="task-dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop claiming tasks, and wait for the running ones.  The other tasks stay in
+        the queue, for the next start.
+        """
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def dispatch_once(self) -> int:
+        """Run a batch of due tasks, and return its size."""
+        tasks = self.queue.claim(self.batch_size)
+        if not tasks:
+            return 0
+        renew_interval = self.queue.lease_seconds / 2
+        if self._executor is None:
+            renewed_at = self.queue.clock()
+            for i, task in enumerate(tasks):
+                if self.queue.clock() - renewed_at >= renew_interval:
+                    self.queue.renew(tasks[i:])
+                    renewed_at = self.queue.clock()
+                self._run(task)
+            return len(tasks)
+        futures = {self._executor.submit(self._run, task): task for task in tasks}
+        while True:
+            _, not_done = wait(futures, timeout=renew_interval)
+            if not not_done:
+                return len(tasks)
+            futures = {future: futures[future] for future in not_done}
+            self.queue.renew(list(futures.values()))
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                dispatched = self.dispatch_once()
+            except Exception as e:
+                logging.error(
+                    "Task dispatch failed",
+                    extra=dict(json_fields=dict(error_message=str(e))),
+                )
+                dispatched = 0
+            if not dispatched:
+                self._stop.wait(self.poll_interval)
+
+    def _run(self, task: QueuedTask) -> None:
+        handler = self.handlers.get(task.kind)
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for task kind: {task.kind}")
+            handler(task)
+        except Exception as e:
+            logging.warning(
+                "Task failed",
+                extra=dict(
+                    json_fields=dict(
+                        task_id=task.id,
+                        kind=task.kind,
+                        attempt=task.attempts,
+                        error_message=str(e),
+                    )
+                ),
+            )
+            self.queue.fail(task, e)
+        else:
+            self.queue.complete([task.id])
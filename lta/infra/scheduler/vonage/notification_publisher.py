@@ -13,6 +13,11 @@ from lta.domain.user import UserNotificationInfo
 
 @dataclass
 class VonageNotificationPublisher(NotificationPublisher):
+    """
+    `client` should be long-lived: it holds the pooled HTTP session used for all the
+    SMS.
+    """
+
     client: vonage.Client
     sender: str
 
@@ -37,8 +42,7 @@ class VonageNotificationPublisher(NotificationPublisher):
             user_id=user_id, assignment_id=assignment_id
         )
 
-        sms = vonage.Sms(self.client)
-        response_data = sms.send_message(
+        response_data = self.client.sms.send_message(
             {
                 "from": self.sender,
                 "to": phone_number,
@@ -79,8 +83,7 @@ class VonageNotificationPublisher(NotificationPublisher):
         phone_number: str,
         message: str,
     ) -> None:
-        sms = vonage.Sms(self.client)
-        response_data = sms.send_message(
+        response_data = self.client.sms.send_message(
             {
                 "from": self.sender,
                 "to": phone_number,
@@ -0,0 +1,68 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Iterator
+
+
+@dataclass
+class SqliteConnections:
+    """
+    One connection per thread to the database at `path`.
+
+    The database is in WAL mode, so that readers don't block the writer.  The
+    connections are in autocommit mode: use `transaction` to group statements.
+    """
+
+    path: str
+    timeout: float = 30.0
+    _local: threading.local = field(default_factory=threading.local, init=False)
+    _all: list[sqlite3.Connection] = field(default_factory=list, init=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False)
+
+    def connection(self) -> sqlite3.Connection:
+        connection: sqlite3.Connection | None = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(
+                self.path,
+                timeout=self.timeout,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self._local.connection = connection
+            with self._lock:
+                self._all.append(connection)
+        return connection
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """
+        Take the write lock right away (`BEGIN IMMEDIATE`), so that a read followed
+        by a write in the transaction can't fail because of another writer.
+        """
+        connection = self.connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def close(self) -> None:
+        with self._lock:
+            connections, self._all = self._all, []
+        for connection in connections:
+            connection.close()
+        self._local = threading.local()
+
+
+def to_timestamp(value: datetime) -> float:
+    """Sortable value of a datetime, for indexed columns; naive datetimes are UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
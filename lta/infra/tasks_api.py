@@ -1,23 +1,182 @@
 import json
+import logging
+import random
 import re
-from dataclasses import dataclass
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Callable, Iterable
 from urllib.parse import urlparse, urlunparse
 
+from google.api_core.exceptions import (
+    AlreadyExists,
+    DeadlineExceeded,
+    NotFound,
+    ResourceExhausted,
+    ServiceUnavailable,
+)
 from google.cloud import tasks_v2
 from google.protobuf import timestamp_pb2
 from pydantic import EmailStr, HttpUrl
 
+RETRYABLE_ERRORS = (ResourceExhausted, ServiceUnavailable, DeadlineExceeded)
+# Errors after which the task may have been created: only retried for named tasks,
+# which Cloud Tasks deduplicates.
+AMBIGUOUS_ERRORS = (DeadlineExceeded,)
+
+
+@dataclass
+class TaskSpec:
+    payload: dict[Any, Any]
+    task_id: str | None = None
+    when: datetime | None = None
+
+
+@dataclass
+class TaskCreationResult:
+    spec: TaskSpec
+    error: BaseException | None = None
+
+
+@dataclass
+class TokenBucket:
+    """
+    A thread-safe token bucket: `acquire()` blocks until a token is available.
+
+    Tokens are refilled at `rate` tokens per second, up to `capacity` tokens.
+    """
+
+    rate: float
+    capacity: float
+    clock: Callable[[], float] = time.monotonic
+    sleep: Callable[[float], None] = time.sleep
+
+    def __post_init__(self) -> None:
+        self._tokens = self.capacity
+        self._last_refill = self.clock()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_rate(
+        cls, rate: float, sleep: Callable[[float], None] = time.sleep
+    ) -> "TokenBucket":
+        """A bucket allowing bursts of one second of tokens."""
+        return cls(rate=rate, capacity=max(1.0, rate), sleep=sleep)
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = self.clock()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._last_refill) * self.rate,
+                )
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self.sleep(wait)
+
 
 @dataclass
 class CloudTasksAPI:
+    """
+    `create_task` sends a single request.  `create_tasks` and `create_task_with_retry` go through
+    a rate limiter (`max_create_rate` tasks per second, if set) and retry with jittered exponential
+    backoff when the quota is exhausted or the service is unavailable.  Since task ids are
+    deterministic, a task that already exists is considered created.  A task without an id
+    is not retried after a deadline error, since it may have been created anyway.
+
+    The APIs creating tasks on the same queue should share a `rate_limiter`, so that the
+    queue as a whole stays under the rate; otherwise one is made from `max_create_rate`.
+    """
+
     client: tasks_v2.CloudTasksClient
     url: HttpUrl
     project_id: str
     location: str
     queue_name: str
     service_account_email: EmailStr
+    max_workers: int = 1
+    max_create_rate: float | None = None
+    rate_limiter: TokenBucket | None = None
+    max_attempts: int = 5
+    initial_backoff: float = 0.5
+    max_backoff: float = 30.0
+    rand: random.Random = field(default_factory=random.Random)
+    sleep: Callable[[float], None] = time.sleep
+
+    def __post_init__(self) -> None:
+        if self.rate_limiter is None and self.max_create_rate is not None:
+            self.rate_limiter = TokenBucket.for_rate(self.max_create_rate, self.sleep)
+
+    def create_tasks(self, specs: Iterable[TaskSpec]) -> list[TaskCreationResult]:
+        """
+        Create all the tasks, with at most `max_workers` requests in flight.
+
+        A failing task doesn't stop the others.  The results are in the order of `specs`.
+        """
+        if self.max_workers <= 1:
+            return [self._create_task_and_catch(spec) for spec in specs]
+
+        # the semaphore bounds the number of pending specs, so that `specs` is consumed
+        # as the tasks are created
+        semaphore = threading.BoundedSemaphore(self.max_workers * 2)
+        futures: list[Future[TaskCreationResult]] = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for spec in specs:
+                semaphore.acquire()
+                future = executor.submit(self._create_task_and_catch, spec)
+                future.add_done_callback(lambda _: semaphore.release())
+                futures.append(future)
+        return [future.result() for future in futures]
+
+    def create_task_with_retry(self, spec: TaskSpec) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            try:
+                self.create_task(
+                    payload=spec.payload, task_id=spec.task_id, when=spec.when
+                )
+            except AlreadyExists:
+                return
+            except RETRYABLE_ERRORS as e:
+                if attempt == self.max_attempts or (
+                    spec.task_id is None and isinstance(e, AMBIGUOUS_ERRORS)
+                ):
+                    raise
+                delay = self._get_backoff_delay(attempt)
+                logging.warning(
+                    "Cloud task creation failed, retrying",
+                    extra=dict(
+                        json_fields=dict(
+                            queue_name=self.queue_name,
+                            task_id=spec.task_id,
+                            attempt=attempt,
+                            delay=delay,
+                            error_message=str(e),
+                        )
+                    ),
+                )
+                self.sleep(delay)
+            else:
+                return
+
+    def _create_task_and_catch(self, spec: TaskSpec) -> TaskCreationResult:
+        try:
+            self.create_task_with_retry(spec)
+        except Exception as e:
+            return TaskCreationResult(spec=spec, error=e)
+        return TaskCreationResult(spec=spec)
+
+    def _get_backoff_delay(self, attempt: int) -> float:
+        """Full jitter: a random delay between 0 and the exponential backoff."""
+        backoff = min(self.max_backoff, self.initial_backoff * 2 ** (attempt - 1))
+        return self.rand.uniform(0, backoff)
 
     def create_task(
         self,
@@ -59,6 +218,18 @@ class CloudTasksAPI:
             )
         )
 
+    def delete_task(self, task_id: str) -> bool:
+        """Return False if there is no such task, e.g. because it already ran."""
+        try:
+            self.client.delete_task(
+                name=self.client.task_path(
+                    self.project_id, self.location, self.queue_name, task_id
+                )
+            )
+        except NotFound:
+            return False
+        return True
+
     @staticmethod
     def generate_task_id(*args: Any) -> str:
         chunks = []
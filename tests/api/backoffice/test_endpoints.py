@@ -4,11 +4,17 @@ from fastapi.testclient import TestClient
 import lta.api.app
 from lta.api.configuration import AppConfiguration, get_configuration
 from lta.authentication import AuthenticatedUser, get_admin_user
-from lta.domain.user_repository import UserRepository
+from lta.domain.group_repository import AsyncGroupRepository, GroupRepository
+from lta.domain.user_repository import AsyncUserRepository, UserRepository
+from lta.infra.repositories.threaded.group_repository import ThreadedGroupRepository
+from lta.infra.repositories.threaded.user_repository import ThreadedUserRepository
 
 
 @pytest.fixture
-def test_client(prefilled_memory_user_repository: UserRepository) -> TestClient:
+def test_client(
+    prefilled_memory_user_repository: UserRepository,
+    prefilled_memory_group_repository: GroupRepository,
+) -> TestClient:
 
     class TestAppConfiguration(AppConfiguration):
 
@@ -16,6 +22,14 @@ def test_client(prefilled_memory_user_repository: UserRepository) -> TestClient:
         def user_repository(self) -> UserRepository:
             return prefilled_memory_user_repository
 
+        @property
+        def async_user_repository(self) -> AsyncUserRepository:
+            return ThreadedUserRepository(prefilled_memory_user_repository)
+
+        @property
+        def async_group_repository(self) -> AsyncGroupRepository:
+            return ThreadedGroupRepository(prefilled_memory_group_repository)
+
     def override_get_configuration() -> TestAppConfiguration:
         return TestAppConfiguration()
 
@@ -72,3 +86,28 @@ def test_get_user(test_client: TestClient) -> None:
             },
         ],
     }
+
+
+def test_list_groups(test_client: TestClient) -> None:
+    response = test_client.get("/api/v1/groups/")
+    assert response.status_code == 200
+    assert response.json() == {
+        "groups": [
+            {
+                "id": "group1",
+                "name": "Group 1",
+                "users": [
+                    {"id": "user1", "email": "user1@idontexist.net"},
+                    {"id": "user2", "email": "user2@idontexist.net"},
+                ],
+            },
+            {
+                "id": "group2",
+                "name": "Group 2",
+                "users": [
+                    {"id": "user2", "email": "user2@idontexist.net"},
+                    {"id": "user3", "email": "user3@idontexist.net"},
+                ],
+            },
+        ]
+    }
@@ -6,13 +6,18 @@ from starlette.testclient import TestClient
 
 import lta.api.app
 from lta.api.configuration import (
+    AppConfiguration,
     get_assignment_service,
+    get_configuration,
     get_notification_service,
     get_scheduler_service,
     get_user_repository,
 )
 from lta.authentication import AuthenticatedUser, get_authenticated_user
-from lta.domain.assignment_repository import AssignmentRepository
+from lta.domain.assignment_repository import (
+    AssignmentRepository,
+    AsyncAssignmentRepository,
+)
 from lta.domain.group_repository import GroupRepository
 from lta.domain.schedule_repository import ScheduleRepository
 from lta.domain.scheduler.assignment_service import AssignmentService
@@ -23,6 +28,9 @@ from lta.domain.user_repository import UserRepository
 from lta.infra.repositories.memory.assignment_repository import (
     InMemoryAssignmentRepository,
 )
+from lta.infra.repositories.threaded.assignment_repository import (
+    ThreadedAssignmentRepository,
+)
 from lta.infra.scheduler.direct.assignment_scheduler import DirectAssignmentScheduler
 from lta.infra.scheduler.direct.notification_scheduler import (
     DirectNotificationScheduler,
@@ -87,6 +95,19 @@ def test_client(
         rand=random.Random(100),
     )
 
+    class TestAppConfiguration(AppConfiguration):
+        @property
+        def async_assignment_repository(self) -> AsyncAssignmentRepository:
+            return ThreadedAssignmentRepository(empty_memory_assignment_repository)
+
+        @property
+        def survey_repository(self) -> SurveyRepository:
+            return prefilled_memory_survey_repository
+
+        @property
+        def assignment_limit_on_app_home_page(self) -> int:
+            return 20
+
     def override_get_scheduler_service() -> SchedulerService:
         return scheduler_service
 
@@ -100,6 +121,7 @@ def test_client(
         return AuthenticatedUser(id="user1", email_address="user1@idontexist.net")
 
     app = lta.api.app.app
+    app.dependency_overrides[get_configuration] = TestAppConfiguration
     app.dependency_overrides[get_scheduler_service] = override_get_scheduler_service
     app.dependency_overrides[get_assignment_service] = override_get_assignment_service
     app.dependency_overrides[get_notification_service] = (
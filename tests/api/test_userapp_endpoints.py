@@ -4,6 +4,9 @@ import pytest
 from starlette.testclient import TestClient
 
 from lta.domain.user import Device, DeviceOS
+from lta.infra.repositories.memory.assignment_repository import (
+    InMemoryAssignmentRepository,
+)
 from lta.infra.repositories.memory.user_repository import InMemoryUserRepository
 from lta.infra.scheduler.recording.notification_publisher import (
     RecordingNotificationPublisher,
@@ -61,3 +64,37 @@ def test_send_test_notification(
     assert response.status_code == 200
     assert android_recording_notification_publisher.recorder == []
     assert ios_recording_notification_publisher.recorder == []
+
+
+def test_get_assignments(
+    test_client: TestClient,
+    empty_memory_assignment_repository: InMemoryAssignmentRepository,
+) -> None:
+    for i, submitted in enumerate([True, False, False]):
+        created_at = datetime(2024, 1, 1, 9 + i, tzinfo=timezone.utc)
+        empty_memory_assignment_repository.create_assignment(
+            user_id="user1",
+            id=f"assignment{i}",
+            survey_id="survey1",
+            survey_title="Survey 1",
+            created_at=created_at,
+        )
+        if submitted:
+            empty_memory_assignment_repository.submit_assignment(
+                "user1", f"assignment{i}", created_at, []
+            )
+
+    response = test_client.get(
+        "/api/mobile/v1/assignments/", params=dict(when="2024-01-01T10:30:00Z")
+    )
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [a["id"] for a in body["assignments"]] == [
+        "assignment2",
+        "assignment1",
+        "assignment0",
+    ]
+    assert body["total_assignments"] == 3
+    assert body["answered_assignments"] == 1
+    assert body["pending_assignment"]["id"] == "assignment1"
@@ -1,8 +1,10 @@
 from tests.fixtures.assignment_repositories import (  # noqa: F401
     always_submitted_assignment_repository,
     empty_assignment_repository,
+    empty_async_assignment_repository,
     empty_firestore_assignment_repository,
     empty_memory_assignment_repository,
+    empty_sqlite_assignment_repository,
     prefilled_memory_assignment_repository,
     sample_assignment_1,
     sample_assignment_2,
@@ -12,17 +14,26 @@ from tests.fixtures.group_repositories import (  # noqa:F401
     empty_firestore_group_repository,
     empty_group_repository,
     empty_memory_group_repository,
+    empty_sqlite_group_repository,
     prefilled_memory_group_repository,
 )
+from tests.fixtures.push_ticket_repositories import (  # noqa:F401
+    empty_firestore_push_ticket_repository,
+    empty_memory_push_ticket_repository,
+    empty_push_ticket_repository,
+    empty_sqlite_push_ticket_repository,
+)
 from tests.fixtures.schedule_repositories import (  # noqa:F401
     empty_firestore_schedule_repository,
     empty_memory_schedule_repository,
     empty_schedule_repository,
+    empty_sqlite_schedule_repository,
     prefilled_memory_schedule_repository,
 )
 from tests.fixtures.survey_repositories import (  # noqa: F401
     empty_firestore_survey_repository,
     empty_memory_survey_repository,
+    empty_sqlite_survey_repository,
     empty_survey_repository,
     prefilled_memory_survey_repository,
     sample_survey_1,
@@ -31,6 +42,7 @@ from tests.fixtures.survey_repositories import (  # noqa: F401
 from tests.fixtures.user_repositories import (  # noqa:F401
     empty_firestore_user_repository,
     empty_memory_user_repository,
+    empty_sqlite_user_repository,
     empty_user_repository,
     prefilled_memory_user_repository,
     sample_user_1,
@@ -1,9 +1,11 @@
 import urllib.request
 from collections import defaultdict
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any, Generator
 
 import pytest
+from google.cloud import firestore
 
 from lta.api.configuration import (
     get_firebase_app,
@@ -11,13 +13,24 @@ from lta.api.configuration import (
     get_project_name,
 )
 from lta.domain.assignment import Assignment, OpenEndedAnswer, SingleChoiceAnswer
-from lta.domain.assignment_repository import AssignmentRepository
+from lta.domain.assignment_repository import (
+    AssignmentRepository,
+    AsyncAssignmentRepository,
+)
 from lta.infra.repositories.firestore.assignment_repository import (
+    AsyncFirestoreAssignmentRepository,
     FirestoreAssignmentRepository,
 )
 from lta.infra.repositories.memory.assignment_repository import (
     InMemoryAssignmentRepository,
 )
+from lta.infra.repositories.sqlite.assignment_repository import (
+    SqliteAssignmentRepository,
+)
+from lta.infra.repositories.threaded.assignment_repository import (
+    ThreadedAssignmentRepository,
+)
+from lta.infra.sqlite import SqliteConnections
 
 
 @pytest.fixture()
@@ -90,18 +103,57 @@ def empty_memory_assignment_repository() -> InMemoryAssignmentRepository:
     return InMemoryAssignmentRepository()
 
 
-@pytest.fixture(params=["memory", "firestore"])
+@pytest.fixture
+def empty_sqlite_assignment_repository(
+    tmp_path: Path,
+) -> Generator[SqliteAssignmentRepository, None, None]:
+    connections = SqliteConnections(str(tmp_path / "lta.sqlite3"))
+    yield SqliteAssignmentRepository(connections)
+    connections.close()
+
+
+@pytest.fixture(params=["memory", "firestore", "sqlite"])
 def empty_assignment_repository(
     request: Any,
     empty_firestore_assignment_repository: FirestoreAssignmentRepository,
     empty_memory_assignment_repository: InMemoryAssignmentRepository,
+    empty_sqlite_assignment_repository: SqliteAssignmentRepository,
 ) -> Generator[AssignmentRepository, None, None]:
     if request.param == "firestore":
         yield empty_firestore_assignment_repository
+    elif request.param == "sqlite":
+        yield empty_sqlite_assignment_repository
     else:
         yield empty_memory_assignment_repository
 
 
+@pytest.fixture(params=["memory", "firestore", "sqlite"])
+def empty_async_assignment_repository(
+    request: Any,
+    empty_firestore_assignment_repository: FirestoreAssignmentRepository,
+    empty_memory_assignment_repository: InMemoryAssignmentRepository,
+    empty_sqlite_assignment_repository: SqliteAssignmentRepository,
+) -> Generator[tuple[AssignmentRepository, AsyncAssignmentRepository], None, None]:
+    """
+    A sync repository (to prepare the data) and an async repository on the same data.
+
+    The Firestore async client is created for each test, because it is bound to the
+    event loop it is first used in.
+    """
+    if request.param == "firestore":
+        yield empty_firestore_assignment_repository, AsyncFirestoreAssignmentRepository(
+            firestore.AsyncClient(project=get_project_name())
+        )
+    elif request.param == "sqlite":
+        yield empty_sqlite_assignment_repository, ThreadedAssignmentRepository(
+            empty_sqlite_assignment_repository
+        )
+    else:
+        yield empty_memory_assignment_repository, ThreadedAssignmentRepository(
+            empty_memory_assignment_repository
+        )
+
+
 class AlwaysSubmittedAssignmentRepository(InMemoryAssignmentRepository):
     """
     Like an InMemoryAssignmentRepository, but when creating an assignment,
@@ -1,4 +1,5 @@
 import urllib.request
+from pathlib import Path
 from typing import Any, Generator
 
 import pytest
@@ -12,6 +13,8 @@ from lta.domain.group import Group
 from lta.domain.group_repository import GroupRepository
 from lta.infra.repositories.firestore.group_repository import FirestoreGroupRepository
 from lta.infra.repositories.memory.group_repository import InMemoryGroupRepository
+from lta.infra.repositories.sqlite.group_repository import SqliteGroupRepository
+from lta.infra.sqlite import SqliteConnections
 
 
 @pytest.fixture()
@@ -50,13 +53,25 @@ def empty_memory_group_repository() -> GroupRepository:
     return InMemoryGroupRepository()
 
 
-@pytest.fixture(params=["memory", "firestore"])
+@pytest.fixture
+def empty_sqlite_group_repository(
+    tmp_path: Path,
+) -> Generator[SqliteGroupRepository, None, None]:
+    connections = SqliteConnections(str(tmp_path / "lta.sqlite3"))
+    yield SqliteGroupRepository(connections)
+    connections.close()
+
+
+@pytest.fixture(params=["memory", "firestore", "sqlite"])
 def empty_group_repository(
     request: Any,
     empty_firestore_group_repository: FirestoreGroupRepository,
     empty_memory_group_repository: InMemoryGroupRepository,
+    empty_sqlite_group_repository: SqliteGroupRepository,
 ) -> Generator[GroupRepository, None, None]:
     if request.param == "firestore":
         yield empty_firestore_group_repository
+    elif request.param == "sqlite":
+        yield empty_sqlite_group_repository
     else:
         yield empty_memory_group_repository
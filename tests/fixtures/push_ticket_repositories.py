@@ -0,0 +1,66 @@
+import urllib.request
+from pathlib import Path
+from typing import Any, Generator
+
+import pytest
+
+from lta.api.configuration import (
+    get_firebase_app,
+    get_firestore_client,
+    get_project_name,
+)
+from lta.domain.push_ticket_repository import PushTicketRepository
+from lta.infra.repositories.firestore.push_ticket_repository import (
+    FirestorePushTicketRepository,
+)
+from lta.infra.repositories.memory.push_ticket_repository import (
+    InMemoryPushTicketRepository,
+)
+from lta.infra.repositories.sqlite.push_ticket_repository import (
+    SqlitePushTicketRepository,
+)
+from lta.infra.sqlite import SqliteConnections
+
+
+@pytest.fixture
+def empty_firestore_push_ticket_repository() -> (
+    Generator[PushTicketRepository, None, None]
+):
+    get_firebase_app()
+    yield FirestorePushTicketRepository(get_firestore_client(use_emulator=True))
+    request = urllib.request.Request(
+        f"http://localhost:8080/emulator/v1/projects/{get_project_name()}/databases/(default)/documents",
+        method="DELETE",
+    )
+    resp = urllib.request.urlopen(request)
+    if resp.status != 200:
+        raise RuntimeError("Failed to delete Firestore emulator data")
+
+
+@pytest.fixture
+def empty_memory_push_ticket_repository() -> PushTicketRepository:
+    return InMemoryPushTicketRepository()
+
+
+@pytest.fixture
+def empty_sqlite_push_ticket_repository(
+    tmp_path: Path,
+) -> Generator[SqlitePushTicketRepository, None, None]:
+    connections = SqliteConnections(str(tmp_path / "lta.sqlite3"))
+    yield SqlitePushTicketRepository(connections)
+    connections.close()
+
+
+@pytest.fixture(params=["memory", "firestore", "sqlite"])
+def empty_push_ticket_repository(
+    request: Any,
+    empty_firestore_push_ticket_repository: FirestorePushTicketRepository,
+    empty_memory_push_ticket_repository: InMemoryPushTicketRepository,
+    empty_sqlite_push_ticket_repository: SqlitePushTicketRepository,
+) -> Generator[PushTicketRepository, None, None]:
+    if request.param == "firestore":
+        yield empty_firestore_push_ticket_repository
+    elif request.param == "sqlite":
+        yield empty_sqlite_push_ticket_repository
+    else:
+        yield empty_memory_push_ticket_repository
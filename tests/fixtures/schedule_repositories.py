@@ -1,5 +1,6 @@
 import urllib.request
 from datetime import time
+from pathlib import Path
 from typing import Any, Generator
 
 import pytest
@@ -15,6 +16,8 @@ from lta.infra.repositories.firestore.schedule_repository import (
     FirestoreScheduleRepository,
 )
 from lta.infra.repositories.memory.schedule_repository import InMemoryScheduleRepository
+from lta.infra.repositories.sqlite.schedule_repository import SqliteScheduleRepository
+from lta.infra.sqlite import SqliteConnections
 
 
 @pytest.fixture()
@@ -71,13 +74,25 @@ def empty_memory_schedule_repository() -> ScheduleRepository:
     return InMemoryScheduleRepository()
 
 
-@pytest.fixture(params=["memory", "firestore"])
+@pytest.fixture
+def empty_sqlite_schedule_repository(
+    tmp_path: Path,
+) -> Generator[SqliteScheduleRepository, None, None]:
+    connections = SqliteConnections(str(tmp_path / "lta.sqlite3"))
+    yield SqliteScheduleRepository(connections)
+    connections.close()
+
+
+@pytest.fixture(params=["memory", "firestore", "sqlite"])
 def empty_schedule_repository(
     request: Any,
     empty_firestore_schedule_repository: FirestoreScheduleRepository,
     empty_memory_schedule_repository: InMemoryScheduleRepository,
+    empty_sqlite_schedule_repository: SqliteScheduleRepository,
 ) -> Generator[ScheduleRepository, None, None]:
     if request.param == "firestore":
         yield empty_firestore_schedule_repository
+    elif request.param == "sqlite":
+        yield empty_sqlite_schedule_repository
     else:
         yield empty_memory_schedule_repository
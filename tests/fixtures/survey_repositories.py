@@ -1,4 +1,5 @@
 import urllib.request
+from pathlib import Path
 from typing import Any, Generator
 
 import pytest
@@ -20,6 +21,8 @@ from lta.domain.survey import (
 from lta.domain.survey_repository import SurveyRepository
 from lta.infra.repositories.firestore.survey_repository import FirestoreSurveyRepository
 from lta.infra.repositories.memory.survey_repository import InMemorySurveyRepository
+from lta.infra.repositories.sqlite.survey_repository import SqliteSurveyRepository
+from lta.infra.sqlite import SqliteConnections
 
 
 @pytest.fixture()
@@ -146,13 +149,25 @@ def empty_memory_survey_repository() -> SurveyRepository:
     return InMemorySurveyRepository()
 
 
-@pytest.fixture(params=["memory", "firestore"])
+@pytest.fixture
+def empty_sqlite_survey_repository(
+    tmp_path: Path,
+) -> Generator[SqliteSurveyRepository, None, None]:
+    connections = SqliteConnections(str(tmp_path / "lta.sqlite3"))
+    yield SqliteSurveyRepository(connections)
+    connections.close()
+
+
+@pytest.fixture(params=["memory", "firestore", "sqlite"])
 def empty_survey_repository(
     request: Any,
     empty_firestore_survey_repository: FirestoreSurveyRepository,
     empty_memory_survey_repository: InMemorySurveyRepository,
+    empty_sqlite_survey_repository: SqliteSurveyRepository,
 ) -> Generator[SurveyRepository, None, None]:
     if request.param == "firestore":
         yield empty_firestore_survey_repository
+    elif request.param == "sqlite":
+        yield empty_sqlite_survey_repository
     else:
         yield empty_memory_survey_repository
@@ -1,5 +1,6 @@
 import urllib.request
 from datetime import datetime, timezone
+from pathlib import Path
 from typing import Any, Generator
 
 import pytest
@@ -13,6 +14,8 @@ from lta.domain.user import Device, DeviceOS, User, UserNotificationInfo
 from lta.domain.user_repository import UserRepository
 from lta.infra.repositories.firestore.user_repository import FirestoreUserRepository
 from lta.infra.repositories.memory.user_repository import InMemoryUserRepository
+from lta.infra.repositories.sqlite.user_repository import SqliteUserRepository
+from lta.infra.sqlite import SqliteConnections
 
 
 @pytest.fixture()
@@ -105,13 +108,25 @@ def empty_memory_user_repository() -> UserRepository:
     return InMemoryUserRepository()
 
 
-@pytest.fixture(params=["memory", "firestore"])
+@pytest.fixture
+def empty_sqlite_user_repository(
+    tmp_path: Path,
+) -> Generator[SqliteUserRepository, None, None]:
+    connections = SqliteConnections(str(tmp_path / "lta.sqlite3"))
+    yield SqliteUserRepository(connections)
+    connections.close()
+
+
+@pytest.fixture(params=["memory", "firestore", "sqlite"])
 def empty_user_repository(
     request: Any,
     empty_firestore_user_repository: FirestoreUserRepository,
     empty_memory_user_repository: InMemoryUserRepository,
+    empty_sqlite_user_repository: SqliteUserRepository,
 ) -> Generator[UserRepository, None, None]:
     if request.param == "firestore":
         yield empty_firestore_user_repository
+    elif request.param == "sqlite":
+        yield empty_sqlite_user_repository
     else:
         yield empty_memory_user_repository
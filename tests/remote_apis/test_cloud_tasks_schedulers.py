@@ -0,0 +1,244 @@
+import json
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+import pytest
+from google.api_core.exceptions import InvalidArgument, NotFound
+from google.cloud import tasks_v2
+from pydantic import HttpUrl
+
+from lta.domain.scheduler.assignment_scheduler import (
+    AssignmentBundle,
+    AssignmentRequest,
+)
+from lta.domain.scheduler.notification_pulisher import NotificationType
+from lta.domain.scheduler.notification_scheduler import (
+    NotificationRequest,
+    NotificationSchedulingFailed,
+)
+from lta.infra.scheduler.google_tasks.assignment_scheduler import (
+    CloudTasksAssignmentScheduler,
+)
+from lta.infra.scheduler.google_tasks.notification_scheduler import (
+    ChainedCloudTasksNotificationScheduler,
+    CloudTasksNotificationScheduler,
+)
+from lta.infra.tasks_api import CloudTasksAPI
+
+
+def make_client() -> MagicMock:
+    client = MagicMock(spec=tasks_v2.CloudTasksClient)
+    client.task_path.side_effect = tasks_v2.CloudTasksClient.task_path
+    client.queue_path.side_effect = tasks_v2.CloudTasksClient.queue_path
+    return client
+
+
+def make_tasks_api(client: MagicMock, path: str) -> CloudTasksAPI:
+    return CloudTasksAPI(
+        client=client,
+        url=HttpUrl(f"https://example.com/{path}"),
+        project_id="dummy-project",
+        location="us-central1",
+        queue_name="dummy-queue",
+        service_account_email="dummy@example.com",
+        max_workers=4,
+    )
+
+
+def test_schedule_assignments__concurrently() -> None:
+    client = make_client()
+
+    def create_task(request: tasks_v2.CreateTaskRequest) -> None:
+        if json.loads(request.task.http_request.body)["user_id"] == "user3":
+            raise InvalidArgument("invalid")  # type:ignore
+
+    client.create_task.side_effect = create_task
+    scheduler = CloudTasksAssignmentScheduler(
+        tasks_api=make_tasks_api(client, "schedule-assignment/")
+    )
+    when = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    requests = [
+        AssignmentRequest(user_id=f"user{i}", survey_id="survey1", when=when)
+        for i in range(10)
+    ]
+
+    summary = scheduler.schedule_assignments(requests)
+
+    assert client.create_task.call_count == 10
+    assert summary.scheduled == 9
+    assert [error.user_id for error in summary.errors] == ["user3"]
+    assert sorted(
+        call.args[0].task.name.rsplit("/", 1)[1]
+        for call in client.create_task.call_args_list
+    ) == sorted(
+        CloudTasksAPI.generate_task_id(f"user{i}", "survey1", when) for i in range(10)
+    )
+
+
+def test_schedule_assignment_bundles() -> None:
+    client = make_client()
+    bundle_client = make_client()
+    scheduler = CloudTasksAssignmentScheduler(
+        tasks_api=make_tasks_api(client, "schedule-assignment/"),
+        bundle_tasks_api=make_tasks_api(bundle_client, "schedule-assignment-bundle/"),
+        bundle_size=4,
+    )
+    when = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    bundle = AssignmentBundle(
+        user_ids=[f"user{i}" for i in range(10)], survey_id="survey1", when=when
+    )
+
+    summary = scheduler.schedule_assignment_bundles([bundle])
+
+    assert summary.scheduled == 10
+    assert summary.errors == []
+    assert client.create_task.call_count == 0
+    requests = [call.args[0] for call in bundle_client.create_task.call_args_list]
+    assert sorted(
+        json.loads(request.task.http_request.body)["user_ids"] for request in requests
+    ) == [
+        ["user0", "user1", "user2", "user3"],
+        ["user4", "user5", "user6", "user7"],
+        ["user8", "user9"],
+    ]
+    assert {request.task.http_request.url for request in requests} == {
+        "https://example.com/schedule-assignment-bundle/"
+    }
+    assert len({request.task.name for request in requests}) == 3
+
+
+def test_cancel_reminders() -> None:
+    client = make_client()
+    scheduler = CloudTasksNotificationScheduler(
+        tasks_api=make_tasks_api(client, "notify-user/")
+    )
+    when = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    scheduler.schedule_notifications(
+        [
+            NotificationRequest(
+                user_id="user1",
+                assignment_id="assignment1",
+                notification_type=NotificationType.REMINDER,
+                when=when,
+                reminder_index=i,
+            )
+            for i in range(2)
+        ]
+    )
+    created = sorted(
+        call.args[0].task.name for call in client.create_task.call_args_list
+    )
+
+    # the second reminder already ran
+    client.delete_task.side_effect = [None, NotFound("gone")]  # type:ignore
+    scheduler.cancel_reminders(
+        user_id="user1", assignment_id="assignment1", reminder_count=2
+    )
+
+    deleted = sorted(call.kwargs["name"] for call in client.delete_task.call_args_list)
+    assert deleted == created
+    assert [name.rsplit("/", 1)[1] for name in deleted] == [
+        "user1-assignment1-reminder-0",
+        "user1-assignment1-reminder-1",
+    ]
+
+
+def test_chained_notifications__one_task_per_assignment() -> None:
+    client = make_client()
+    scheduler = ChainedCloudTasksNotificationScheduler(
+        tasks_api=make_tasks_api(client, "notify-user/")
+    )
+    when = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    requests = []
+    for assignment_id in ["assignment1", "assignment2"]:
+        requests.append(
+            NotificationRequest(
+                user_id="user1",
+                assignment_id=assignment_id,
+                notification_type=NotificationType.INITIAL,
+                when=when,
+            )
+        )
+        requests.extend(
+            NotificationRequest(
+                user_id="user1",
+                assignment_id=assignment_id,
+                notification_type=NotificationType.REMINDER,
+                when=when.replace(hour=10 + i),
+                reminder_index=i,
+            )
+            for i in range(2)
+        )
+
+    scheduler.schedule_notifications(requests)
+
+    assert client.create_task.call_count == 2
+    payloads = sorted(
+        (
+            json.loads(call.args[0].task.http_request.body)
+            for call in client.create_task.call_args_list
+        ),
+        key=lambda payload: payload["assignment_id"],
+    )
+    assert payloads[0] == dict(
+        user_id="user1",
+        assignment_id="assignment1",
+        notification_type="initial",
+        next_reminders=[
+            dict(when="2024-01-01T10:00:00+00:00", reminder_index=0),
+            dict(when="2024-01-01T11:00:00+00:00", reminder_index=1),
+        ],
+    )
+
+
+def test_initial_notifications__one_task_per_assignment() -> None:
+    client = make_client()
+    scheduler = CloudTasksNotificationScheduler(
+        tasks_api=make_tasks_api(client, "notify-user/")
+    )
+    when = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+
+    # two schedules at the same time for the same user
+    scheduler.schedule_notifications(
+        [
+            NotificationRequest(
+                user_id="user1",
+                assignment_id=f"assignment{i}",
+                notification_type=NotificationType.INITIAL,
+                when=when,
+            )
+            for i in range(2)
+        ]
+    )
+
+    assert sorted(
+        call.args[0].task.name.rsplit("/", 1)[1]
+        for call in client.create_task.call_args_list
+    ) == ["user1-assignment0-initial", "user1-assignment1-initial"]
+
+
+def test_schedule_notifications__errors_raised_after_all_requests() -> None:
+    client = make_client()
+
+    def create_task(request: tasks_v2.CreateTaskRequest) -> None:
+        if json.loads(request.task.http_request.body)["user_id"] == "user1":
+            raise InvalidArgument("invalid")  # type:ignore
+
+    client.create_task.side_effect = create_task
+    scheduler = CloudTasksNotificationScheduler(
+        tasks_api=make_tasks_api(client, "notify-user/")
+    )
+    requests = [
+        NotificationRequest(
+            user_id=f"user{i}",
+            assignment_id="assignment1",
+            notification_type=NotificationType.INITIAL,
+        )
+        for i in range(3)
+    ]
+
+    with pytest.raises(NotificationSchedulingFailed) as error:
+        scheduler.schedule_notifications(requests)
+
+    assert [request.user_id for request, _ in error.value.errors] == ["user1"]
+    assert client.create_task.call_count == 3
@@ -0,0 +1,270 @@
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Generator
+
+import pytest
+
+from lta.domain.push_ticket_repository import PushTicket
+from lta.domain.scheduler.notification_pulisher import NotificationType
+from lta.domain.survey import (
+    NotificationMessage,
+    NotificationSet,
+    SurveyNotificationInfo,
+)
+from lta.domain.user import Device, DeviceOS, User, UserNotificationInfo
+from lta.infra.repositories.memory.push_ticket_repository import (
+    InMemoryPushTicketRepository,
+)
+from lta.infra.repositories.memory.user_repository import InMemoryUserRepository
+from lta.infra.scheduler.expo.notification_publisher import (
+    ExpoAPI,
+    ExpoMessage,
+    ExpoNotificationPublisher,
+)
+from lta.infra.scheduler.expo.receipt_checker import (
+    ExpoReceiptChecker,
+    ReceiptCheckSummary,
+)
+
+
+class StubExpoServer(HTTPServer):
+    """
+    Fake Expo push API.
+
+    Tokens containing "unregistered" get a `DeviceNotRegistered` error ticket, and a
+    batch containing a token with "crash" gets a 500 response.
+
+    The receipt of a ticket for a token containing "gone" is a `DeviceNotRegistered`
+    error, and there is no receipt for a token containing "late".
+    """
+
+    batches: list[list[dict[str, Any]]]
+
+
+class StubExpoHandler(BaseHTTPRequestHandler):
+    server: StubExpoServer
+
+    def do_POST(self) -> None:
+        length = int(self.headers["Content-Length"])
+        body = json.loads(self.rfile.read(length))
+        if self.path.endswith("/getReceipts"):
+            self.send_receipts(body["ids"])
+        else:
+            self.send_tickets(body)
+
+    def send_receipts(self, ids: list[str]) -> None:
+        receipts = {
+            id: (
+                dict(
+                    status="error",
+                    message="The device is gone",
+                    details=dict(error="DeviceNotRegistered"),
+                )
+                if "gone" in id
+                else dict(status="ok")
+            )
+            for id in ids
+            if "late" not in id
+        }
+        self.send_json(dict(data=receipts))
+
+    def send_tickets(self, messages: list[dict[str, Any]]) -> None:
+        self.server.batches.append(messages)
+
+        if any("crash" in message["to"] for message in messages):
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        tickets = [
+            (
+                dict(
+                    status="error",
+                    message=f"{message['to']} is not registered",
+                    details=dict(error="DeviceNotRegistered"),
+                )
+                if "unregistered" in message["to"]
+                else dict(status="ok", id=f"ticket-{message['to']}")
+            )
+            for message in messages
+        ]
+        self.send_json(dict(data=tickets))
+
+    def send_json(self, data: dict[str, Any]) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def make_device(token: str) -> Device:
+    return Device(token=token, os=DeviceOS.ANDROID, version=None, connections=[])
+
+
+@pytest.fixture
+def stub_expo_server() -> Generator[StubExpoServer, None, None]:
+    server = StubExpoServer(("127.0.0.1", 0), StubExpoHandler)
+    server.batches = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def stub_expo_api(stub_expo_server: StubExpoServer) -> ExpoAPI:
+    host, port = stub_expo_server.server_address[:2]
+    return ExpoAPI(
+        url=f"http://{host!s}:{port}/push/send",
+        receipts_url=f"http://{host!s}:{port}/push/getReceipts",
+        batch_size=2,
+    )
+
+
+def test_send_notifications__chunks(
+    stub_expo_server: StubExpoServer, stub_expo_api: ExpoAPI
+) -> None:
+    messages = [ExpoMessage(to=f"token{i}", title="T", body="B") for i in range(5)]
+
+    tickets = stub_expo_api.send_notifications(messages)
+
+    assert [len(batch) for batch in stub_expo_server.batches] == [2, 2, 1]
+    assert stub_expo_server.batches[0][0] == dict(to="token0", title="T", body="B")
+    assert [(t.device_token, t.ok, t.id) for t in tickets] == [
+        (f"token{i}", True, f"ticket-token{i}") for i in range(5)
+    ]
+
+
+def test_send_notifications__errors_are_mapped_to_tokens(
+    stub_expo_server: StubExpoServer, stub_expo_api: ExpoAPI
+) -> None:
+    tokens = ["token0", "unregistered1", "crash2", "token3", "token4"]
+
+    tickets = stub_expo_api.send_notifications(
+        [ExpoMessage(to=token, title="T", body="B") for token in tokens]
+    )
+
+    assert len(stub_expo_server.batches) == 3
+    assert [(t.device_token, t.ok, t.error) for t in tickets] == [
+        ("token0", True, None),
+        ("unregistered1", False, "DeviceNotRegistered"),
+        ("crash2", False, "HTTPError"),
+        ("token3", False, "HTTPError"),
+        ("token4", True, None),
+    ]
+
+
+def send_notification(publisher: ExpoNotificationPublisher, user: User) -> bool:
+    message = NotificationMessage(title="Hello", message="Hi")
+    return publisher.send_notification(
+        user_id=user.id,
+        assignment_id="assignment1",
+        user_notification_info=user.notification_info,
+        survey_notification_info=SurveyNotificationInfo(
+            push_notification=NotificationSet(
+                initial_notification=message, reminder_notification=message
+            )
+        ),
+        notification_type=NotificationType.INITIAL,
+    )
+
+
+def make_user(tokens: list[str]) -> User:
+    return User(
+        id="user1",
+        email_address="user1@idontexist.net",
+        created_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        notification_info=UserNotificationInfo(
+            devices=[make_device(token) for token in tokens]
+        ),
+    )
+
+
+def test_publisher__one_request_for_all_devices(
+    stub_expo_server: StubExpoServer, stub_expo_api: ExpoAPI
+) -> None:
+    stub_expo_api.batch_size = 100
+    publisher = ExpoNotificationPublisher(expo_api=stub_expo_api)
+
+    sent = send_notification(
+        publisher, make_user(["unregistered1", "__null__", "token2"])
+    )
+
+    assert sent is True
+    assert [[m["to"] for m in batch] for batch in stub_expo_server.batches] == [
+        ["unregistered1", "token2"]
+    ]
+
+
+def test_receipts__dead_tokens_are_removed(stub_expo_api: ExpoAPI) -> None:
+    user = make_user(["unregistered1", "gone2", "late3", "token4"])
+    user_repository = InMemoryUserRepository({user.id: user})
+    ticket_repository = InMemoryPushTicketRepository()
+    publisher = ExpoNotificationPublisher(
+        expo_api=stub_expo_api,
+        ticket_repository=ticket_repository,
+        user_repository=user_repository,
+    )
+    checker = ExpoReceiptChecker(
+        expo_api=stub_expo_api,
+        ticket_repository=ticket_repository,
+        user_repository=user_repository,
+        batch_size=2,
+    )
+
+    assert send_notification(publisher, user)
+    # the error in the ticket is handled right away
+    assert device_tokens(user_repository) == ["gone2", "late3", "token4"]
+    assert sorted(ticket_repository.tickets) == [
+        "ticket-gone2",
+        "ticket-late3",
+        "ticket-token4",
+    ]
+
+    now = datetime.now(tz=timezone.utc)
+    assert checker.check_receipts(now) == ReceiptCheckSummary()
+
+    summary = checker.check_receipts(now + timedelta(minutes=15))
+    assert summary == ReceiptCheckSummary(
+        checked=2, pending=1, errors=1, removed_devices=1
+    )
+    assert device_tokens(user_repository) == ["late3", "token4"]
+    assert list(ticket_repository.tickets) == ["ticket-late3"]
+
+    checker.check_receipts(now + timedelta(days=2))
+    assert ticket_repository.tickets == {}
+
+
+class BrokenPushTicketRepository(InMemoryPushTicketRepository):
+    def add_tickets(self, tickets: list[PushTicket]) -> None:
+        raise RuntimeError("database unavailable")
+
+
+class BrokenUserRepository(InMemoryUserRepository):
+    def remove_device_registration(self, id: str, token: str) -> None:
+        raise RuntimeError("database unavailable")
+
+
+def test_publisher__storage_errors_after_sending(stub_expo_api: ExpoAPI) -> None:
+    user = make_user(["unregistered1", "token2"])
+    publisher = ExpoNotificationPublisher(
+        expo_api=stub_expo_api,
+        ticket_repository=BrokenPushTicketRepository(),
+        user_repository=BrokenUserRepository({user.id: user}),
+    )
+
+    # the notification is sent: it must not be retried
+    assert send_notification(publisher, user) is True
+
+
+def device_tokens(user_repository: InMemoryUserRepository) -> list[str]:
+    devices = user_repository.get_device_registrations_from_user_id("user1")
+    return [device.token for device in devices]
@@ -0,0 +1,117 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Any, Generator
+
+import pytest
+import requests
+import urllib3
+
+from lta.infra.http import get_max_request_seconds, make_http_retry, make_http_session
+
+
+class StubServer(HTTPServer):
+    """Answer each request with the next status of `statuses`, after `delay` seconds."""
+
+    statuses: list[int]
+    delay: float = 0.0
+    requests: int = 0
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    server: StubServer
+
+    def do_POST(self) -> None:
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.requests += 1
+        time.sleep(self.server.delay)
+        self.send_response(self.server.statuses.pop(0))
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture
+def stub_server() -> Generator[StubServer, None, None]:
+    server = StubServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def stub_url(server: StubServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host!s}:{port}/"
+
+
+def test_make_http_session__retries_too_many_requests(stub_server: StubServer) -> None:
+    stub_server.statuses = [429, 429, 200]
+    session = make_http_session(max_retries=3, backoff_factor=0)
+
+    response = session.post(stub_url(stub_server), data="x")
+
+    assert response.status_code == 200
+    assert stub_server.requests == 3
+
+
+def test_make_http_session__gives_up(stub_server: StubServer) -> None:
+    stub_server.statuses = [429, 429, 429]
+    session = make_http_session(max_retries=2, backoff_factor=0)
+
+    response = session.post(stub_url(stub_server), data="x")
+
+    assert response.status_code == 429
+    assert stub_server.requests == 3
+    with pytest.raises(requests.HTTPError):
+        response.raise_for_status()
+
+
+def test_make_http_session__server_errors_not_retried(stub_server: StubServer) -> None:
+    # the provider may have sent the message before failing
+    stub_server.statuses = [503, 200]
+    session = make_http_session(max_retries=3, backoff_factor=0)
+
+    response = session.post(stub_url(stub_server), data="x")
+
+    assert response.status_code == 503
+    assert stub_server.requests == 1
+
+
+def test_make_http_session__connection_errors_retried() -> None:
+    retry = make_http_retry(max_retries=2)
+    error = urllib3.exceptions.NewConnectionError(None, "refused")  # type: ignore[arg-type]
+
+    retry = retry.increment("POST", "/", error=error)
+    retry = retry.increment("POST", "/", error=error)
+    with pytest.raises(urllib3.exceptions.MaxRetryError):
+        retry.increment("POST", "/", error=error)
+
+
+def test_make_http_session__timeout(stub_server: StubServer) -> None:
+    stub_server.statuses = [200]
+    stub_server.delay = 0.5
+    session = make_http_session(max_retries=0)
+
+    with pytest.raises(requests.RequestException):
+        session.post(stub_url(stub_server), data="x", timeout=(1, 0.1))
+
+
+def test_make_http_session__read_timeouts_not_retried(stub_server: StubServer) -> None:
+    stub_server.statuses = [200, 200]
+    stub_server.delay = 0.5
+    session = make_http_session(max_retries=3)
+
+    with pytest.raises(requests.RequestException):
+        session.post(stub_url(stub_server), data="x", timeout=(1, 0.1))
+    assert stub_server.requests == 1
+
+
+def test_get_max_request_seconds() -> None:
+    # 3 attempts of 3s + 10s, and backoffs of 0s and 1s
+    assert get_max_request_seconds((3, 10), max_retries=2, backoff_factor=0.5) == 40
+    # backoffs of 0s, 1s, 2s and 2s
+    assert get_max_request_seconds((1, 1), max_retries=4, backoff_factor=0.5) == 15
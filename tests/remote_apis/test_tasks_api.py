@@ -3,10 +3,17 @@ from typing import Any
 from unittest.mock import MagicMock
 
 import pytest
+from google.api_core.exceptions import (
+    AlreadyExists,
+    DeadlineExceeded,
+    InvalidArgument,
+    ResourceExhausted,
+    ServiceUnavailable,
+)
 from google.cloud import tasks_v2
 from pydantic import HttpUrl
 
-from lta.infra.tasks_api import CloudTasksAPI
+from lta.infra.tasks_api import CloudTasksAPI, TaskSpec, TokenBucket
 
 
 @pytest.mark.parametrize(
@@ -139,3 +146,110 @@ def test_create_task_without_when(cloud_tasks_api: CloudTasksAPI) -> None:
     args, _ = cloud_tasks_api.client.create_task.call_args  # type:ignore
     create_task_request = args[0]
     assert create_task_request.task.schedule_time is None
+
+
+def test_create_tasks(cloud_tasks_api: CloudTasksAPI) -> None:
+    cloud_tasks_api.max_workers = 4
+    specs = [TaskSpec(payload={"i": i}, task_id=f"task-{i}") for i in range(20)]
+
+    results = cloud_tasks_api.create_tasks(iter(specs))
+
+    assert [result.spec for result in results] == specs
+    assert all(result.error is None for result in results)
+    assert cloud_tasks_api.client.create_task.call_count == 20  # type:ignore
+
+
+def test_create_tasks__retries_and_already_exists(
+    cloud_tasks_api: CloudTasksAPI,
+) -> None:
+    sleeps: list[float] = []
+    cloud_tasks_api.sleep = sleeps.append
+    cloud_tasks_api.client.create_task.side_effect = [  # type:ignore
+        ResourceExhausted("quota"),  # type:ignore
+        ServiceUnavailable("unavailable"),  # type:ignore
+        None,
+        AlreadyExists("exists"),  # type:ignore
+    ]
+
+    results = cloud_tasks_api.create_tasks(
+        [TaskSpec(payload={}, task_id="task-1"), TaskSpec(payload={}, task_id="task-2")]
+    )
+
+    assert [result.error for result in results] == [None, None]
+    assert cloud_tasks_api.client.create_task.call_count == 4  # type:ignore
+    assert len(sleeps) == 2
+    assert 0 <= sleeps[0] <= cloud_tasks_api.initial_backoff
+    assert 0 <= sleeps[1] <= cloud_tasks_api.initial_backoff * 2
+
+
+def test_create_tasks__gives_up(cloud_tasks_api: CloudTasksAPI) -> None:
+    cloud_tasks_api.sleep = lambda _: None
+    quota_error = ResourceExhausted("quota")  # type:ignore
+    side_effect: list[Exception | None] = [quota_error] * cloud_tasks_api.max_attempts
+    side_effect += [InvalidArgument("invalid"), None]  # type:ignore
+    cloud_tasks_api.client.create_task.side_effect = side_effect  # type:ignore
+
+    results = cloud_tasks_api.create_tasks(
+        [TaskSpec(payload={}, task_id=f"task-{i}") for i in range(3)]
+    )
+
+    assert isinstance(results[0].error, ResourceExhausted)
+    assert isinstance(results[1].error, InvalidArgument)
+    assert results[2].error is None
+
+
+def test_create_task_with_retry__deadline_exceeded(
+    cloud_tasks_api: CloudTasksAPI,
+) -> None:
+    cloud_tasks_api.sleep = lambda _: None
+    deadline_error = DeadlineExceeded("deadline")  # type:ignore
+    cloud_tasks_api.client.create_task.side_effect = [  # type:ignore
+        deadline_error,
+        None,
+        deadline_error,
+    ]
+
+    # a named task is deduplicated by Cloud Tasks, so it can be created again
+    cloud_tasks_api.create_task_with_retry(TaskSpec(payload={}, task_id="task-1"))
+    assert cloud_tasks_api.client.create_task.call_count == 2  # type:ignore
+
+    # an unnamed task may have been created, and would be duplicated by a retry
+    with pytest.raises(DeadlineExceeded):
+        cloud_tasks_api.create_task_with_retry(TaskSpec(payload={}))
+    assert cloud_tasks_api.client.create_task.call_count == 3  # type:ignore
+
+
+def test_create_tasks__shared_rate_limiter(cloud_tasks_api: CloudTasksAPI) -> None:
+    rate_limiter = MagicMock(spec=TokenBucket)
+    other_api = CloudTasksAPI(
+        client=cloud_tasks_api.client,
+        url=cloud_tasks_api.url,
+        project_id=cloud_tasks_api.project_id,
+        location=cloud_tasks_api.location,
+        queue_name=cloud_tasks_api.queue_name,
+        service_account_email=cloud_tasks_api.service_account_email,
+        max_create_rate=10,
+        rate_limiter=rate_limiter,
+    )
+    cloud_tasks_api.rate_limiter = rate_limiter
+
+    cloud_tasks_api.create_tasks([TaskSpec(payload={}, task_id="task-1")])
+    other_api.create_tasks([TaskSpec(payload={}, task_id="task-2")])
+
+    assert rate_limiter.acquire.call_count == 2
+
+
+def test_token_bucket() -> None:
+    now = 0.0
+    sleeps: list[float] = []
+
+    def sleep(duration: float) -> None:
+        nonlocal now
+        sleeps.append(duration)
+        now += duration
+
+    bucket = TokenBucket(rate=10, capacity=2, clock=lambda: now, sleep=sleep)
+    for _ in range(4):
+        bucket.acquire()
+
+    assert sleeps == pytest.approx([0.1, 0.1])
@@ -1,15 +1,22 @@
 from datetime import datetime, timedelta, timezone
+from typing import Any
 
 import pytest
 
 from lta.domain.assignment import (
     AnswerType,
     Assignment,
+    AssignmentSummary,
     MultipleChoiceAnswer,
     OpenEndedAnswer,
     SingleChoiceAnswer,
 )
-from lta.domain.assignment_repository import AssignmentNotFound, AssignmentRepository
+from lta.domain.assignment_repository import (
+    AssignmentCreation,
+    AssignmentNotFound,
+    AssignmentRepository,
+)
+from lta.domain.pagination import InvalidCursor, encode_cursor
 
 
 def test_get_assignment(empty_assignment_repository: AssignmentRepository) -> None:
@@ -401,8 +408,13 @@ def test_assignment_is_own_by_user(
         "count_assignments",
         "count_non_answered_assignments",
         "create_assignment",
+        "create_assignments",
+        "get_assignment_stats",
+        "rebuild_assignment_stats",
         "get_assignment",
         "list_assignments",
+        "list_assignment_summaries",
+        "list_assignment_summaries_page",
         "list_pending_assignments",
         "notify_user",
         "open_assignment",
@@ -480,3 +492,182 @@ def test_assignment_is_own_by_user(
         empty_assignment_repository.submit_assignment(
             assignment2.user_id, assignment1.id, ref_time, answers=answers
         )
+
+
+def test_create_assignments(
+    empty_assignment_repository: AssignmentRepository,
+) -> None:
+    created_at = datetime.now(tz=timezone.utc)
+    creations = [
+        AssignmentCreation(
+            user_id=f"user{i % 2}",
+            id=str(i),
+            survey_id="survey1",
+            survey_title="Survey 1",
+            created_at=created_at,
+        )
+        for i in range(5)
+    ]
+    empty_assignment_repository.create_assignments(creations)
+
+    assert empty_assignment_repository.count_assignments("user0") == 3
+    assert empty_assignment_repository.count_assignments("user1") == 2
+    assert empty_assignment_repository.get_assignment("user1", "3") == Assignment(
+        id="3",
+        title="Survey 1",
+        survey_id="survey1",
+        user_id="user1",
+        created_at=created_at,
+        expired_at=created_at + timedelta(hours=1),
+    )
+
+
+def test_create_assignments__existing_assignments_are_kept(
+    empty_assignment_repository: AssignmentRepository,
+) -> None:
+    created_at = datetime.now(tz=timezone.utc)
+    creations = [
+        AssignmentCreation(
+            user_id="user1",
+            id=str(i),
+            survey_id="survey1",
+            survey_title="Survey 1",
+            created_at=created_at,
+        )
+        for i in range(2)
+    ]
+    empty_assignment_repository.create_assignments(creations[:1])
+    empty_assignment_repository.submit_assignment(
+        "user1", "0", created_at + timedelta(minutes=5), answers=[]
+    )
+
+    # e.g. a retry
+    empty_assignment_repository.create_assignments(creations)
+
+    assert empty_assignment_repository.count_assignments("user1") == 2
+    assert empty_assignment_repository.get_assignment("user1", "0").submitted_at
+    stats = empty_assignment_repository.get_assignment_stats("user1", created_at)
+    assert (stats.total, stats.submitted) == (2, 1)
+
+
+def test_get_assignment_stats(
+    empty_assignment_repository: AssignmentRepository,
+) -> None:
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    for i in range(3):
+        empty_assignment_repository.create_assignment(
+            user_id="user1",
+            id=f"assignment{i}",
+            survey_id="survey1",
+            survey_title="Survey 1",
+            created_at=ref_time + timedelta(minutes=30 * i),
+        )
+
+    stats = empty_assignment_repository.get_assignment_stats("user1", ref_time)
+    assert (stats.total, stats.submitted) == (3, 0)
+    assert stats.last_created_at == ref_time + timedelta(minutes=60)
+    assert stats.next_pending_id == "assignment0"
+
+    empty_assignment_repository.submit_assignment(
+        "user1", "assignment0", ref_time + timedelta(minutes=10), []
+    )
+    stats = empty_assignment_repository.get_assignment_stats(
+        "user1", ref_time + timedelta(minutes=10)
+    )
+    assert (stats.total, stats.submitted) == (3, 1)
+    assert stats.next_pending_id == "assignment1"
+    assert stats.next_pending_expired_at == ref_time + timedelta(minutes=90)
+
+    # assignment1 has expired
+    stats = empty_assignment_repository.get_assignment_stats(
+        "user1", ref_time + timedelta(minutes=100)
+    )
+    assert stats.next_pending_id == "assignment2"
+
+    stats = empty_assignment_repository.get_assignment_stats(
+        "user1", ref_time + timedelta(hours=3)
+    )
+    assert stats.next_pending_id is None
+    assert stats.non_answered == 2
+
+    later = ref_time + timedelta(minutes=10)
+    stats = empty_assignment_repository.get_assignment_stats("user1", later)
+    empty_assignment_repository.rebuild_assignment_stats("user1", later)
+    assert empty_assignment_repository.get_assignment_stats("user1", later) == stats
+
+
+def test_list_assignment_summaries(
+    empty_assignment_repository: AssignmentRepository,
+) -> None:
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    for i in range(3):
+        empty_assignment_repository.create_assignment(
+            user_id="user1",
+            id=f"assignment{i}",
+            survey_id="survey1",
+            survey_title=f"Survey {i}",
+            created_at=ref_time + timedelta(minutes=i),
+        )
+    empty_assignment_repository.open_assignment("user1", "assignment1", ref_time)
+    empty_assignment_repository.open_assignment(
+        "user1", "assignment1", ref_time + timedelta(minutes=5)
+    )
+    empty_assignment_repository.submit_assignment(
+        "user1", "assignment1", ref_time + timedelta(minutes=10), []
+    )
+
+    summaries = empty_assignment_repository.list_assignment_summaries("user1", limit=2)
+
+    assert summaries == [
+        AssignmentSummary(
+            id="assignment2",
+            title="Survey 2",
+            created_at=ref_time + timedelta(minutes=2),
+        ),
+        AssignmentSummary(
+            id="assignment1",
+            title="Survey 1",
+            created_at=ref_time + timedelta(minutes=1),
+            submitted_at=ref_time + timedelta(minutes=10),
+            last_opened_at=ref_time + timedelta(minutes=5),
+        ),
+    ]
+    assert [summary.answered for summary in summaries] == [False, True]
+
+
+def test_list_assignment_summaries_page(
+    empty_assignment_repository: AssignmentRepository,
+) -> None:
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    for i in range(5):
+        empty_assignment_repository.create_assignment(
+            user_id="user1",
+            id=f"assignment{i}",
+            survey_id="survey1",
+            survey_title="Survey 1",
+            # Two assignments per creation time: the id breaks the tie.
+            created_at=ref_time + timedelta(minutes=i // 2),
+        )
+
+    ids: list[str] = []
+    cursor = None
+    for _ in range(3):
+        page = empty_assignment_repository.list_assignment_summaries_page(
+            "user1", page_size=2, cursor=cursor
+        )
+        ids.extend(summary.id for summary in page.items)
+        cursor = page.next_cursor
+    assert cursor is None
+    assert ids == [f"assignment{i}" for i in [4, 3, 2, 1, 0]]
+
+    positions: list[dict[str, Any]] = [
+        dict(id="assignment1"),
+        dict(created_at="yesterday", id="assignment1"),
+        dict(created_at=12, id="assignment1"),
+        dict(created_at=ref_time.isoformat(), id=1),
+    ]
+    for position in positions:
+        with pytest.raises(InvalidCursor):
+            empty_assignment_repository.list_assignment_summaries_page(
+                "user1", page_size=2, cursor=encode_cursor(position)
+            )
@@ -0,0 +1,70 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from lta.domain.assignment import SingleChoiceAnswer
+from lta.domain.assignment_repository import (
+    AssignmentNotFound,
+    AssignmentRepository,
+    AsyncAssignmentRepository,
+    SubmissionTooLate,
+)
+
+
+def test_async_assignment_repository(
+    empty_async_assignment_repository: tuple[
+        AssignmentRepository, AsyncAssignmentRepository
+    ],
+) -> None:
+    repository, async_repository = empty_async_assignment_repository
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    for i in range(3):
+        repository.create_assignment(
+            user_id="user1",
+            id=f"assignment{i}",
+            survey_id="survey1",
+            survey_title="Survey 1",
+            created_at=ref_time + timedelta(minutes=i),
+        )
+    repository.create_assignment(
+        user_id="user2",
+        id="assignment3",
+        survey_id="survey1",
+        survey_title="Survey 1",
+        created_at=ref_time,
+    )
+
+    async def run() -> None:
+        assert [
+            assignment.id
+            for assignment in await async_repository.list_assignments("user1", limit=2)
+        ] == ["assignment2", "assignment1"]
+        assert await async_repository.count_assignments("user1") == 3
+
+        await async_repository.submit_assignment(
+            "user1",
+            "assignment0",
+            ref_time + timedelta(minutes=10),
+            [SingleChoiceAnswer(selected_index=1)],
+        )
+        with pytest.raises(SubmissionTooLate):
+            await async_repository.submit_assignment(
+                "user1", "assignment1", ref_time + timedelta(hours=2), []
+            )
+        assert await async_repository.count_non_answered_assignments("user1") == 2
+
+        pending = await async_repository.get_next_pending_assignment("user1", ref_time)
+        assert pending is not None and pending.id == "assignment1"
+        stats = await async_repository.get_assignment_stats("user1", ref_time)
+        assert (stats.total, stats.submitted) == (3, 1)
+        assert stats.next_pending_id == "assignment1"
+
+        await async_repository.open_assignment("user1", "assignment1", ref_time)
+        assignment = await async_repository.get_assignment("user1", "assignment1")
+        assert assignment.opened_at == [ref_time]
+
+        with pytest.raises(AssignmentNotFound):
+            await async_repository.get_assignment("user1", "assignment3")
+
+    asyncio.run(run())
@@ -0,0 +1,109 @@
+from dataclasses import dataclass
+
+import pytest
+
+from lta.domain.survey import Survey
+from lta.domain.survey_repository import SurveyCreation, SurveyNotFound
+from lta.infra.repositories.cache.survey_repository import CachingSurveyRepository
+from lta.infra.repositories.memory.survey_repository import InMemorySurveyRepository
+
+
+@dataclass
+class CountingSurveyRepository(InMemorySurveyRepository):
+    get_survey_calls: int = 0
+
+    def get_survey(self, id: str) -> Survey:
+        self.get_survey_calls += 1
+        return super().get_survey(id)
+
+
+@dataclass
+class FakeClock:
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_survey_creation(title: str) -> SurveyCreation:
+    return SurveyCreation(
+        title=title, welcome_message="Welcome!", submit_message="Thanks!", questions=[]
+    )
+
+
+@pytest.fixture
+def counting_survey_repository() -> CountingSurveyRepository:
+    repository = CountingSurveyRepository()
+    for i in range(3):
+        repository.create_survey(f"survey{i}", make_survey_creation(f"Survey {i}"))
+    return repository
+
+
+def test_get_survey__cached(
+    counting_survey_repository: CountingSurveyRepository,
+) -> None:
+    cache = CachingSurveyRepository(repository=counting_survey_repository)
+
+    assert cache.get_survey("survey1").title == "Survey 1"
+    assert cache.get_survey("survey1").title == "Survey 1"
+
+    assert counting_survey_repository.get_survey_calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_get_survey__not_found_is_not_cached(
+    counting_survey_repository: CountingSurveyRepository,
+) -> None:
+    cache = CachingSurveyRepository(repository=counting_survey_repository)
+
+    with pytest.raises(SurveyNotFound):
+        cache.get_survey("unknown")
+    counting_survey_repository.create_survey("unknown", make_survey_creation("New"))
+
+    assert cache.get_survey("unknown").title == "New"
+
+
+def test_get_survey__ttl(
+    counting_survey_repository: CountingSurveyRepository,
+) -> None:
+    clock = FakeClock()
+    cache = CachingSurveyRepository(
+        repository=counting_survey_repository, ttl_seconds=10, clock=clock
+    )
+
+    cache.get_survey("survey1")
+    clock.now = 9
+    cache.get_survey("survey1")
+    assert counting_survey_repository.get_survey_calls == 1
+
+    clock.now = 10
+    cache.get_survey("survey1")
+    assert counting_survey_repository.get_survey_calls == 2
+
+
+def test_get_survey__least_recently_used_is_evicted(
+    counting_survey_repository: CountingSurveyRepository,
+) -> None:
+    cache = CachingSurveyRepository(repository=counting_survey_repository, max_size=2)
+
+    cache.get_survey("survey0")
+    cache.get_survey("survey1")
+    cache.get_survey("survey0")
+    cache.get_survey("survey2")  # evicts survey1
+    assert counting_survey_repository.get_survey_calls == 3
+
+    cache.get_survey("survey0")
+    assert counting_survey_repository.get_survey_calls == 3
+    cache.get_survey("survey1")
+    assert counting_survey_repository.get_survey_calls == 4
+
+
+def test_create_survey__invalidates(
+    counting_survey_repository: CountingSurveyRepository,
+) -> None:
+    cache = CachingSurveyRepository(repository=counting_survey_repository)
+
+    assert cache.get_survey("survey1").title == "Survey 1"
+    cache.create_survey("survey1", make_survey_creation("Survey 1 bis"))
+
+    assert cache.get_survey("survey1").title == "Survey 1 bis"
@@ -1,12 +1,18 @@
 import json
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 from lta.domain.assignment import (
+    Assignment,
     MultipleChoiceAnswer,
     OpenEndedAnswer,
     SingleChoiceAnswer,
 )
-from lta.infra.repositories.firestore.assignment_repository import StoredAssignment
+from lta.domain.assignment_repository import AssignmentRepository
+from lta.infra.repositories.firestore.assignment_repository import (
+    FirestoreAssignmentRepository,
+    StoredAssignment,
+    StoredAssignmentStats,
+)
 
 
 def test_answer_deserialization_revision_2() -> None:
@@ -62,3 +68,60 @@ def test_answer_deserialization_revision_1() -> None:
         OpenEndedAnswer(value="Sample answer"),
     ]
     assert got_answers == expected_answers
+
+
+def test_stored_assignment_stats() -> None:
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    assignments = [
+        Assignment(
+            id=f"assignment{i}",
+            title="Survey 1",
+            user_id="user1",
+            survey_id="survey1",
+            created_at=ref_time + timedelta(minutes=30 * i),
+            expired_at=ref_time + timedelta(minutes=30 * i + 60),
+            submitted_at=ref_time if i == 0 else None,
+        )
+        for i in range(3)
+    ]
+    stats = StoredAssignmentStats.from_assignments(assignments[:2], ref_time)
+    assert (stats.total, stats.submitted) == (2, 1)
+    assert stats.next_pending_id == "assignment1"
+
+    # Still the oldest pending assignment until it expires...
+    assert stats.is_next_pending_valid(ref_time + timedelta(minutes=89))
+    assert not stats.is_next_pending_valid(ref_time + timedelta(minutes=90))
+    # ...but not before the time it was computed at.
+    assert not stats.is_next_pending_valid(ref_time - timedelta(minutes=1))
+
+    stats.add_assignment(assignments[2])
+    assert stats.total == 3
+    assert stats.last_created_at == assignments[2].created_at
+    assert stats.next_pending_id == "assignment1"
+    assert stats.updated_at == assignments[2].created_at
+
+    stats.set_next_pending(None, ref_time + timedelta(hours=3))
+    assert stats.is_next_pending_valid(ref_time + timedelta(days=1))
+
+
+def test_get_assignment_stats__stores_the_computed_stats(
+    empty_firestore_assignment_repository: AssignmentRepository,
+) -> None:
+    repository = empty_firestore_assignment_repository
+    assert isinstance(repository, FirestoreAssignmentRepository)
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    repository.create_assignment("user1", "assignment1", "survey1", "Survey", ref_time)
+    stats_ref = repository._get_stats_ref("user1")
+    stats_ref.delete()  # e.g. created before the stats existed
+
+    stats = repository.get_assignment_stats("user1", ref_time)
+
+    assert (stats.total, stats.next_pending_id) == (1, "assignment1")
+    stored = StoredAssignmentStats.model_validate(stats_ref.get().to_dict())
+    assert stored.to_domain() == stats
+
+    # the expired next pending assignment is replaced in the document
+    later = ref_time + timedelta(hours=2)
+    assert repository.get_assignment_stats("user1", later).next_pending_id is None
+    stored = StoredAssignmentStats.model_validate(stats_ref.get().to_dict())
+    assert (stored.next_pending_id, stored.updated_at) == (None, later)
@@ -101,3 +101,22 @@ def test_set_users(empty_group_repository: GroupRepository) -> None:
 
     with pytest.raises(GroupNotFound):
         empty_group_repository.set_users("nonexistent_group", ["user1", "user2"])
+
+
+def test_get_groups(empty_group_repository: GroupRepository) -> None:
+    empty_group_repository.create_group(
+        "group1", "Group 1", datetime.now(tz=timezone.utc)
+    )
+    empty_group_repository.create_group(
+        "group2", "Group 2", datetime.now(tz=timezone.utc)
+    )
+    empty_group_repository.set_users("group2", ["user1", "user2"])
+
+    groups = empty_group_repository.get_groups(["group2", "group1", "group2"])
+    assert [group.id for group in groups] == ["group2", "group1"]
+    assert groups[0].user_ids == ["user1", "user2"]
+
+    assert empty_group_repository.get_groups([]) == []
+
+    groups = empty_group_repository.get_groups(["nonexistent_group", "group1"])
+    assert [group.id for group in groups] == ["group1"]
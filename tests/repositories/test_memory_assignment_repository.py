@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+
+from lta.domain.assignment import Assignment
+from lta.infra.repositories.memory.assignment_repository import (
+    InMemoryAssignmentRepository,
+)
+
+START = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+
+
+def make_assignment(id: str, created_at: datetime, expired_at: datetime) -> Assignment:
+    return Assignment(
+        id=id,
+        title="Survey",
+        user_id="user1",
+        survey_id="survey1",
+        created_at=created_at,
+        expired_at=expired_at,
+    )
+
+
+def test_next_pending_assignment__irregular_expirations() -> None:
+    # the first created assignment is the last to expire
+    repository = InMemoryAssignmentRepository(
+        {
+            "user1": {
+                "long": make_assignment("long", START, START + timedelta(hours=10)),
+                "short": make_assignment(
+                    "short",
+                    START + timedelta(hours=1),
+                    START + timedelta(hours=2),
+                ),
+            }
+        }
+    )
+
+    next_pending = repository.get_next_pending_assignment("user1", START)
+    assert next_pending is not None and next_pending.id == "long"
+
+    repository.submit_assignment("user1", "long", START, answers=[])
+
+    next_pending = repository.get_next_pending_assignment("user1", START)
+    assert next_pending is not None and next_pending.id == "short"
+    later = START + timedelta(hours=3)
+    assert repository.get_next_pending_assignment("user1", later) is None
+    assert repository.count_non_answered_assignments("user1") == 1
+    assert repository.get_assignment_stats("user1", later).submitted == 1
+
+
+def test_copy_on_read() -> None:
+    for copy_on_read in [True, False]:
+        repository = InMemoryAssignmentRepository(copy_on_read=copy_on_read)
+        repository.create_assignment("user1", "a1", "survey1", "Survey", START)
+
+        first = repository.get_assignment("user1", "a1")
+        (second,) = repository.list_assignments("user1")
+
+        assert first == second
+        assert (first is second) is not copy_on_read
@@ -0,0 +1,38 @@
+from datetime import datetime, timedelta, timezone
+
+from lta.domain.push_ticket_repository import PushTicket, PushTicketRepository
+
+
+def test_list_tickets(empty_push_ticket_repository: PushTicketRepository) -> None:
+    ref_time = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    tickets = [
+        PushTicket(
+            id=f"ticket{i}",
+            user_id="user1",
+            device_token=f"token{i}",
+            created_at=ref_time + timedelta(minutes=i),
+        )
+        for i in range(5)
+    ]
+    empty_push_ticket_repository.add_tickets(list(reversed(tickets)))
+
+    assert (
+        empty_push_ticket_repository.list_tickets(
+            created_before=ref_time + timedelta(minutes=4), limit=3
+        )
+        == tickets[:3]
+    )
+    assert (
+        empty_push_ticket_repository.list_tickets(
+            created_before=ref_time + timedelta(minutes=4),
+            limit=3,
+            after=tickets[1],
+        )
+        == tickets[2:4]
+    )
+
+    empty_push_ticket_repository.delete_tickets(["ticket0", "ticket3", "unknown"])
+
+    assert empty_push_ticket_repository.list_tickets(
+        created_before=ref_time + timedelta(hours=1), limit=10
+    ) == [tickets[1], tickets[2], tickets[4]]
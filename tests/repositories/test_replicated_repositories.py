@@ -0,0 +1,172 @@
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import pytest
+
+from lta.domain.group import Group
+from lta.domain.group_repository import GroupNotFound
+from lta.domain.schedule import Schedule
+from lta.infra.repositories.firestore.group_repository import parse_stored_group
+from lta.infra.repositories.firestore.schedule_repository import (
+    StoredSchedule,
+    parse_stored_schedule,
+)
+from lta.infra.repositories.memory.group_repository import InMemoryGroupRepository
+from lta.infra.repositories.memory.schedule_repository import InMemoryScheduleRepository
+from lta.infra.repositories.replica.collection import CollectionReplica
+from lta.infra.repositories.replica.group_repository import ReplicatedGroupRepository
+from lta.infra.repositories.replica.schedule_repository import (
+    ReplicatedScheduleRepository,
+)
+
+
+@dataclass
+class FakeDocument:
+    id: str
+    data: dict[str, Any]
+
+    def to_dict(self) -> dict[str, Any]:
+        return self.data
+
+
+@dataclass
+class FakeWatch:
+    is_active: bool = True
+
+    def unsubscribe(self) -> None:
+        self.is_active = False
+
+
+@dataclass
+class FakeCollection:
+    """Collection whose snapshots are pushed by the test."""
+
+    id: str = "fake"
+    callback: Callable[..., None] | None = None
+    watch: FakeWatch = field(default_factory=FakeWatch)
+
+    def on_snapshot(self, callback: Callable[..., None]) -> FakeWatch:
+        self.callback = callback
+        return self.watch
+
+    def push(self, docs: list[FakeDocument]) -> None:
+        assert self.callback is not None
+        self.callback(docs, [], None)
+
+
+def group_documents(groups: list[Group]) -> list[FakeDocument]:
+    return [FakeDocument(group.id, group.model_dump()) for group in groups]
+
+
+@pytest.fixture
+def group_collection() -> FakeCollection:
+    return FakeCollection(id="groups")
+
+
+@pytest.fixture
+def replicated_group_repository(
+    group_collection: FakeCollection,
+    prefilled_memory_group_repository: InMemoryGroupRepository,
+) -> ReplicatedGroupRepository:
+    return ReplicatedGroupRepository(
+        repository=prefilled_memory_group_repository,
+        replica=CollectionReplica(
+            collection=group_collection, parse=parse_stored_group
+        ),
+    )
+
+
+def test_group__reads_from_the_replica(
+    group_collection: FakeCollection,
+    replicated_group_repository: ReplicatedGroupRepository,
+) -> None:
+    replicated_group_repository.replica.start()
+    group_collection.push(
+        group_documents([Group(id="group3", name="Group 3", user_ids=["user1"])])
+    )
+
+    assert replicated_group_repository.replica.wait_ready(timeout=0)
+    assert replicated_group_repository.get_group("group3").name == "Group 3"
+    assert [g.id for g in replicated_group_repository.list_groups()] == ["group3"]
+    assert replicated_group_repository.exists("group3")
+    with pytest.raises(GroupNotFound):
+        replicated_group_repository.get_group("group1")
+    assert [
+        g.id for g in replicated_group_repository.get_groups(["group3", "group1"])
+    ] == ["group3"]
+
+
+def test_group__falls_back_until_ready(
+    group_collection: FakeCollection,
+    replicated_group_repository: ReplicatedGroupRepository,
+) -> None:
+    assert replicated_group_repository.get_group("group1").name == "Group 1"
+
+    replicated_group_repository.replica.start()
+    assert not replicated_group_repository.replica.wait_ready(timeout=0)
+    assert replicated_group_repository.get_group("group1").name == "Group 1"
+
+
+def test_group__falls_back_when_disconnected(
+    group_collection: FakeCollection,
+    replicated_group_repository: ReplicatedGroupRepository,
+) -> None:
+    replicated_group_repository.replica.start()
+    group_collection.push(group_documents([]))
+    assert not replicated_group_repository.exists("group1")
+
+    group_collection.watch.is_active = False
+
+    assert replicated_group_repository.exists("group1")
+    assert len(replicated_group_repository.list_groups()) == 2
+
+
+def test_group__falls_back_on_invalid_document(
+    group_collection: FakeCollection,
+    replicated_group_repository: ReplicatedGroupRepository,
+) -> None:
+    replicated_group_repository.replica.start()
+    group_collection.push(group_documents([]))
+    group_collection.push([FakeDocument("group3", dict(name="No id"))])
+
+    assert not replicated_group_repository.replica.live
+    assert replicated_group_repository.get_group("group1").name == "Group 1"
+
+
+def test_group__writes_go_to_the_repository(
+    group_collection: FakeCollection,
+    replicated_group_repository: ReplicatedGroupRepository,
+    prefilled_memory_group_repository: InMemoryGroupRepository,
+) -> None:
+    replicated_group_repository.replica.start()
+    group_collection.push(group_documents([]))
+
+    replicated_group_repository.set_users("group1", ["user3"])
+
+    assert prefilled_memory_group_repository.get_group("group1").user_ids == ["user3"]
+    assert not replicated_group_repository.exists("group1")
+
+
+def test_schedule__list_active_schedules(
+    prefilled_memory_schedule_repository: InMemoryScheduleRepository,
+) -> None:
+    collection = FakeCollection(id="schedules")
+    repository = ReplicatedScheduleRepository(
+        repository=InMemoryScheduleRepository(),
+        replica=CollectionReplica(collection=collection, parse=parse_stored_schedule),
+    )
+    schedules: list[Schedule] = prefilled_memory_schedule_repository.list_schedules()
+
+    repository.replica.start()
+    collection.push(
+        [
+            FakeDocument(schedule.id, StoredSchedule.from_domain(schedule).model_dump())
+            for schedule in schedules
+        ]
+    )
+
+    assert repository.list_active_schedules() == [s for s in schedules if s.active]
+    assert repository.get_schedule("3") == schedules[2]
+
+    repository.replica.stop()
+    assert repository.list_active_schedules() == []
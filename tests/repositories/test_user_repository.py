@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 
 import pytest
 
+from lta.domain.pagination import InvalidCursor
 from lta.domain.user import Device, DeviceOS, User, UserNotificationInfo
 from lta.domain.user_repository import UserNotFound, UserRepository
 
@@ -249,3 +250,62 @@ def test_exists(empty_user_repository: UserRepository) -> None:
     )
     assert empty_user_repository.exists("user1")
     assert not empty_user_repository.exists("nonexistent_user")
+
+
+def test_list_users_page(empty_user_repository: UserRepository) -> None:
+    for i in [3, 1, 4, 0, 2]:
+        empty_user_repository.create_user(
+            id=f"user{i}",
+            email_address=f"user{i}@example.com",
+            created_at=datetime.now(tz=timezone.utc),
+        )
+
+    page = empty_user_repository.list_users_page(page_size=2)
+    assert [user.id for user in page.items] == ["user0", "user1"]
+    assert page.next_cursor is not None
+
+    page = empty_user_repository.list_users_page(page_size=2, cursor=page.next_cursor)
+    assert [user.id for user in page.items] == ["user2", "user3"]
+    assert page.next_cursor is not None
+
+    page = empty_user_repository.list_users_page(page_size=2, cursor=page.next_cursor)
+    assert [user.id for user in page.items] == ["user4"]
+    assert page.next_cursor is None
+
+    with pytest.raises(InvalidCursor):
+        empty_user_repository.list_users_page(page_size=2, cursor="not a cursor")
+
+
+def test_get_users(empty_user_repository: UserRepository) -> None:
+    for i in range(3):
+        empty_user_repository.create_user(
+            id=f"user{i}",
+            email_address=f"user{i}@example.com",
+            created_at=datetime.now(tz=timezone.utc),
+        )
+
+    users = empty_user_repository.get_users(["user2", "user0", "user2"])
+    assert [user.id for user in users] == ["user2", "user0"]
+    assert users[0].email_address == "user2@example.com"
+
+    assert empty_user_repository.get_users([]) == []
+
+    with pytest.raises(UserNotFound):
+        empty_user_repository.get_users(["user1", "nonexistent_user"])
+
+
+def test_remove_device_registration(empty_user_repository: UserRepository) -> None:
+    ref_time = datetime.now(tz=timezone.utc)
+    empty_user_repository.create_user("user1", "user1@example.com", ref_time)
+    for token in ["token1", "token2"]:
+        empty_user_repository.add_device_registration(
+            "user1", token, DeviceOS.ANDROID, "1", ref_time
+        )
+
+    empty_user_repository.remove_device_registration("user1", "token1")
+    empty_user_repository.remove_device_registration("user1", "unknown")
+
+    devices = empty_user_repository.get_device_registrations_from_user_id("user1")
+    assert [device.token for device in devices] == ["token2"]
+    with pytest.raises(UserNotFound):
+        empty_user_repository.remove_device_registration("unknown", "token1")
@@ -0,0 +1,253 @@
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from lta.domain.scheduler.assignment_service import AssignmentService
+from lta.domain.scheduler.notification_pulisher import NotificationType
+from lta.domain.scheduler.notification_scheduler import (
+    NotificationRequest,
+    NotificationScheduler,
+    NotificationSchedulingFailed,
+)
+from lta.domain.survey_repository import SurveyRepository
+from lta.infra.repositories.memory.assignment_repository import (
+    InMemoryAssignmentRepository,
+)
+
+
+@dataclass
+class RecordingNotificationScheduler(NotificationScheduler):
+    recorder: list[tuple[str, str, NotificationType, datetime | None]] = field(
+        default_factory=list
+    )
+    cancelled: list[tuple[str, str, int]] = field(default_factory=list)
+
+    def schedule_initial_notification(
+        self, user_id: str, assignment_id: str, when: datetime | None = None
+    ) -> None:
+        self.recorder.append((user_id, assignment_id, NotificationType.INITIAL, when))
+
+    def schedule_reminder_notification(
+        self,
+        user_id: str,
+        assignment_id: str,
+        when: datetime,
+        reminder_index: int = 0,
+    ) -> None:
+        self.recorder.append((user_id, assignment_id, NotificationType.REMINDER, when))
+
+    def cancel_reminders(
+        self, user_id: str, assignment_id: str, reminder_count: int
+    ) -> None:
+        self.cancelled.append((user_id, assignment_id, reminder_count))
+
+
+@dataclass
+class BatchRecordingNotificationScheduler(RecordingNotificationScheduler):
+    batches: list[list[NotificationRequest]] = field(default_factory=list)
+
+    def schedule_notifications(self, requests: list[NotificationRequest]) -> None:
+        self.batches.append(requests)
+        super().schedule_notifications(requests)
+
+
+@dataclass
+class FailingNotificationScheduler(RecordingNotificationScheduler):
+    """The first reminder of each assignment fails `failures` times."""
+
+    failures: int = 1
+
+    def schedule_reminder_notification(
+        self,
+        user_id: str,
+        assignment_id: str,
+        when: datetime,
+        reminder_index: int = 0,
+    ) -> None:
+        if reminder_index == 0 and self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("unavailable")
+        super().schedule_reminder_notification(
+            user_id, assignment_id, when, reminder_index
+        )
+
+
+def make_service(
+    notification_scheduler: NotificationScheduler,
+    survey_repository: SurveyRepository,
+) -> AssignmentService:
+    return AssignmentService(
+        notification_scheduler=notification_scheduler,
+        assignment_repository=InMemoryAssignmentRepository(),
+        survey_repository=survey_repository,
+        reminder_notification_delays=[timedelta(minutes=30), timedelta(hours=1)],
+        rand=random.Random(100),
+    )
+
+
+def test_create_assignments__same_as_one_by_one(
+    prefilled_memory_survey_repository: SurveyRepository,
+) -> None:
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    user_ids = ["user1", "user2", "user3"]
+
+    single_scheduler = RecordingNotificationScheduler()
+    single_service = make_service(single_scheduler, prefilled_memory_survey_repository)
+    for user_id in user_ids:
+        single_service.create_assignment(
+            user_id=user_id, survey_id="survey1", ref_time=ref_time
+        )
+
+    bulk_scheduler = BatchRecordingNotificationScheduler()
+    bulk_service = make_service(bulk_scheduler, prefilled_memory_survey_repository)
+    bulk_service.create_assignments(
+        user_ids=user_ids, survey_id="survey1", ref_time=ref_time
+    )
+
+    assert bulk_scheduler.recorder == single_scheduler.recorder
+    assert len(bulk_scheduler.batches) == 1
+    assert len(bulk_scheduler.batches[0]) == 9
+    for user_id in user_ids:
+        assert bulk_service.assignment_repository.list_assignments(
+            user_id
+        ) == single_service.assignment_repository.list_assignments(user_id)
+
+
+def test_create_assignments__retry_with_idempotency_key(
+    prefilled_memory_survey_repository: SurveyRepository,
+) -> None:
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    scheduler = RecordingNotificationScheduler()
+    service = make_service(scheduler, prefilled_memory_survey_repository)
+
+    for attempt in range(2):
+        service.create_assignments(
+            user_ids=["user1", "user2"],
+            survey_id="survey1",
+            ref_time=ref_time + timedelta(seconds=attempt),
+            idempotency_key="task1",
+        )
+
+    for user_id in ["user1", "user2"]:
+        (assignment,) = service.assignment_repository.list_assignments(user_id)
+        assert assignment.created_at == ref_time
+    # scheduled again, under the same assignment ids
+    assert len({assignment_id for _, assignment_id, _, _ in scheduler.recorder}) == 2
+
+
+def test_create_assignment__scheduling_error(
+    prefilled_memory_survey_repository: SurveyRepository,
+) -> None:
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    scheduler = FailingNotificationScheduler()
+    service = make_service(scheduler, prefilled_memory_survey_repository)
+
+    with pytest.raises(NotificationSchedulingFailed) as error:
+        service.create_assignment(
+            user_id="user1",
+            survey_id="survey1",
+            ref_time=ref_time,
+            idempotency_key="task1",
+        )
+    ((request, _),) = error.value.errors
+    assert (request.notification_type, request.reminder_index) == (
+        NotificationType.REMINDER,
+        0,
+    )
+    # the other notifications are scheduled anyway
+    assert [type for _, _, type, _ in scheduler.recorder] == [
+        NotificationType.INITIAL,
+        NotificationType.REMINDER,
+    ]
+
+    # retried, as the task creating the assignment would be
+    service.create_assignment(
+        user_id="user1", survey_id="survey1", ref_time=ref_time, idempotency_key="task1"
+    )
+
+    assert len(service.assignment_repository.list_assignments("user1")) == 1
+    assert len(scheduler.recorder) == 5
+
+
+def test_create_assignments__scheduling_error(
+    prefilled_memory_survey_repository: SurveyRepository,
+) -> None:
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    user_ids = [f"user{i}" for i in range(12)]
+    scheduler = FailingNotificationScheduler(failures=11)
+    service = make_service(scheduler, prefilled_memory_survey_repository)
+
+    with pytest.raises(NotificationSchedulingFailed) as error:
+        service.create_assignments(
+            user_ids=user_ids,
+            survey_id="survey1",
+            ref_time=ref_time,
+            idempotency_key="task1",
+        )
+    assert [request.user_id for request, _ in error.value.errors] == user_ids[:11]
+    assert str(error.value).startswith("11 notifications not scheduled: reminder of")
+    assert str(error.value).endswith(", and 1 more")
+    assert len(scheduler.recorder) == 36 - 11
+
+    service.create_assignments(
+        user_ids=user_ids,
+        survey_id="survey1",
+        ref_time=ref_time,
+        idempotency_key="task1",
+    )
+
+    for user_id in user_ids:
+        assert len(service.assignment_repository.list_assignments(user_id)) == 1
+
+
+def test_cancel_reminders(
+    prefilled_memory_survey_repository: SurveyRepository,
+) -> None:
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    scheduler = RecordingNotificationScheduler()
+    service = make_service(scheduler, prefilled_memory_survey_repository)
+    service.create_assignment(user_id="user1", survey_id="survey1", ref_time=ref_time)
+    (assignment,) = service.assignment_repository.list_assignments("user1")
+
+    service.cancel_reminders(user_id="user1", assignment_id=assignment.id)
+
+    assert scheduler.cancelled == [("user1", assignment.id, 2)]
+
+
+def test_continue_notifications(
+    prefilled_memory_survey_repository: SurveyRepository,
+) -> None:
+    ref_time = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+    scheduler = BatchRecordingNotificationScheduler()
+    service = make_service(scheduler, prefilled_memory_survey_repository)
+    service.create_assignment(
+        user_id="user1",
+        survey_id="survey1",
+        ref_time=ref_time,
+        send_reminder_notifications=False,
+    )
+    (assignment,) = service.assignment_repository.list_assignments("user1")
+    next_reminders = [
+        NotificationRequest(
+            user_id="user1",
+            assignment_id=assignment.id,
+            notification_type=NotificationType.REMINDER,
+            when=when,
+            reminder_index=i,
+        )
+        for i, when in enumerate(
+            [ref_time + timedelta(minutes=30), assignment.expired_at]
+        )
+    ]
+
+    service.continue_notifications(assignment, next_reminders)
+
+    # the reminder at the expiration time is dropped
+    assert scheduler.batches[-1] == next_reminders[:1]
+
+    submitted = assignment.model_copy(update=dict(submitted_at=ref_time))
+    service.continue_notifications(submitted, next_reminders)
+
+    assert len(scheduler.batches) == 2
@@ -0,0 +1,175 @@
+from dataclasses import dataclass, field
+
+import pytest
+
+from lta.domain.assignment import Assignment
+from lta.domain.scheduler.notification_pulisher import NotificationType
+from lta.domain.scheduler.notification_service import NotificationService
+from lta.domain.survey import SurveyNotificationInfo
+from lta.domain.survey_repository import SurveyRepository
+from lta.domain.user import User, UserNotificationInfo
+from lta.domain.user_repository import UserRepository
+from lta.infra.repositories.memory.assignment_repository import (
+    InMemoryAssignmentRepository,
+)
+from lta.infra.scheduler.circuit_breaker.notification_publisher import (
+    CircuitBreakerNotificationPublisher,
+    CircuitOpen,
+    CircuitState,
+)
+from lta.infra.scheduler.recording.notification_publisher import (
+    RecordingNotificationPublisher,
+)
+
+
+@dataclass
+class FakeClock:
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@dataclass
+class ScriptedPublisher(RecordingNotificationPublisher):
+    """Each call takes `latency` seconds on `clock`, and raises if `failing`."""
+
+    clock: FakeClock = field(default_factory=FakeClock)
+    latency: float = 0.1
+    failing: bool = False
+
+    def send_notification(
+        self,
+        user_id: str,
+        assignment_id: str,
+        user_notification_info: UserNotificationInfo,
+        survey_notification_info: SurveyNotificationInfo,
+        notification_type: NotificationType,
+    ) -> bool:
+        self.clock.now += self.latency
+        if self.failing:
+            raise RuntimeError("provider down")
+        return super().send_notification(
+            user_id,
+            assignment_id,
+            user_notification_info,
+            survey_notification_info,
+            notification_type,
+        )
+
+
+def call(breaker: CircuitBreakerNotificationPublisher) -> bool:
+    return breaker.send_notification(
+        "user1",
+        "assignment1",
+        UserNotificationInfo(),
+        SurveyNotificationInfo(),
+        NotificationType.INITIAL,
+    )
+
+
+def state(breaker: CircuitBreakerNotificationPublisher) -> CircuitState:
+    # a function, so that mypy doesn't narrow the state between two calls
+    return breaker.state
+
+
+@pytest.fixture
+def publisher() -> ScriptedPublisher:
+    return ScriptedPublisher()
+
+
+@pytest.fixture
+def breaker(publisher: ScriptedPublisher) -> CircuitBreakerNotificationPublisher:
+    return CircuitBreakerNotificationPublisher(
+        publisher=publisher,
+        window_size=4,
+        min_calls=4,
+        failure_rate_threshold=0.5,
+        cool_down_seconds=30,
+        clock=publisher.clock,
+    )
+
+
+def test_opens_on_failure_rate(
+    breaker: CircuitBreakerNotificationPublisher, publisher: ScriptedPublisher
+) -> None:
+    call(breaker)
+    call(breaker)
+    publisher.failing = True
+    with pytest.raises(RuntimeError):
+        call(breaker)
+    assert state(breaker) == CircuitState.CLOSED
+    with pytest.raises(RuntimeError):
+        call(breaker)
+
+    assert state(breaker) == CircuitState.OPEN
+    publisher.failing = False
+    with pytest.raises(CircuitOpen):
+        call(breaker)
+    assert breaker.short_circuited == 1
+    assert len(publisher.recorder) == 2
+
+
+def test_half_open_trial(
+    breaker: CircuitBreakerNotificationPublisher, publisher: ScriptedPublisher
+) -> None:
+    publisher.failing = True
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            call(breaker)
+    assert state(breaker) == CircuitState.OPEN
+
+    publisher.clock.now += 30
+    with pytest.raises(RuntimeError):
+        call(breaker)
+    assert state(breaker) == CircuitState.OPEN
+    with pytest.raises(CircuitOpen):
+        call(breaker)
+
+    publisher.clock.now += 30
+    publisher.failing = False
+    assert call(breaker) is True
+    assert state(breaker) == CircuitState.CLOSED
+    assert call(breaker) is True
+
+
+def test_slow_calls_are_not_failures(
+    breaker: CircuitBreakerNotificationPublisher, publisher: ScriptedPublisher
+) -> None:
+    # a slow call may still have sent the message
+    publisher.latency = 30.0
+    for _ in range(6):
+        assert call(breaker) is True
+
+    assert state(breaker) == CircuitState.CLOSED
+
+
+def test_other_channels_still_deliver(
+    breaker: CircuitBreakerNotificationPublisher,
+    publisher: ScriptedPublisher,
+    prefilled_memory_user_repository: UserRepository,
+    prefilled_memory_survey_repository: SurveyRepository,
+    prefilled_memory_assignment_repository: InMemoryAssignmentRepository,
+    sample_user_1: User,
+    sample_assignment_1: Assignment,
+) -> None:
+    publisher.failing = True
+    for _ in range(4):
+        with pytest.raises(RuntimeError):
+            call(breaker)
+    notification_service = NotificationService(
+        publishers=[breaker, RecordingNotificationPublisher()],
+        user_repository=prefilled_memory_user_repository,
+        assignment_repository=prefilled_memory_assignment_repository,
+        survey_repository=prefilled_memory_survey_repository,
+    )
+
+    result = notification_service.publish(
+        sample_user_1, sample_assignment_1, NotificationType.INITIAL
+    )
+
+    assert result.sent
+    assert [(channel.publisher, channel.error) for channel in result.channels] == [
+        ("ScriptedPublisher", "circuit open for ScriptedPublisher"),
+        ("RecordingNotificationPublisher", None),
+    ]
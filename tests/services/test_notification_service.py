@@ -1,4 +1,6 @@
 import logging
+import time
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 import pytest
@@ -188,3 +190,94 @@ def test_notify_user__failing_publisher(
         assert caplog.messages == [
             "Notification not sent: no notification channel available"
         ]
+
+
+@dataclass
+class SlowPublisher(NotificationPublisher):
+    delay_seconds: float
+    sent: bool = True
+
+    def send_notification(
+        self,
+        user_id: str,
+        assignment_id: str,
+        user_notification_info: UserNotificationInfo,
+        survey_notification_info: SurveyNotificationInfo,
+        notification_type: NotificationType,
+    ) -> bool:
+        time.sleep(self.delay_seconds)
+        return self.sent
+
+
+class RaisingPublisher(NotificationPublisher):
+    def send_notification(
+        self,
+        user_id: str,
+        assignment_id: str,
+        user_notification_info: UserNotificationInfo,
+        survey_notification_info: SurveyNotificationInfo,
+        notification_type: NotificationType,
+    ) -> bool:
+        raise RuntimeError("gateway down")
+
+
+def test_publish__concurrent(
+    notification_service: NotificationService,
+    sample_user_1: User,
+    sample_assignment_1: Assignment,
+) -> None:
+    notification_service.publishers = [SlowPublisher(0.2), SlowPublisher(0.2, False)]
+
+    start = time.perf_counter()
+    result = notification_service.publish(
+        sample_user_1, sample_assignment_1, NotificationType.INITIAL
+    )
+
+    assert time.perf_counter() - start < 0.35
+    assert result.sent
+    assert [channel.sent for channel in result.channels] == [True, False]
+
+
+def test_publish__timeout(
+    notification_service: NotificationService,
+    sample_user_1: User,
+    sample_assignment_1: Assignment,
+) -> None:
+    notification_service.publisher_timeout_seconds = 0.1
+    notification_service.publishers = [SlowPublisher(0.5), SlowPublisher(0)]
+
+    result = notification_service.publish(
+        sample_user_1, sample_assignment_1, NotificationType.INITIAL
+    )
+
+    assert result.sent
+    assert [(channel.sent, channel.error) for channel in result.channels] == [
+        (False, "timeout"),
+        (True, None),
+    ]
+
+
+def test_publish__failing_publisher(
+    notification_service: NotificationService,
+    recording_notification_publisher: RecordingNotificationPublisher,
+    sample_user_1: User,
+    sample_assignment_1: Assignment,
+) -> None:
+    notification_service.publishers = [
+        RaisingPublisher(),
+        recording_notification_publisher,
+    ]
+
+    result = notification_service.publish(
+        sample_user_1, sample_assignment_1, NotificationType.INITIAL
+    )
+
+    assert result.sent
+    assert result.channels[0].error == "gateway down"
+    assert len(recording_notification_publisher.recorder) == 1
+
+    notification_service.publishers = [RaisingPublisher()]
+    with pytest.raises(RuntimeError):
+        notification_service.publish(
+            sample_user_1, sample_assignment_1, NotificationType.INITIAL
+        )
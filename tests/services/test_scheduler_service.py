@@ -1,21 +1,34 @@
 import random
+from dataclasses import dataclass, field
 from datetime import date, datetime, time, timezone
 
 import pytest
 
+from lta.domain.group import Group
+
 # from lta.domain.group_repository import GroupRepository
-from lta.domain.schedule import Day, TimeRange
+from lta.domain.schedule import Day, Schedule, TimeRange
+from lta.domain.schedule_repository import ScheduleCreation
+from lta.domain.scheduler.assignment_scheduler import (
+    AssignmentBundle,
+    AssignmentScheduler,
+    SchedulingSummary,
+)
 
 # from lta.domain.schedule_repository import ScheduleRepository
 from lta.domain.scheduler.scheduler_service import (
     DatetimeRange,
+    SchedulerService,
     get_dates_from_days,
     get_datetime_ranges_from_dates_and_time_range,
     get_next_monday,
     get_previous_monday,
     get_random_datetime,
+    get_random_datetimes,
     keep_ranges_after_ref_time,
 )
+from lta.infra.repositories.memory.group_repository import InMemoryGroupRepository
+from lta.infra.repositories.memory.schedule_repository import InMemoryScheduleRepository
 
 # from lta.domain.survey_repository import SurveyRepository
 # from lta.domain.user_repository import UserRepository
@@ -269,6 +282,242 @@ def test_get_random_datetime(
     assert expected == result
 
 
+def draw_one_datetime(
+    ref_time: datetime, days: list[Day], time_range: TimeRange, rand: random.Random
+) -> datetime:
+    """The scalar algorithm used before the draws were batched."""
+    dates = get_dates_from_days(ref_time, days)
+    ranges = get_datetime_ranges_from_dates_and_time_range(dates, time_range)
+    ranges = keep_ranges_after_ref_time(ref_time, ranges)
+    range_ = rand.choice(ranges)
+    t = rand.randint(int(range_.start.timestamp()), int(range_.end.timestamp()))
+    return datetime.fromtimestamp(t, tz=range_.start.tzinfo)
+
+
+def test_get_random_datetimes__same_draws_as_scalar_version() -> None:
+    ref_time = datetime(2023, 10, 16, 12, 0, 0, tzinfo=timezone.utc)
+    days = [Day.MONDAY, Day.WEDNESDAY, Day.FRIDAY]
+    time_range = TimeRange(start_time=time(9, 0, 0), end_time=time(17, 0, 0))
+
+    rand = random.Random(100)
+    expected = [draw_one_datetime(ref_time, days, time_range, rand) for _ in range(500)]
+    result = get_random_datetimes(ref_time, days, time_range, 500, random.Random(100))
+
+    assert result == expected
+    assert all(when >= ref_time for when in result)
+    assert {when.weekday() for when in result} == {0, 2, 4}
+
+
+def test_get_random_datetimes__no_valid_range() -> None:
+    ref_time = datetime(2023, 10, 17, 7, 0, 0, tzinfo=timezone.utc)
+    time_range = TimeRange(start_time=time(9, 0, 0), end_time=time(17, 0, 0))
+    rand = random.Random(100)
+
+    assert get_random_datetimes(ref_time, [Day.MONDAY], time_range, 10, rand) == []
+
+
+@dataclass
+class RecordingAssignmentScheduler(AssignmentScheduler):
+    recorder: list[tuple[str, str, datetime]] = field(default_factory=list)
+
+    def schedule_assignment(self, user_id: str, survey_id: str, when: datetime) -> None:
+        self.recorder.append((user_id, survey_id, when))
+
+
+@dataclass
+class CountingGroupRepository(InMemoryGroupRepository):
+    read_count: int = 0
+
+    def get_group(self, id: str) -> Group:
+        self.read_count += 1
+        return super().get_group(id)
+
+    def get_groups(self, ids: list[str]) -> list[Group]:
+        self.read_count += 1
+        return super().get_groups(ids)
+
+
+def test_schedule_assignments__groups_are_read_once(
+    prefilled_memory_group_repository: InMemoryGroupRepository,
+) -> None:
+    group_repository = CountingGroupRepository(
+        groups=prefilled_memory_group_repository.groups
+    )
+    schedule_repository = InMemoryScheduleRepository()
+    for i in range(10):
+        schedule_repository.create_schedule(
+            f"schedule{i}",
+            ScheduleCreation(
+                survey_id="survey1",
+                active=True,
+                days=[Day.MONDAY],
+                time_range=TimeRange(start_time=time(9), end_time=time(10)),
+                user_ids=["user4"],
+                group_ids=["group1", "group2"],
+                same_time_for_all_users=i % 2 == 0,
+            ),
+        )
+    assignment_scheduler = RecordingAssignmentScheduler()
+    service = SchedulerService(
+        assignment_scheduler=assignment_scheduler,
+        schedule_repository=schedule_repository,
+        group_repository=group_repository,
+        rand=random.Random(100),
+    )
+
+    service.schedule_assignments(ref_time=datetime(2023, 10, 16, tzinfo=timezone.utc))
+
+    assert group_repository.read_count == 1
+    assert len(assignment_scheduler.recorder) == 10 * 5
+    assert [user_id for user_id, _, _ in assignment_scheduler.recorder[:5]] == [
+        "user4",
+        "user1",
+        "user2",
+        "user2",
+        "user3",
+    ]
+
+
+def test_schedule_assignments__skips_schedules_with_missing_groups(
+    prefilled_memory_group_repository: InMemoryGroupRepository,
+) -> None:
+    schedule_repository = InMemoryScheduleRepository()
+    for i, group_ids in enumerate([["group1", "deleted_group"], ["group2"]]):
+        schedule_repository.create_schedule(
+            f"schedule{i}",
+            ScheduleCreation(
+                survey_id="survey1",
+                active=True,
+                days=[Day.MONDAY],
+                time_range=TimeRange(start_time=time(9), end_time=time(10)),
+                user_ids=["user4"],
+                group_ids=group_ids,
+                same_time_for_all_users=False,
+            ),
+        )
+    assignment_scheduler = RecordingAssignmentScheduler()
+    service = SchedulerService(
+        assignment_scheduler=assignment_scheduler,
+        schedule_repository=schedule_repository,
+        group_repository=prefilled_memory_group_repository,
+        rand=random.Random(100),
+    )
+
+    summary = service.schedule_assignments(
+        ref_time=datetime(2023, 10, 16, tzinfo=timezone.utc)
+    )
+
+    assert summary.scheduled == 3
+    assert [user_id for user_id, _, _ in assignment_scheduler.recorder] == [
+        "user4",
+        "user2",
+        "user3",
+    ]
+
+
+def test_schedule_assignment__reads_groups_of_schedule(
+    prefilled_memory_group_repository: InMemoryGroupRepository,
+) -> None:
+    assignment_scheduler = RecordingAssignmentScheduler()
+    service = SchedulerService(
+        assignment_scheduler=assignment_scheduler,
+        schedule_repository=InMemoryScheduleRepository(),
+        group_repository=prefilled_memory_group_repository,
+        rand=random.Random(100),
+    )
+    schedule = Schedule(
+        id="schedule1",
+        survey_id="survey1",
+        active=True,
+        days=[Day.MONDAY],
+        time_range=TimeRange(start_time=time(9), end_time=time(10)),
+        group_ids=["group2"],
+        same_time_for_all_users=True,
+    )
+
+    service.schedule_assignment(
+        schedule, ref_time=datetime(2023, 10, 16, tzinfo=timezone.utc)
+    )
+
+    assert [user_id for user_id, _, _ in assignment_scheduler.recorder] == [
+        "user2",
+        "user3",
+    ]
+
+
+@dataclass
+class RecordingBundleAssignmentScheduler(RecordingAssignmentScheduler):
+    bundles: list[AssignmentBundle] = field(default_factory=list)
+
+    def schedule_assignment_bundles(
+        self, bundles: list[AssignmentBundle]
+    ) -> SchedulingSummary:
+        self.bundles.extend(bundles)
+        return SchedulingSummary(
+            scheduled=sum(len(bundle.user_ids) for bundle in bundles)
+        )
+
+
+def test_schedule_assignments__bundles(
+    prefilled_memory_schedule_repository: InMemoryScheduleRepository,
+    prefilled_memory_group_repository: InMemoryGroupRepository,
+) -> None:
+    assignment_scheduler = RecordingBundleAssignmentScheduler()
+    service = SchedulerService(
+        assignment_scheduler=assignment_scheduler,
+        schedule_repository=prefilled_memory_schedule_repository,
+        group_repository=prefilled_memory_group_repository,
+        rand=random.Random(100),
+        bundle_same_time_assignments=True,
+    )
+
+    summary = service.schedule_assignments(
+        ref_time=datetime(2023, 10, 16, tzinfo=timezone.utc)
+    )
+
+    assert summary.scheduled == 3
+    assert [user_id for user_id, _, _ in assignment_scheduler.recorder] == ["user1"]
+    assert len(assignment_scheduler.bundles) == 1
+    assert assignment_scheduler.bundles[0].user_ids == ["user1", "user2"]
+    assert assignment_scheduler.bundles[0].survey_id == "survey1"
+
+
+@dataclass
+class FailingAssignmentScheduler(RecordingAssignmentScheduler):
+    failing_user_id: str = "user2"
+
+    def schedule_assignment(self, user_id: str, survey_id: str, when: datetime) -> None:
+        if user_id == self.failing_user_id:
+            raise RuntimeError("task creation failed")
+        super().schedule_assignment(user_id, survey_id, when)
+
+
+def test_schedule_assignments__errors_are_collected(
+    prefilled_memory_schedule_repository: InMemoryScheduleRepository,
+    prefilled_memory_group_repository: InMemoryGroupRepository,
+) -> None:
+    assignment_scheduler = FailingAssignmentScheduler()
+    service = SchedulerService(
+        assignment_scheduler=assignment_scheduler,
+        schedule_repository=prefilled_memory_schedule_repository,
+        group_repository=prefilled_memory_group_repository,
+        rand=random.Random(100),
+    )
+
+    summary = service.schedule_assignments(
+        ref_time=datetime(2023, 10, 16, tzinfo=timezone.utc)
+    )
+
+    assert summary.scheduled == 2
+    assert [user_id for user_id, _, _ in assignment_scheduler.recorder] == [
+        "user1",
+        "user1",
+    ]
+    assert len(summary.errors) == 1
+    assert summary.errors[0].user_id == "user2"
+    assert summary.errors[0].error_message == "task creation failed"
+
+
 # @pytest.mark.xfail(reason="Need to rework this test")
 # @pytest.mark.parametrize("assignment_is_submitted", [True, False])
 # def test_schedule_assignments_for_date__using_direct_scheduler(
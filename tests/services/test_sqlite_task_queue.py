@@ -0,0 +1,214 @@
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from lta.domain.scheduler.assignment_scheduler import AssignmentBundle
+from lta.domain.scheduler.assignment_service import AssignmentService
+from lta.domain.scheduler.notification_service import NotificationService
+from lta.domain.survey_repository import SurveyRepository
+from lta.domain.user_repository import UserRepository
+from lta.infra.repositories.memory.assignment_repository import (
+    InMemoryAssignmentRepository,
+)
+from lta.infra.scheduler.recording.notification_publisher import (
+    RecordingNotificationPublisher,
+)
+from lta.infra.scheduler.sqlite.assignment_scheduler import SqliteAssignmentScheduler
+from lta.infra.scheduler.sqlite.notification_scheduler import (
+    SqliteNotificationScheduler,
+)
+from lta.infra.scheduler.sqlite.task_handlers import make_task_handlers
+from lta.infra.scheduler.sqlite.task_queue import (
+    QueuedTask,
+    SqliteTaskDispatcher,
+    SqliteTaskQueue,
+)
+from lta.infra.sqlite import SqliteConnections
+
+START = datetime(2024, 1, 1, 9, tzinfo=timezone.utc)
+
+
+@dataclass
+class FakeClock:
+    now: float = START.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_queue(path: Path, clock: FakeClock) -> SqliteTaskQueue:
+    return SqliteTaskQueue(
+        connections=SqliteConnections(str(path / "tasks.sqlite3")),
+        lease_seconds=60,
+        max_attempts=2,
+        clock=clock,
+    )
+
+
+def make_task(id: str, delay: timedelta = timedelta()) -> QueuedTask:
+    return QueuedTask(
+        id=id, kind="test", payload=dict(id=id), scheduled_at=START + delay
+    )
+
+
+def test_claim__due_tasks_with_lease(tmp_path: Path) -> None:
+    clock = FakeClock()
+    queue = make_queue(tmp_path, clock)
+    assert queue.enqueue([make_task("task1"), make_task("task2", timedelta(hours=1))])
+    assert queue.enqueue([make_task("task1")]) == 0
+
+    (task,) = queue.claim(10)
+    assert (task.id, task.payload, task.attempts) == ("task1", dict(id="task1"), 1)
+    assert queue.claim(10) == []
+
+    # not completed before the end of the lease: claimed again, even after a restart
+    clock.now += 61
+    queue = make_queue(tmp_path, clock)
+    (task,) = queue.claim(10)
+    assert (task.id, task.attempts) == ("task1", 2)
+    queue.complete([task.id])
+
+    clock.now += 3600
+    assert [task.id for task in queue.claim(10)] == ["task2"]
+
+
+def test_fail__retried_then_abandoned(tmp_path: Path) -> None:
+    clock = FakeClock()
+    queue = make_queue(tmp_path, clock)
+    queue.enqueue([make_task("task1")])
+
+    (task,) = queue.claim(10)
+    queue.fail(task, RuntimeError("boom"))
+    assert queue.claim(10) == []
+    clock.now += 1
+    (task,) = queue.claim(10)
+    queue.fail(task, RuntimeError("boom"))
+
+    clock.now += 3600
+    assert queue.claim(10) == []
+
+
+def test_dispatcher__runs_the_services(
+    tmp_path: Path,
+    prefilled_memory_user_repository: UserRepository,
+    prefilled_memory_survey_repository: SurveyRepository,
+) -> None:
+    clock = FakeClock()
+    queue = make_queue(tmp_path, clock)
+    assignment_repository = InMemoryAssignmentRepository(
+        expiration_delay=timedelta(hours=24)
+    )
+    publisher = RecordingNotificationPublisher()
+    notification_service = NotificationService(
+        publishers=[publisher],
+        user_repository=prefilled_memory_user_repository,
+        assignment_repository=assignment_repository,
+        survey_repository=prefilled_memory_survey_repository,
+    )
+    assignment_service = AssignmentService(
+        notification_scheduler=SqliteNotificationScheduler(task_queue=queue),
+        assignment_repository=assignment_repository,
+        survey_repository=prefilled_memory_survey_repository,
+        reminder_notification_delays=[timedelta(hours=1), timedelta(hours=2)],
+        rand=random.Random(100),
+    )
+    dispatcher = SqliteTaskDispatcher(
+        queue=queue,
+        handlers=make_task_handlers(assignment_service, notification_service),
+    )
+    summary = SqliteAssignmentScheduler(
+        task_queue=queue, bundle_size=1
+    ).schedule_assignment_bundles(
+        [AssignmentBundle(user_ids=["user1", "user2"], survey_id="survey1", when=START)]
+    )
+    assert summary.scheduled == 2
+
+    assert dispatcher.dispatch_once() == 2
+    assert dispatcher.dispatch_once() == 2  # the initial notifications
+    assert len(publisher.recorder) == 2
+    assert dispatcher.dispatch_once() == 0
+
+    (assignment,) = assignment_repository.list_assignments("user1")
+    assert assignment.created_at == START
+    # as the submission endpoints do
+    assignment_repository.submit_assignment(
+        user_id="user1", id=assignment.id, when=START + timedelta(minutes=5), answers=[]
+    )
+    assignment_service.cancel_reminders(user_id="user1", assignment_id=assignment.id)
+
+    clock.now += 2 * 3600
+    # only the reminders of user2 are left
+    assert dispatcher.dispatch_once() == 2
+    assert len(publisher.recorder) == 4
+
+
+def test_dispatcher__batches(tmp_path: Path) -> None:
+    clock = FakeClock()
+    queue = make_queue(tmp_path, clock)
+    queue.enqueue([make_task(f"task{i}") for i in range(2000)])
+    done: list[str] = []
+    dispatcher = SqliteTaskDispatcher(
+        queue=queue, handlers=dict(test=lambda task: done.append(task.id))
+    )
+
+    batches = 0
+    while dispatcher.dispatch_once():
+        batches += 1
+
+    assert batches == 20
+    assert len(set(done)) == 2000
+
+
+def test_dispatcher__long_batch(tmp_path: Path) -> None:
+    clock = FakeClock()
+    queue = make_queue(tmp_path, clock)
+    queue.enqueue([make_task(f"task{i}") for i in range(3)])
+    left: list[list[str]] = []
+
+    def handler(task: QueuedTask) -> None:
+        # the previous tasks are completed, and the others are still leased
+        rows = queue.connections.connection().execute("SELECT id FROM tasks")
+        left.append(sorted(id for id, in rows))
+        assert queue.claim(10) == []
+        clock.now += 40
+
+    dispatcher = SqliteTaskDispatcher(queue=queue, handlers=dict(test=handler))
+
+    assert dispatcher.dispatch_once() == 3
+    assert left == [["task0", "task1", "task2"], ["task1", "task2"], ["task2"]]
+    assert dispatcher.dispatch_once() == 0
+
+
+def test_dispatcher__renews_the_leases_in_the_pool(tmp_path: Path) -> None:
+    queue = SqliteTaskQueue(
+        connections=SqliteConnections(str(tmp_path / "tasks.sqlite3")),
+        lease_seconds=0.1,
+    )
+    queue.enqueue([make_task(f"task{i}") for i in range(2)])
+    done: list[str] = []
+
+    def handler(task: QueuedTask) -> None:
+        time.sleep(0.15)
+        done.append(task.id)
+
+    # e.g. in two processes
+    dispatchers = [
+        SqliteTaskDispatcher(
+            queue=queue, handlers=dict(test=handler), max_workers=1, poll_interval=0.01
+        )
+        for _ in range(2)
+    ]
+    for dispatcher in dispatchers:
+        dispatcher.start()
+    try:
+        while len(done) < 2:
+            time.sleep(0.05)
+        time.sleep(0.2)
+    finally:
+        for dispatcher in dispatchers:
+            dispatcher.stop()
+
+    # each task ran once, though it took longer than its lease
+    assert sorted(done) == ["task0", "task1"]
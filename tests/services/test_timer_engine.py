@@ -0,0 +1,163 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Generator
+
+import pytest
+
+from lta.domain.scheduler.notification_service import NotificationService
+from lta.domain.survey_repository import SurveyRepository
+from lta.domain.user_repository import UserRepository
+from lta.infra.repositories.memory.assignment_repository import (
+    InMemoryAssignmentRepository,
+)
+from lta.infra.scheduler.direct.notification_scheduler import (
+    DirectNotificationScheduler,
+)
+from lta.infra.scheduler.direct.timer_engine import (
+    Timer,
+    TimerEngine,
+    TimerEngineStopped,
+    TimerQueueFull,
+    TimerStore,
+)
+
+
+def now() -> datetime:
+    return datetime.now(tz=timezone.utc)
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Generator[TimerEngine, None, None]:
+    engine = TimerEngine(
+        max_workers=2, max_pending=3, store=TimerStore(tmp_path / "timers.json")
+    )
+    engine.start()
+    yield engine
+    engine.stop()
+
+
+def record(engine: TimerEngine, done: threading.Event | None = None) -> list[str]:
+    """Register a `record` handler, which appends the timer keys to the list."""
+    fired: list[str] = []
+
+    def handler(timer: Timer) -> None:
+        fired.append(timer.key)
+        if done is not None and timer.payload.get("last"):
+            done.set()
+
+    engine.handlers["record"] = handler
+    return fired
+
+
+def test_timers_fire_in_order(engine: TimerEngine) -> None:
+    done = threading.Event()
+    fired = record(engine, done)
+    start = now()
+    engine.schedule("second", start + timedelta(milliseconds=100), "record", {})
+    engine.schedule("first", start + timedelta(milliseconds=50), "record", {})
+    engine.schedule("cancelled", start + timedelta(milliseconds=70), "record", {})
+    engine.cancel("cancelled")
+    engine.schedule(
+        "last", start + timedelta(milliseconds=150), "record", dict(last=True)
+    )
+
+    assert done.wait(timeout=5)
+    assert fired == ["first", "second", "last"]
+    assert now() - start >= timedelta(milliseconds=150)
+    stats = engine.stats
+    assert stats.fired == 3
+    assert stats.pending == 0
+    assert 0 <= stats.mean_lag_seconds <= stats.max_lag_seconds
+
+
+def test_bounded_queue(engine: TimerEngine) -> None:
+    record(engine)
+    later = now() + timedelta(hours=1)
+    for i in range(3):
+        engine.schedule(f"timer{i}", later, "record", {})
+    # replacing a pending timer is allowed
+    engine.schedule("timer0", later, "record", {})
+
+    with pytest.raises(TimerQueueFull):
+        engine.schedule("timer3", later, "record", {})
+
+
+def test_schedule__not_started() -> None:
+    engine = TimerEngine()
+    record(engine)
+
+    with pytest.raises(TimerEngineStopped):
+        engine.schedule("timer1", now(), "record", {})
+
+
+def test_stop__stores_the_later_timers(engine: TimerEngine) -> None:
+    fired = record(engine)
+    later = now() + timedelta(hours=1)
+    engine.schedule("later", later, "record", dict(n=1))
+    engine.cancel("later")
+    engine.schedule("later", later, "record", dict(n=2))
+
+    pending = engine.stop()
+
+    assert [timer.key for timer in pending] == ["later"]
+    assert fired == []
+
+    engine.start()
+
+    assert engine.stats.pending == 1
+    (timer,) = engine.stop()
+    assert (timer.key, timer.when, timer.payload) == ("later", later, dict(n=2))
+
+
+def test_stop__runs_the_due_timers(tmp_path: Path) -> None:
+    clock = [now()]
+    engine = TimerEngine(
+        store=TimerStore(tmp_path / "timers.json"), clock=lambda: clock[0]
+    )
+    fired = record(engine)
+    engine.start()
+    engine.schedule("due", clock[0] + timedelta(hours=1), "record", {})
+    engine.schedule("later", clock[0] + timedelta(hours=3), "record", {})
+    # the dispatcher waits for the first timer, an hour of wall time
+    clock[0] += timedelta(hours=2)
+
+    assert [timer.key for timer in engine.stop()] == ["later"]
+    assert fired == ["due"]
+
+
+def test_store__keeps_the_timers_of_other_processes(tmp_path: Path) -> None:
+    store = TimerStore(tmp_path / "timers.json")
+    later = now() + timedelta(hours=1)
+    store.save([Timer(later, 0, "timer1", "record", {})])
+    store.save([Timer(later, 0, "timer2", "record", {})])
+
+    assert [stored["key"] for stored in store.load()] == ["timer1", "timer2"]
+    assert store.load() == []
+
+
+def test_direct_notification_scheduler__cancel_reminders(
+    engine: TimerEngine,
+    prefilled_memory_user_repository: UserRepository,
+    prefilled_memory_survey_repository: SurveyRepository,
+) -> None:
+    scheduler = DirectNotificationScheduler(
+        user_repository=prefilled_memory_user_repository,
+        notification_service=NotificationService(
+            publishers=[],
+            user_repository=prefilled_memory_user_repository,
+            assignment_repository=InMemoryAssignmentRepository(),
+            survey_repository=prefilled_memory_survey_repository,
+        ),
+        timer_engine=engine,
+    )
+    later = now() + timedelta(hours=1)
+    for i in range(2):
+        scheduler.schedule_reminder_notification(
+            "user1", "assignment1", later + timedelta(hours=i), reminder_index=i
+        )
+    assert engine.stats.pending == 2
+
+    scheduler.cancel_reminders("user1", "assignment1", reminder_count=2)
+
+    assert engine.stats.pending == 0